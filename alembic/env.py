@@ -21,6 +21,11 @@ if config.config_file_name is not None:
 
 from contas_a_pagar_e_receber.models.contas_a_pagar_e_receber_model import ContasAPagarEReceberModel
 from contas_a_pagar_e_receber.models.fornecedor_cliente_model import FornecedorClienteModel
+from contas_a_pagar_e_receber.models.fechamento_de_saldo_model import FechamentoDeSaldoModel
+from contas_a_pagar_e_receber.models.baixa_model import BaixaModel
+from contas_a_pagar_e_receber.models.contas_a_pagar_e_receber_arquivada_model import ContasAPagarEReceberArquivadaModel
+from contas_a_pagar_e_receber.models.alteracao_model import AlteracaoModel
+from shared.idempotencia import ChaveIdempotenciaModel
 from shared.database import Base
 target_metadata = Base.metadata
 
@@ -0,0 +1,81 @@
+"""Armazena valores em centavos
+
+Revision ID: 409618ac8222
+Revises: dd732233b186
+Create Date: 2026-10-19 01:14:23.320911
+
+"""
+from contextlib import contextmanager
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '409618ac8222'
+down_revision: Union[str, None] = 'dd732233b186'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+COLUNAS_DE_VALOR = {
+    "contas_a_pagar_e_receber": ("valor", "valor_baixada"),
+    "contas_a_pagar_e_receber_arquivada": ("valor", "valor_baixada"),
+    "baixas": ("valor",),
+    "fechamento_de_saldo": ("saldo",),
+}
+
+
+@contextmanager
+def sem_gatilhos_sqlite(conexao, tabela: str):
+    """
+    Remove os gatilhos da tabela (feed de alterações) durante a conversão e os recria depois com o mesmo
+    SQL: a mudança de unidade não é uma alteração dos registros e não deve gerar uma versão por linha.
+    """
+    gatilhos = conexao.execute(
+        sa.text("SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND tbl_name = :tabela"),
+        {"tabela": tabela},
+    ).all()
+    for nome, _ in gatilhos:
+        op.execute(f"DROP TRIGGER {nome}")
+    yield
+    for _, comando in gatilhos:
+        op.execute(comando)
+
+
+def converte_sqlite(conexao, expressao: str) -> None:
+    for tabela, colunas in COLUNAS_DE_VALOR.items():
+        with sem_gatilhos_sqlite(conexao, tabela):
+            atribuicoes = ", ".join(f"{coluna} = {expressao.format(coluna=coluna)}" for coluna in colunas)
+            op.execute(f"UPDATE {tabela} SET {atribuicoes}")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    conexao = op.get_bind()
+    if conexao.dialect.name != "postgresql":
+        # No SQLite o tipo declarado não muda nada na gravação; só os valores são convertidos, sem
+        # batch, que recriaria a tabela e perderia os gatilhos do feed de alterações
+        converte_sqlite(conexao, "CAST(round({coluna} * 100) AS INTEGER)")
+        return
+    for tabela, colunas in COLUNAS_DE_VALOR.items():
+        for coluna in colunas:
+            op.alter_column(
+                tabela, coluna, type_=sa.BigInteger(), existing_type=sa.Numeric(),
+                postgresql_using=f"CAST(round({coluna} * 100) AS bigint)",
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    conexao = op.get_bind()
+    if conexao.dialect.name != "postgresql":
+        converte_sqlite(conexao, "{coluna} / 100.0")
+        return
+    for tabela, colunas in COLUNAS_DE_VALOR.items():
+        for coluna in colunas:
+            op.alter_column(
+                tabela, coluna, type_=sa.Numeric(), existing_type=sa.BigInteger(),
+                postgresql_using=f"CAST({coluna} AS numeric) / 100",
+            )
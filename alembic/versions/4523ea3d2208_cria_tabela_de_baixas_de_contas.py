@@ -0,0 +1,47 @@
+"""Cria tabela de baixas de contas
+
+Revision ID: 4523ea3d2208
+Revises: fdb525272181
+Create Date: 2026-10-19 00:36:05.514281
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4523ea3d2208'
+down_revision: Union[str, None] = 'fdb525272181'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('baixas',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('conta_a_pagar_e_receber_id', sa.Integer(), nullable=False),
+    sa.Column('valor', sa.Numeric(), nullable=False),
+    sa.Column('data_baixa', sa.Date(), nullable=False),
+    sa.Column('criada_em', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.ForeignKeyConstraint(['conta_a_pagar_e_receber_id'], ['contas_a_pagar_e_receber.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_baixas_conta_a_pagar_e_receber_id', 'baixas', ['conta_a_pagar_e_receber_id'])
+    op.create_index('ix_baixas_data_baixa', 'baixas', ['data_baixa'])
+
+    # Contas já baixadas viram um lançamento único com o valor e a data da baixa
+    op.execute(
+        "INSERT INTO baixas (conta_a_pagar_e_receber_id, valor, data_baixa) "
+        "SELECT id, COALESCE(valor_baixada, valor), data_baixa FROM contas_a_pagar_e_receber "
+        "WHERE esta_baixada IS true AND data_baixa IS NOT NULL"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_baixas_data_baixa', table_name='baixas')
+    op.drop_index('ix_baixas_conta_a_pagar_e_receber_id', table_name='baixas')
+    op.drop_table('baixas')
@@ -0,0 +1,45 @@
+"""Cria tabela de contas arquivadas
+
+Revision ID: 4d03dd79536b
+Revises: bcc00a341165
+Create Date: 2026-10-19 00:41:44.962660
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4d03dd79536b'
+down_revision: Union[str, None] = 'bcc00a341165'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('contas_a_pagar_e_receber_arquivada',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('descricao', sa.String(length=255), nullable=True),
+    sa.Column('valor', sa.Numeric(), nullable=True),
+    sa.Column('tipo', sa.String(length=30), nullable=True),
+    sa.Column('data_previsao', sa.Date(), nullable=False),
+    sa.Column('data_baixa', sa.Date(), nullable=True),
+    sa.Column('valor_baixada', sa.Numeric(), nullable=True),
+    sa.Column('esta_baixada', sa.Boolean(), nullable=True),
+    sa.Column('arquivada_em', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.Column('fornecedor_cliente_id', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['fornecedor_cliente_id'], ['fornecedor_cliente.id']),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_contas_a_pagar_e_receber_arquivada_fornecedor_data_previsao',
+                    'contas_a_pagar_e_receber_arquivada', ['fornecedor_cliente_id', 'data_previsao'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_contas_a_pagar_e_receber_arquivada_fornecedor_data_previsao',
+                  table_name='contas_a_pagar_e_receber_arquivada')
+    op.drop_table('contas_a_pagar_e_receber_arquivada')
@@ -0,0 +1,35 @@
+"""Cria tabela de fechamento de saldo realizado
+
+Revision ID: 63f84bedd821
+Revises: 932dadc57fad
+Create Date: 2026-10-19 00:22:44.510487
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '63f84bedd821'
+down_revision: Union[str, None] = '932dadc57fad'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('fechamento_de_saldo',
+    sa.Column('data', sa.Date(), nullable=False),
+    sa.Column('saldo', sa.Numeric(), nullable=False),
+    sa.PrimaryKeyConstraint('data')
+    )
+    # Movimentos realizados são lidos por data de baixa a partir do último fechamento
+    op.create_index('ix_contas_a_pagar_e_receber_data_baixa', 'contas_a_pagar_e_receber', ['data_baixa'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_contas_a_pagar_e_receber_data_baixa', table_name='contas_a_pagar_e_receber')
+    op.drop_table('fechamento_de_saldo')
@@ -0,0 +1,118 @@
+"""Cria feed de alteracoes
+
+Revision ID: 6c8a1efa3f0d
+Revises: 4d03dd79536b
+Create Date: 2026-10-19 00:55:41.066757
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6c8a1efa3f0d'
+down_revision: Union[str, None] = '4d03dd79536b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TABELAS_RASTREADAS = {
+    "conta": "contas_a_pagar_e_receber",
+    "fornecedor": "fornecedor_cliente",
+}
+
+
+def gatilhos_sqlite() -> list[str]:
+    comandos = []
+    for entidade, tabela in TABELAS_RASTREADAS.items():
+        for operacao, registro, excluido in (("INSERT", "NEW", 0), ("UPDATE", "NEW", 0), ("DELETE", "OLD", 1)):
+            comandos.append(
+                f"CREATE TRIGGER IF NOT EXISTS tr_{tabela}_alteracoes_{operacao.lower()} "
+                f"AFTER {operacao} ON {tabela} BEGIN "
+                f"INSERT INTO alteracoes (entidade, entidade_id, versao, excluido, alterado_em) VALUES ("
+                f"'{entidade}', {registro}.id, "
+                f"(SELECT max(coalesce(max(versao), 0), 0) + 1 FROM alteracoes), {excluido}, CURRENT_TIMESTAMP) "
+                f"ON CONFLICT (entidade, entidade_id) DO UPDATE SET "
+                f"versao = excluded.versao, excluido = excluded.excluido, alterado_em = excluded.alterado_em; "
+                f"END"
+            )
+    return comandos
+
+
+def gatilhos_postgresql() -> list[str]:
+    comandos = [
+        "CREATE OR REPLACE FUNCTION registra_alteracao() RETURNS trigger AS $$ "
+        "BEGIN "
+        "INSERT INTO alteracoes (entidade, entidade_id, versao, excluido, alterado_em) VALUES ("
+        "TG_ARGV[0], CASE WHEN TG_OP = 'DELETE' THEN OLD.id ELSE NEW.id END, "
+        "CAST(CAST(pg_current_xact_id() AS text) AS bigint), TG_OP = 'DELETE', now()) "
+        "ON CONFLICT (entidade, entidade_id) DO UPDATE SET "
+        "versao = EXCLUDED.versao, excluido = EXCLUDED.excluido, alterado_em = EXCLUDED.alterado_em; "
+        "RETURN NULL; "
+        "END $$ LANGUAGE plpgsql"
+    ]
+    for entidade, tabela in TABELAS_RASTREADAS.items():
+        comandos += [
+            f"DROP TRIGGER IF EXISTS tr_{tabela}_alteracoes ON {tabela}",
+            f"CREATE TRIGGER tr_{tabela}_alteracoes AFTER INSERT OR UPDATE OR DELETE ON {tabela} "
+            f"FOR EACH ROW EXECUTE FUNCTION registra_alteracao('{entidade}')",
+        ]
+    return comandos
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for tabela in TABELAS_RASTREADAS.values():
+        # batch: no SQLite, uma coluna NOT NULL com default não constante exige recriar a tabela
+        with op.batch_alter_table(tabela) as batch_op:
+            batch_op.add_column(sa.Column(
+                'atualizado_em', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False
+            ))
+
+    op.create_table('alteracoes',
+    sa.Column('entidade', sa.String(length=30), nullable=False),
+    sa.Column('entidade_id', sa.Integer(), nullable=False),
+    sa.Column('versao', sa.BigInteger(), nullable=False),
+    sa.Column('excluido', sa.Boolean(), nullable=False),
+    sa.Column('alterado_em', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.PrimaryKeyConstraint('entidade', 'entidade_id')
+    )
+    op.create_index(op.f('ix_alteracoes_versao'), 'alteracoes', ['versao'], unique=False)
+
+    # Registros já existentes entram no feed com versões negativas (únicas e menores que qualquer
+    # versão futura), para que a primeira sincronização, sem cursor, traga tudo
+    conexao = op.get_bind()
+    maior_id_conta = conexao.execute(sa.text("SELECT coalesce(max(id), 0) FROM contas_a_pagar_e_receber")).scalar()
+    maior_id_fornecedor = conexao.execute(sa.text("SELECT coalesce(max(id), 0) FROM fornecedor_cliente")).scalar()
+    op.execute(
+        "INSERT INTO alteracoes (entidade, entidade_id, versao, excluido) "
+        f"SELECT 'fornecedor', id, id - {maior_id_fornecedor + maior_id_conta + 2}, false FROM fornecedor_cliente"
+    )
+    op.execute(
+        "INSERT INTO alteracoes (entidade, entidade_id, versao, excluido) "
+        f"SELECT 'conta', id, id - {maior_id_conta + 1}, false FROM contas_a_pagar_e_receber"
+    )
+
+    comandos = {"sqlite": gatilhos_sqlite, "postgresql": gatilhos_postgresql}.get(conexao.dialect.name)
+    for comando in comandos() if comandos else []:
+        op.execute(comando)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == "postgresql":
+        for tabela in TABELAS_RASTREADAS.values():
+            op.execute(f"DROP TRIGGER IF EXISTS tr_{tabela}_alteracoes ON {tabela}")
+        op.execute("DROP FUNCTION IF EXISTS registra_alteracao()")
+    else:
+        for tabela in TABELAS_RASTREADAS.values():
+            for operacao in ("insert", "update", "delete"):
+                op.execute(f"DROP TRIGGER IF EXISTS tr_{tabela}_alteracoes_{operacao}")
+
+    op.drop_index(op.f('ix_alteracoes_versao'), table_name='alteracoes')
+    op.drop_table('alteracoes')
+    for tabela in TABELAS_RASTREADAS.values():
+        with op.batch_alter_table(tabela) as batch_op:
+            batch_op.drop_column('atualizado_em')
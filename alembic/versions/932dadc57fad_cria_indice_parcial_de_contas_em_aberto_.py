@@ -0,0 +1,34 @@
+"""Cria indice parcial de contas em aberto por data de previsao
+
+Revision ID: 932dadc57fad
+Revises: c3d0377cb0f0
+Create Date: 2026-10-19 00:20:59.050111
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '932dadc57fad'
+down_revision: Union[str, None] = 'c3d0377cb0f0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_contas_a_pagar_e_receber_abertas_data_previsao',
+        'contas_a_pagar_e_receber',
+        ['data_previsao', 'fornecedor_cliente_id', 'tipo'],
+        postgresql_where=sa.text('esta_baixada IS NOT true'),
+        sqlite_where=sa.text('esta_baixada IS NOT 1'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_contas_a_pagar_e_receber_abertas_data_previsao', table_name='contas_a_pagar_e_receber')
@@ -0,0 +1,90 @@
+"""Particiona contas a pagar e receber por ano no postgres
+
+Revision ID: bcc00a341165
+Revises: 4523ea3d2208
+Create Date: 2026-10-19 00:40:35.495748
+
+"""
+from typing import Sequence, Union
+
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'bcc00a341165'
+down_revision: Union[str, None] = '4523ea3d2208'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABELA = 'contas_a_pagar_e_receber'
+ANOS_A_FRENTE = 2
+FK_BAIXAS = 'baixas_conta_a_pagar_e_receber_id_fkey'
+
+
+def cria_indices() -> None:
+    # Criados na tabela particionada, são replicados em cada partição
+    op.create_index('ix_contas_a_pagar_e_receber_fornecedor_data_previsao', TABELA,
+                    ['fornecedor_cliente_id', 'data_previsao'])
+    op.create_index('ix_contas_a_pagar_e_receber_abertas_data_previsao', TABELA,
+                    ['data_previsao', 'fornecedor_cliente_id', 'tipo'],
+                    postgresql_where=sa.text('esta_baixada IS NOT true'))
+    op.create_index('ix_contas_a_pagar_e_receber_data_baixa', TABELA, ['data_baixa'])
+
+
+def copia_tabela(origem: str, destino: str, chave_primaria: str, particionada: bool) -> None:
+    """Cria `destino` com as colunas de `origem`, copia as linhas e transfere a sequência do id."""
+    conexao = op.get_bind()
+    sequencia = conexao.execute(sa.text(f"SELECT pg_get_serial_sequence('{origem}', 'id')")).scalar()
+    particionamento = " PARTITION BY RANGE (data_previsao)" if particionada else ""
+
+    op.execute(f"CREATE TABLE {destino} (LIKE {origem} INCLUDING DEFAULTS){particionamento}")
+    op.execute(f"ALTER TABLE {destino} ALTER COLUMN data_previsao SET NOT NULL")
+    op.execute(f"ALTER TABLE {destino} ADD PRIMARY KEY ({chave_primaria})")
+    op.execute(f"ALTER TABLE {destino} ADD FOREIGN KEY (fornecedor_cliente_id) REFERENCES fornecedor_cliente (id)")
+
+    if particionada:
+        anos = conexao.execute(sa.text(
+            f"SELECT EXTRACT(YEAR FROM MIN(data_previsao))::int, EXTRACT(YEAR FROM MAX(data_previsao))::int FROM {origem}"
+        )).one()
+        ano_corrente = date.today().year
+        primeiro_ano = min(anos[0] or ano_corrente, ano_corrente)
+        ultimo_ano = max(anos[1] or ano_corrente, ano_corrente + ANOS_A_FRENTE)
+        for ano in range(primeiro_ano, ultimo_ano + 1):
+            op.execute(
+                f"CREATE TABLE {destino}_{ano} PARTITION OF {destino} "
+                f"FOR VALUES FROM ('{ano}-01-01') TO ('{ano + 1}-01-01')"
+            )
+
+    op.execute(f"INSERT INTO {destino} SELECT * FROM {origem}")
+    if sequencia:
+        op.execute(f"ALTER SEQUENCE {sequencia} OWNED BY {destino}.id")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Particionamento declarativo só existe no Postgres; nos demais bancos a tabela continua como está
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    # A chave primária de uma tabela particionada precisa conter a coluna de partição, então `id`
+    # deixa de ser único sozinho e não pode mais ser referenciado por chave estrangeira.
+    op.execute(f"ALTER TABLE baixas DROP CONSTRAINT IF EXISTS {FK_BAIXAS}")
+    op.execute(f"ALTER TABLE {TABELA} RENAME TO {TABELA}_nao_particionada")
+    copia_tabela(f'{TABELA}_nao_particionada', TABELA, 'id, data_previsao', particionada=True)
+    op.drop_table(f'{TABELA}_nao_particionada')
+    cria_indices()
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute(f"ALTER TABLE {TABELA} RENAME TO {TABELA}_particionada")
+    copia_tabela(f'{TABELA}_particionada', TABELA, 'id', particionada=False)
+    op.execute(f"DROP TABLE {TABELA}_particionada CASCADE")
+    cria_indices()
+    op.create_foreign_key(FK_BAIXAS, 'baixas', TABELA, ['conta_a_pagar_e_receber_id'], ['id'], ondelete='CASCADE')
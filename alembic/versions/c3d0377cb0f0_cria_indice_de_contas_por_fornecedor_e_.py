@@ -0,0 +1,32 @@
+"""Cria indice de contas por fornecedor e data de previsao
+
+Revision ID: c3d0377cb0f0
+Revises: 7c46d1a9c952
+Create Date: 2026-10-19 00:19:51.746448
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3d0377cb0f0'
+down_revision: Union[str, None] = '7c46d1a9c952'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_contas_a_pagar_e_receber_fornecedor_data_previsao',
+        'contas_a_pagar_e_receber',
+        ['fornecedor_cliente_id', 'data_previsao'],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_contas_a_pagar_e_receber_fornecedor_data_previsao', table_name='contas_a_pagar_e_receber')
@@ -0,0 +1,40 @@
+"""Adiciona serie de contas recorrentes
+
+Revision ID: dd732233b186
+Revises: 6c8a1efa3f0d
+Create Date: 2026-10-19 01:02:10.647767
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'dd732233b186'
+down_revision: Union[str, None] = '6c8a1efa3f0d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TABELAS = ("contas_a_pagar_e_receber", "contas_a_pagar_e_receber_arquivada")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # ADD/DROP COLUMN direto, sem batch: no SQLite o batch recriaria a tabela e perderia os gatilhos do feed
+    for tabela in TABELAS:
+        op.add_column(tabela, sa.Column('serie_id', sa.String(length=36), nullable=True))
+        op.add_column(tabela, sa.Column('parcela', sa.Integer(), nullable=True))
+    op.create_index(
+        op.f('ix_contas_a_pagar_e_receber_serie_id'), 'contas_a_pagar_e_receber', ['serie_id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_contas_a_pagar_e_receber_serie_id'), table_name='contas_a_pagar_e_receber')
+    for tabela in TABELAS:
+        op.drop_column(tabela, 'parcela')
+        op.drop_column(tabela, 'serie_id')
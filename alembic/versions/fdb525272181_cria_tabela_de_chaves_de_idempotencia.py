@@ -0,0 +1,39 @@
+"""Cria tabela de chaves de idempotencia
+
+Revision ID: fdb525272181
+Revises: 63f84bedd821
+Create Date: 2026-10-19 00:31:33.945915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'fdb525272181'
+down_revision: Union[str, None] = '63f84bedd821'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('chave_idempotencia',
+    sa.Column('chave', sa.String(length=255), nullable=False),
+    sa.Column('impressao_digital', sa.String(length=64), nullable=False),
+    sa.Column('concluida', sa.Boolean(), nullable=False),
+    sa.Column('status_code', sa.Integer(), nullable=True),
+    sa.Column('cabecalhos', sa.Text(), nullable=True),
+    sa.Column('corpo', sa.LargeBinary(), nullable=True),
+    sa.Column('expira_em', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('chave')
+    )
+    op.create_index('ix_chave_idempotencia_expira_em', 'chave_idempotencia', ['expira_em'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_chave_idempotencia_expira_em', table_name='chave_idempotencia')
+    op.drop_table('chave_idempotencia')
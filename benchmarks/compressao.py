@@ -0,0 +1,82 @@
+# benchmarks/compressao.py
+#
+# Mede, para a listagem completa de contas, quantos bytes vão pela rede e quanto tempo de CPU a
+# compressão custa por requisição, em cada codificação disponível (gzip sempre; br e zstd quando
+# os pacotes opcionais estão instalados).
+#
+# Uso:
+#   $ python -m benchmarks.compressao --contas 5000 --repeticoes 20
+
+import argparse
+import os
+import tempfile
+import time
+from datetime import date, timedelta
+
+from fastapi.testclient import TestClient
+
+from config import Settings
+from contas_a_pagar_e_receber.models.contas_a_pagar_e_receber_model import ContasAPagarEReceberModel
+from contas_a_pagar_e_receber.models.fornecedor_cliente_model import FornecedorClienteModel
+from main import create_app
+from shared.compressao import compressores_disponiveis
+from shared.database import Base, SessionLocal, obtem_engine
+
+URL = "/contas-a-pagar-e-receber"
+
+
+def popula(quantidade_de_contas: int) -> None:
+    with SessionLocal() as sessao:
+        fornecedores = [FornecedorClienteModel(nome=f"Fornecedor {i}") for i in range(50)]
+        sessao.add_all(fornecedores)
+        sessao.flush()
+        sessao.add_all([
+            ContasAPagarEReceberModel(
+                descricao=f"Conta {i}", valor=100 + i % 1000, tipo="Pagar" if i % 2 else "Receber",
+                data_previsao=date(2025, 1, 1) + timedelta(days=i % 365),
+                fornecedor_cliente_id=fornecedores[i % len(fornecedores)].id,
+            )
+            for i in range(quantidade_de_contas)
+        ])
+        sessao.commit()
+
+
+def mede_cpu_da_compressao(compressor, corpo: bytes, repeticoes: int) -> float:
+    inicio = time.process_time()
+    for _ in range(repeticoes):
+        compressor().finaliza(corpo)
+    return (time.process_time() - inicio) / repeticoes
+
+
+def main(argumentos: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Mede o efeito da compressão na listagem de contas.")
+    parser.add_argument("--contas", type=int, default=5000)
+    parser.add_argument("--repeticoes", type=int, default=20)
+    args = parser.parse_args(argumentos)
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        app = create_app(Settings(
+            database_url=f"sqlite:///{os.path.join(diretorio, 'benchmark.db')}", database_read_url=None,
+            database_echo=False,
+        ))
+        with TestClient(app) as client:
+            Base.metadata.create_all(bind=obtem_engine())
+            popula(args.contas)
+
+            corpo = client.get(URL, headers={"Accept-Encoding": "identity"}).content
+            print(f"{'codificação':<12}{'bytes':>12}{'razão':>8}{'CPU/req (ms)':>14}{'latência (ms)':>15}")
+
+            for codificacao, compressor in [("identity", None), *compressores_disponiveis().items()]:
+                inicio = time.perf_counter()
+                for _ in range(args.repeticoes):
+                    response = client.get(URL, headers={"Accept-Encoding": codificacao})
+                latencia = (time.perf_counter() - inicio) / args.repeticoes
+                assert response.headers.get("content-encoding", "identity") == codificacao
+
+                tamanho = int(response.headers["content-length"])
+                cpu = mede_cpu_da_compressao(compressor, corpo, args.repeticoes) if compressor else 0.0
+                print(f"{codificacao:<12}{tamanho:>12}{len(corpo) / tamanho:>8.1f}{cpu * 1000:>14.2f}{latencia * 1000:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# benchmarks/consultas_por_id.py
+#
+# Tempo de CPU por consulta nas buscas por ID mais frequentes: a forma antiga (Query legada,
+# reconstruída a cada chamada) contra as funções atuais, que usam lambda_stmt com cache de compilação.
+#
+# Uso:
+#   $ python -m benchmarks.consultas_por_id --repeticoes 5000
+
+import argparse
+import os
+import tempfile
+import time
+from datetime import date
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from contas_a_pagar_e_receber.models.contas_a_pagar_e_receber_model import ContasAPagarEReceberModel
+from contas_a_pagar_e_receber.models.fornecedor_cliente_model import FornecedorClienteModel
+from contas_a_pagar_e_receber.routers.contas_a_pagar_e_receber_router import buscar_conta_por_id, valida_fornecedor
+from contas_a_pagar_e_receber.routers.fornecedor_cliente_router import buscar_fornecedores_clientes_por_id
+from shared.database import Base
+
+
+def conta_por_id_legado(sessao, conta_id):
+    return sessao.query(ContasAPagarEReceberModel).filter_by(id=conta_id).first()
+
+
+def fornecedor_por_id_legado(sessao, fornecedor_id):
+    return sessao.query(FornecedorClienteModel).filter(FornecedorClienteModel.id == fornecedor_id).first()
+
+
+def valida_fornecedor_legado(fornecedor_id, sessao):
+    return sessao.query(FornecedorClienteModel).filter_by(id=fornecedor_id).first()
+
+
+def mede(consulta, repeticoes: int) -> float:
+    """Microssegundos de CPU por chamada, já descontado o aquecimento do cache de compilação."""
+    for _ in range(10):
+        consulta()
+    inicio = time.process_time()
+    for _ in range(repeticoes):
+        consulta()
+    return (time.process_time() - inicio) / repeticoes * 1_000_000
+
+
+def main(argumentos: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Mede o tempo de CPU das buscas por ID.")
+    parser.add_argument("--repeticoes", type=int, default=5000)
+    args = parser.parse_args(argumentos)
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        engine = create_engine(f"sqlite:///{os.path.join(diretorio, 'benchmark.db')}")
+        Base.metadata.create_all(bind=engine)
+        Sessao = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+        with Sessao() as sessao:
+            fornecedor = FornecedorClienteModel(nome="Fornecedor")
+            sessao.add(fornecedor)
+            sessao.flush()
+            conta = ContasAPagarEReceberModel(
+                descricao="Conta", valor=100, tipo="Pagar", data_previsao=date(2025, 1, 1),
+                fornecedor_cliente_id=fornecedor.id,
+            )
+            sessao.add(conta)
+            sessao.commit()
+            ids = {"conta": conta.id, "fornecedor": fornecedor.id}
+
+        with Sessao() as sessao:
+            casos = [
+                ("buscar_conta_por_id", lambda: conta_por_id_legado(sessao, ids["conta"]),
+                 lambda: buscar_conta_por_id(sessao, ids["conta"])),
+                ("buscar_fornecedores_clientes_por_id", lambda: fornecedor_por_id_legado(sessao, ids["fornecedor"]),
+                 lambda: buscar_fornecedores_clientes_por_id(sessao, ids["fornecedor"])),
+                ("valida_fornecedor", lambda: valida_fornecedor_legado(ids["fornecedor"], sessao),
+                 lambda: valida_fornecedor(ids["fornecedor"], sessao)),
+            ]
+            print(f"{'consulta':<38}{'antes (µs)':>12}{'depois (µs)':>13}{'ganho':>8}")
+            for nome, antes, depois in casos:
+                tempo_antes = mede(antes, args.repeticoes)
+                tempo_depois = mede(depois, args.repeticoes)
+                print(f"{nome:<38}{tempo_antes:>12.1f}{tempo_depois:>13.1f}{tempo_antes / tempo_depois:>7.1f}x")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# benchmarks/sqlite_concorrencia.py
+#
+# Vazão de leituras no SQLite enquanto um escritor grava continuamente: engine padrão (journal de
+# rollback, synchronous=FULL) contra o modo de `shared.database` (WAL, escritor único, pool de leitura).
+#
+# Uso:
+#   $ python -m benchmarks.sqlite_concorrencia --segundos 5 --leitores 4
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.exc import OperationalError
+
+from contas_a_pagar_e_receber.models.fornecedor_cliente_model import FornecedorClienteModel
+from shared.database import Base, configura_banco, descarta_banco, obtem_fabrica_de_leitura
+
+TABELA = FornecedorClienteModel.__table__
+
+
+def executa(engine_de_escrita, engine_de_leitura, segundos: float, leitores: int) -> dict[str, float]:
+    fim = time.monotonic() + segundos
+    contagem = {"leituras": 0, "erros_de_leitura": 0, "escritas": 0}
+    trava = threading.Lock()
+
+    def escreve():
+        while time.monotonic() < fim:
+            with engine_de_escrita.begin() as conexao:
+                conexao.execute(TABELA.insert(), [{"nome": f"Fornecedor {i}"} for i in range(2000)])
+            contagem["escritas"] += 1
+
+    def le():
+        leituras = erros = 0
+        while time.monotonic() < fim:
+            try:
+                with engine_de_leitura.connect() as conexao:
+                    conexao.execute(select(func.count()).select_from(TABELA)).scalar()
+                leituras += 1
+            except OperationalError:
+                erros += 1
+        with trava:
+            contagem["leituras"] += leituras
+            contagem["erros_de_leitura"] += erros
+
+    threads = [threading.Thread(target=escreve)] + [threading.Thread(target=le) for _ in range(leitores)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return {chave: valor / segundos for chave, valor in contagem.items()}
+
+
+def main(argumentos: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Mede leituras concorrentes com escritas no SQLite.")
+    parser.add_argument("--segundos", type=float, default=5)
+    parser.add_argument("--leitores", type=int, default=4)
+    args = parser.parse_args(argumentos)
+
+    print(f"{'modo':<12}{'leituras/s':>12}{'erros/s':>10}{'lotes gravados/s':>18}")
+    with tempfile.TemporaryDirectory() as diretorio:
+        url = f"sqlite:///{os.path.join(diretorio, 'padrao.db')}"
+        engine = create_engine(url, connect_args={"check_same_thread": False, "timeout": 5})
+        Base.metadata.create_all(bind=engine)
+        resultado = executa(engine, engine, args.segundos, args.leitores)
+        engine.dispose()
+        print(f"{'padrão':<12}{resultado['leituras']:>12.0f}{resultado['erros_de_leitura']:>10.1f}{resultado['escritas']:>18.1f}")
+
+        url = f"sqlite:///{os.path.join(diretorio, 'otimizado.db')}"
+        engine = configura_banco(url, None, echo=False, pool_size=args.leitores)
+        Base.metadata.create_all(bind=engine)
+        resultado = executa(engine, obtem_fabrica_de_leitura().kw["bind"], args.segundos, args.leitores)
+        descarta_banco()
+        print(f"{'otimizado':<12}{resultado['leituras']:>12.0f}{resultado['erros_de_leitura']:>10.1f}{resultado['escritas']:>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# benchmarks/tempo_de_inicializacao.py
+#
+# Mede quanto tempo um processo novo leva para começar a responder: importação do `main`,
+# `create_app`, lifespan (engine e aquecimentos opcionais) e a primeira requisição.
+# Cada rodada é um interpretador novo, como um pod recém-criado pelo autoscaling.
+#
+# Uso:
+#   $ python -m benchmarks.tempo_de_inicializacao --rodadas 10
+#   $ python -m benchmarks.tempo_de_inicializacao --aquecer-pool --gerar-openapi
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+RAIZ_DO_PROJETO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CODIGO_DA_RODADA = """
+import json, sys, time
+inicio = time.perf_counter()
+from config import Settings
+from main import create_app
+importado = time.perf_counter()
+app = create_app(Settings(
+    database_url=sys.argv[1], database_read_url=None, database_echo=False,
+    aquecer_pool_na_inicializacao=sys.argv[2] == "1", gerar_openapi_na_inicializacao=sys.argv[3] == "1",
+))
+criado = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(app) as client:
+    iniciado = time.perf_counter()
+    client.get("/fornecedor-cliente")
+    primeira = time.perf_counter()
+    client.get("/openapi.json")
+    documentacao = time.perf_counter()
+print(json.dumps({
+    "importacao": importado - inicio,
+    "create_app": criado - importado,
+    "lifespan": iniciado - criado,
+    "primeira_requisicao": primeira - iniciado,
+    "primeiro_openapi": documentacao - primeira,
+}))
+"""
+
+
+def executa_rodada(database_url: str, aquecer_pool: bool, gerar_openapi: bool) -> dict[str, float]:
+    inicio = time.perf_counter()
+    saida = subprocess.run(
+        [sys.executable, "-c", CODIGO_DA_RODADA, database_url, str(int(aquecer_pool)), str(int(gerar_openapi))],
+        cwd=RAIZ_DO_PROJETO, capture_output=True, text=True, check=True,
+    ).stdout
+    tempos = json.loads(saida.strip().splitlines()[-1])
+    tempos["processo_completo"] = time.perf_counter() - inicio
+    return tempos
+
+
+def main(argumentos: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Mede o tempo de inicialização da aplicação.")
+    parser.add_argument("--rodadas", type=int, default=5)
+    parser.add_argument("--database-url", help="Banco usado nas rodadas; por padrão, um SQLite temporário")
+    parser.add_argument("--aquecer-pool", action="store_true")
+    parser.add_argument("--gerar-openapi", action="store_true")
+    args = parser.parse_args(argumentos)
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        database_url = args.database_url or f"sqlite:///{os.path.join(diretorio, 'benchmark.db')}"
+        if args.database_url is None:
+            sys.path.insert(0, RAIZ_DO_PROJETO)
+            from sqlalchemy import create_engine
+            from main import app  # noqa: F401 - registra todos os modelos no Base
+            from shared.database import Base
+            engine = create_engine(database_url)
+            Base.metadata.create_all(bind=engine)
+            engine.dispose()
+
+        rodadas = [executa_rodada(database_url, args.aquecer_pool, args.gerar_openapi) for _ in range(args.rodadas)]
+
+    print(f"{'etapa':<22}{'mediana (ms)':>14}{'máximo (ms)':>14}")
+    for etapa in rodadas[0]:
+        valores = [rodada[etapa] * 1000 for rodada in rodadas]
+        print(f"{etapa:<22}{statistics.median(valores):>14.1f}{max(valores):>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+# contas_a_pagar_e_receber/arquivamento.py
+#
+# Move contas baixadas antigas para a tabela contas_a_pagar_e_receber_arquivada, em lotes pequenos.
+# Cada lote copia e remove as contas na mesma transação, então interromper o job não perde nem
+# duplica contas: basta executá-lo de novo (opcionalmente a partir do último ID informado).
+#
+# Uso pela linha de comando:
+#   $ python -m contas_a_pagar_e_receber.arquivamento --data-de-corte 2023-01-01
+
+import argparse
+from dataclasses import dataclass
+from datetime import date
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from config import ARQUIVAMENTO_ANOS_DE_RETENCAO, ARQUIVAMENTO_TAMANHO_DO_LOTE
+from contas_a_pagar_e_receber.models.contas_a_pagar_e_receber_arquivada_model import \
+    ContasAPagarEReceberArquivadaModel
+from contas_a_pagar_e_receber.models.contas_a_pagar_e_receber_model import ContasAPagarEReceberModel
+
+COLUNAS_ARQUIVADAS = (
+    "id", "descricao", "valor", "tipo", "data_previsao", "data_baixa", "valor_baixada", "esta_baixada",
+    "serie_id", "parcela", "fornecedor_cliente_id",
+)
+
+
+@dataclass
+class ResultadoDoArquivamento:
+    contas_arquivadas: int = 0
+    lotes: int = 0
+    ultimo_id: int = 0
+
+
+def data_de_corte_padrao(hoje: date | None = None) -> date:
+    """1º de janeiro de (ano corrente - ARQUIVAMENTO_ANOS_DE_RETENCAO), alinhado às partições anuais."""
+    return date((hoje or date.today()).year - ARQUIVAMENTO_ANOS_DE_RETENCAO, 1, 1)
+
+
+def arquiva_contas_baixadas(
+        sessao: Session,
+        data_de_corte: date,
+        tamanho_do_lote: int = ARQUIVAMENTO_TAMANHO_DO_LOTE,
+        a_partir_do_id: int = 0,
+        ao_concluir_lote=None,
+) -> ResultadoDoArquivamento:
+    """
+    Arquiva as contas baixadas com data de previsão anterior à data de corte, em ordem de ID.
+
+    Args:
+        sessao: Sessão do banco de dados
+        data_de_corte: Contas com previsão anterior a esta data são arquivadas
+        tamanho_do_lote: Quantidade de contas movidas por transação
+        a_partir_do_id: Retoma o arquivamento a partir deste ID (exclusive)
+        ao_concluir_lote: Função chamada com o resultado parcial após cada lote
+
+    Returns:
+        ResultadoDoArquivamento: Quantidade de contas arquivadas, de lotes e o último ID processado
+    """
+    conta = ContasAPagarEReceberModel
+    arquivada = ContasAPagarEReceberArquivadaModel
+    resultado = ResultadoDoArquivamento(ultimo_id=a_partir_do_id)
+
+    while True:
+        ids = sessao.execute(
+            select(conta.id)
+            .where(conta.esta_baixada.is_(True))
+            .where(conta.data_previsao < data_de_corte)
+            .where(conta.id > resultado.ultimo_id)
+            .order_by(conta.id)
+            .limit(tamanho_do_lote)
+            .with_for_update(skip_locked=True)
+        ).scalars().all()
+        if not ids:
+            break
+
+        sessao.execute(insert(arquivada).from_select(
+            COLUNAS_ARQUIVADAS,
+            select(*(getattr(conta, coluna) for coluna in COLUNAS_ARQUIVADAS)).where(conta.id.in_(ids)),
+        ))
+        sessao.execute(delete(conta).where(conta.id.in_(ids)).execution_options(synchronize_session=False))
+        sessao.commit()
+
+        resultado.contas_arquivadas += len(ids)
+        resultado.lotes += 1
+        resultado.ultimo_id = ids[-1]
+        if ao_concluir_lote is not None:
+            ao_concluir_lote(resultado)
+        if len(ids) < tamanho_do_lote:
+            break
+
+    return resultado
+
+
+def main(argumentos: list[str] | None = None) -> None:
+    from shared.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Arquiva contas a pagar e receber baixadas antigas.")
+    parser.add_argument("--data-de-corte", type=date.fromisoformat, default=data_de_corte_padrao(),
+                        help="Arquiva contas com data de previsão anterior a esta data (AAAA-MM-DD)")
+    parser.add_argument("--tamanho-do-lote", type=int, default=ARQUIVAMENTO_TAMANHO_DO_LOTE)
+    parser.add_argument("--a-partir-do-id", type=int, default=0,
+                        help="Retoma um arquivamento interrompido a partir deste ID")
+    args = parser.parse_args(argumentos)
+
+    def informa_progresso(parcial: ResultadoDoArquivamento) -> None:
+        print(f"Lote {parcial.lotes}: {parcial.contas_arquivadas} contas arquivadas (último ID {parcial.ultimo_id})")
+
+    with SessionLocal() as sessao:
+        resultado = arquiva_contas_baixadas(
+            sessao, args.data_de_corte, args.tamanho_do_lote, args.a_partir_do_id, informa_progresso
+        )
+
+    print(f"Contas arquivadas: {resultado.contas_arquivadas}")
+    print(f"Lotes: {resultado.lotes}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+# contas_a_pagar_e_receber/importacao.py
+#
+# Importação em lote de contas a partir de um CSV com cabeçalho. Colunas aceitas:
+#   descricao, valor, tipo, data_previsao            (obrigatórias)
+#   fornecedor, data_baixa, valor_baixada            (opcionais)
+#
+# Uso pela linha de comando:
+#   $ python -m contas_a_pagar_e_receber.importacao contas.csv
+
+import argparse
+import csv
+import io
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select, func
+from sqlalchemy.orm import Session
+
+from contas_a_pagar_e_receber.models.baixa_model import BaixaModel
+from contas_a_pagar_e_receber.models.contas_a_pagar_e_receber_model import ContasAPagarEReceberModel, \
+    particoes_de_contas
+from contas_a_pagar_e_receber.models.fornecedor_cliente_model import FornecedorClienteModel
+from contas_a_pagar_e_receber.routers.contas_a_pagar_e_receber_router import BaixaRequest, \
+    ContaAPagarEReceberRequest, ContaPagarEReceberEnum, invalida_fechamentos_de_saldo
+from shared.dinheiro import para_centavos
+
+TAMANHO_DO_LOTE = 5000
+TAMANHO_MAXIMO_DO_LOTE = 50_000
+QUANTIDADE_MAXIMA_DE_ERROS_DETALHADOS = 1000
+
+COLUNAS_OBRIGATORIAS = ("descricao", "valor", "tipo", "data_previsao")
+COLUNAS_DO_COPY = (
+    "descricao", "valor", "tipo", "data_previsao", "data_baixa", "valor_baixada", "esta_baixada",
+    "fornecedor_cliente_id",
+)
+# O COPY não passa pelos tipos do SQLAlchemy: valores vão para o banco já em centavos
+COLUNAS_EM_CENTAVOS_DO_COPY = {"valor", "valor_baixada"}
+TIPOS_VALIDOS = {tipo.value for tipo in ContaPagarEReceberEnum}
+# Bytes que não são UTF-8 válido são lidos como este caractere e a linha onde aparecem é recusada
+CARACTERE_INVALIDO = "\ufffd"
+
+
+class ErroDeLinha(Exception):
+    pass
+
+
+@dataclass
+class ResultadoDaImportacao:
+    linhas_lidas: int = 0
+    contas_importadas: int = 0
+    fornecedores_criados: int = 0
+    quantidade_de_erros: int = 0
+    erros: list[tuple[int, str]] = field(default_factory=list)
+
+    def registra_erro(self, linha: int, mensagem: str) -> None:
+        self.quantidade_de_erros += 1
+        if len(self.erros) < QUANTIDADE_MAXIMA_DE_ERROS_DETALHADOS:
+            self.erros.append((linha, mensagem))
+
+
+def mensagem_de_validacao(erro: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(map(str, e['loc']))}: {e['msg']}" for e in erro.errors())
+
+
+def converte_linha(registro: dict) -> dict:
+    """
+    Valida uma linha do CSV com as mesmas regras da criação de conta e devolve os valores da tabela.
+
+    Raises:
+        ErroDeLinha: Se a linha for inválida
+    """
+    if any(CARACTERE_INVALIDO in (valor or "") for valor in registro.values() if isinstance(valor, str)):
+        raise ErroDeLinha("Linha contém caracteres que não são UTF-8 válido")
+
+    faltando = [coluna for coluna in COLUNAS_OBRIGATORIAS if not registro.get(coluna)]
+    if faltando:
+        raise ErroDeLinha(f"Colunas obrigatórias vazias: {', '.join(faltando)}")
+
+    try:
+        conta = ContaAPagarEReceberRequest.model_validate({
+            "descricao": registro["descricao"],
+            "valor": registro["valor"],
+            "tipo": registro["tipo"],
+            "data_previsao": registro["data_previsao"],
+        })
+    except ValidationError as e:
+        raise ErroDeLinha(mensagem_de_validacao(e))
+
+    if not conta.descricao.strip():
+        raise ErroDeLinha("Descrição não pode ser vazia")
+    if conta.tipo not in TIPOS_VALIDOS:
+        raise ErroDeLinha("Tipo deve ser 'Pagar' ou 'Receber'")
+
+    data_baixa = None
+    valor_baixada = None
+    if registro.get("data_baixa"):
+        # Mesmas regras de POST /{conta_id}/baixas
+        try:
+            baixa = BaixaRequest.model_validate({
+                "valor": registro.get("valor_baixada") or conta.valor,
+                "data_baixa": registro["data_baixa"],
+            })
+        except ValidationError as e:
+            raise ErroDeLinha(f"Baixa inválida (valor_baixada/data_baixa): {mensagem_de_validacao(e)}")
+        if baixa.valor > conta.valor:
+            raise ErroDeLinha("valor_baixada maior que o valor da conta")
+        data_baixa = baixa.data_baixa
+        valor_baixada = baixa.valor
+
+    return {
+        "descricao": conta.descricao,
+        "valor": conta.valor,
+        "tipo": conta.tipo,
+        "data_previsao": conta.data_previsao,
+        "data_baixa": data_baixa,
+        "valor_baixada": valor_baixada,
+        "esta_baixada": valor_baixada is not None and valor_baixada >= conta.valor,
+        "fornecedor": (registro.get("fornecedor") or "").strip() or None,
+    }
+
+
+class ImportadorDeContas:
+    """Importa contas em lotes, resolvendo os fornecedores pelo nome com uma consulta por lote."""
+
+    def __init__(self, sessao: Session, tamanho_do_lote: int = TAMANHO_DO_LOTE):
+        self.sessao = sessao
+        self.tamanho_do_lote = tamanho_do_lote
+        self.fornecedores: dict[str, int] = {}
+        self.resultado = ResultadoDaImportacao()
+        self.usa_copy = self._conexao_suporta_copy()
+
+    def _conexao_suporta_copy(self) -> bool:
+        bind = self.sessao.get_bind()
+        return bind.dialect.name == "postgresql" and bind.dialect.driver == "psycopg2"
+
+    def importa(self, linhas: Iterable[str]) -> ResultadoDaImportacao:
+        leitor = csv.DictReader(linhas)
+        if leitor.fieldnames is None or not set(COLUNAS_OBRIGATORIAS) <= set(leitor.fieldnames):
+            self.resultado.registra_erro(1, f"Cabeçalho deve conter: {', '.join(COLUNAS_OBRIGATORIAS)}")
+            return self.resultado
+
+        lote = []
+        for registro in leitor:
+            self.resultado.linhas_lidas += 1
+            numero_da_linha = leitor.line_num
+            try:
+                lote.append((numero_da_linha, converte_linha(registro)))
+            except ErroDeLinha as e:
+                self.resultado.registra_erro(numero_da_linha, str(e))
+
+            if len(lote) >= self.tamanho_do_lote:
+                self._grava_lote(lote)
+                lote = []
+
+        if lote:
+            self._grava_lote(lote)
+        return self.resultado
+
+    def _resolve_fornecedores(self, nomes: set[str]) -> int:
+        """Busca os fornecedores ainda não conhecidos pelo nome, cria os que não existem e devolve quantos criou."""
+        desconhecidos = nomes - self.fornecedores.keys()
+        if not desconhecidos:
+            return 0
+
+        existentes = self.sessao.execute(
+            select(FornecedorClienteModel.nome, func.min(FornecedorClienteModel.id))
+            .where(FornecedorClienteModel.nome.in_(desconhecidos))
+            .group_by(FornecedorClienteModel.nome)
+        )
+        self.fornecedores.update(existentes.tuples().all())
+
+        novos = sorted(desconhecidos - self.fornecedores.keys())
+        if novos:
+            criados = self.sessao.execute(
+                insert(FornecedorClienteModel).returning(FornecedorClienteModel.nome, FornecedorClienteModel.id),
+                [{"nome": nome} for nome in novos],
+            )
+            self.fornecedores.update(criados.tuples().all())
+        return len(novos)
+
+    def _grava_lote(self, lote: list[tuple[int, dict]]) -> None:
+        try:
+            # Antes de o lote tocar qualquer tabela na transação da sessão (ver `garante_anos`)
+            particoes_de_contas.garante_anos(self.sessao.get_bind(), {conta["data_previsao"].year for _, conta in lote})
+            fornecedores_criados = self._resolve_fornecedores(
+                {conta["fornecedor"] for _, conta in lote if conta["fornecedor"]}
+            )
+
+            contas = []
+            for _, conta in lote:
+                fornecedor = conta.pop("fornecedor")
+                conta["fornecedor_cliente_id"] = self.fornecedores[fornecedor] if fornecedor else None
+                contas.append(conta)
+
+            datas_de_baixa = [conta["data_baixa"] for conta in contas if conta["data_baixa"] is not None]
+            if datas_de_baixa:
+                maior_id_anterior = self.sessao.execute(select(func.max(ContasAPagarEReceberModel.id))).scalar() or 0
+            if self.usa_copy:
+                self._copy(contas)
+            else:
+                self.sessao.connection().execute(insert(ContasAPagarEReceberModel.__table__), contas)
+            if datas_de_baixa:
+                self._lanca_baixas(maior_id_anterior)
+                invalida_fechamentos_de_saldo(self.sessao, min(datas_de_baixa))
+            self.sessao.commit()
+            self.resultado.contas_importadas += len(contas)
+            self.resultado.fornecedores_criados += fornecedores_criados
+
+        except Exception as e:
+            self.sessao.rollback()
+            # Fornecedores criados neste lote foram desfeitos pelo rollback
+            self.fornecedores = {}
+            for numero_da_linha, _ in lote:
+                self.resultado.registra_erro(numero_da_linha, f"Erro ao gravar o lote: {e.__class__.__name__}")
+
+    def _lanca_baixas(self, maior_id_anterior: int) -> None:
+        """
+        Lança no livro de baixas as contas já baixadas deste lote. Nem o COPY nem o executemany devolvem
+        os IDs gerados, então as contas do lote são encontradas pelo ID posterior ao maior existente antes
+        do lote; o NOT EXISTS ignora contas de importações concorrentes que já têm baixa lançada.
+        """
+        conta = ContasAPagarEReceberModel
+        self.sessao.execute(
+            insert(BaixaModel).from_select(
+                ["conta_a_pagar_e_receber_id", "valor", "data_baixa"],
+                select(conta.id, conta.valor_baixada, conta.data_baixa)
+                .where(conta.id > maior_id_anterior)
+                .where(conta.data_baixa.is_not(None))
+                .where(~select(BaixaModel.id).where(BaixaModel.conta_a_pagar_e_receber_id == conta.id).exists()),
+            )
+        )
+
+    @staticmethod
+    def _valor_do_copy(coluna: str, valor):
+        if valor is None:
+            return ""
+        return para_centavos(valor) if coluna in COLUNAS_EM_CENTAVOS_DO_COPY else valor
+
+    def _copy(self, contas: list[dict]) -> None:
+        """Grava o lote com COPY ... FROM STDIN na mesma transação da sessão (somente psycopg2)."""
+        buffer = io.StringIO()
+        escritor = csv.writer(buffer)
+        for conta in contas:
+            escritor.writerow([self._valor_do_copy(coluna, conta[coluna]) for coluna in COLUNAS_DO_COPY])
+        buffer.seek(0)
+
+        conexao = self.sessao.connection().connection.dbapi_connection
+        with conexao.cursor() as cursor:
+            cursor.copy_expert(
+                f"COPY {ContasAPagarEReceberModel.__tablename__} ({', '.join(COLUNAS_DO_COPY)}) "
+                f"FROM STDIN WITH (FORMAT csv)",
+                buffer,
+            )
+
+
+def importa_csv(sessao: Session, linhas: Iterable[str], tamanho_do_lote: int = TAMANHO_DO_LOTE) -> ResultadoDaImportacao:
+    """Importa as contas de um CSV (iterável de linhas de texto) e devolve o resumo da importação."""
+    return ImportadorDeContas(sessao, tamanho_do_lote).importa(linhas)
+
+
+def main(argumentos: list[str] | None = None) -> None:
+    from shared.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Importa contas a pagar e receber de um arquivo CSV.")
+    parser.add_argument("arquivo", help="Caminho do arquivo CSV (UTF-8, com cabeçalho)")
+    parser.add_argument("--tamanho-do-lote", type=int, default=TAMANHO_DO_LOTE)
+    args = parser.parse_args(argumentos)
+
+    with open(args.arquivo, newline="", encoding="utf-8-sig", errors="replace") as arquivo, SessionLocal() as sessao:
+        resultado = importa_csv(sessao, arquivo, args.tamanho_do_lote)
+
+    print(f"Linhas lidas: {resultado.linhas_lidas}")
+    print(f"Contas importadas: {resultado.contas_importadas}")
+    print(f"Fornecedores criados: {resultado.fornecedores_criados}")
+    print(f"Erros: {resultado.quantidade_de_erros}")
+    for linha, mensagem in resultado.erros:
+        print(f"  linha {linha}: {mensagem}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+from sqlalchemy import BigInteger, Boolean, Column, DateTime, Integer, String, event, func, text
+
+from shared.database import Base
+
+# Entidades acompanhadas pelo feed de alterações: nome usado no feed -> tabela
+TABELAS_RASTREADAS = {
+    "conta": "contas_a_pagar_e_receber",
+    "fornecedor": "fornecedor_cliente",
+}
+
+
+class AlteracaoModel(Base):
+    """
+    Última alteração de cada conta e fornecedor, mantida por gatilhos no banco (uma linha por registro).
+    Exclusões ficam como marcas (`excluido`), para que os clientes saibam o que remover.
+
+    `versao` é o cursor do feed: no Postgres, o ID da transação que fez a alteração; no SQLite, que tem
+    um único escritor, um contador.
+    """
+    __tablename__ = 'alteracoes'
+    entidade = Column(String(30), primary_key=True)
+    entidade_id = Column(Integer, primary_key=True)
+    versao = Column(BigInteger, nullable=False, index=True)
+    excluido = Column(Boolean(), nullable=False, default=False)
+    alterado_em = Column(DateTime, nullable=False, server_default=func.now())
+
+
+def gatilhos_sqlite() -> list[str]:
+    comandos = []
+    for entidade, tabela in TABELAS_RASTREADAS.items():
+        for operacao, registro, excluido in (("INSERT", "NEW", 0), ("UPDATE", "NEW", 0), ("DELETE", "OLD", 1)):
+            comandos.append(
+                f"CREATE TRIGGER IF NOT EXISTS tr_{tabela}_alteracoes_{operacao.lower()} "
+                f"AFTER {operacao} ON {tabela} BEGIN "
+                f"INSERT INTO alteracoes (entidade, entidade_id, versao, excluido, alterado_em) VALUES ("
+                f"'{entidade}', {registro}.id, "
+                f"(SELECT max(coalesce(max(versao), 0), 0) + 1 FROM alteracoes), {excluido}, CURRENT_TIMESTAMP) "
+                f"ON CONFLICT (entidade, entidade_id) DO UPDATE SET "
+                f"versao = excluded.versao, excluido = excluded.excluido, alterado_em = excluded.alterado_em; "
+                f"END"
+            )
+    return comandos
+
+
+def gatilhos_postgresql() -> list[str]:
+    comandos = [
+        "CREATE OR REPLACE FUNCTION registra_alteracao() RETURNS trigger AS $$ "
+        "BEGIN "
+        "INSERT INTO alteracoes (entidade, entidade_id, versao, excluido, alterado_em) VALUES ("
+        "TG_ARGV[0], CASE WHEN TG_OP = 'DELETE' THEN OLD.id ELSE NEW.id END, "
+        "CAST(CAST(pg_current_xact_id() AS text) AS bigint), TG_OP = 'DELETE', now()) "
+        "ON CONFLICT (entidade, entidade_id) DO UPDATE SET "
+        "versao = EXCLUDED.versao, excluido = EXCLUDED.excluido, alterado_em = EXCLUDED.alterado_em; "
+        "RETURN NULL; "
+        "END $$ LANGUAGE plpgsql"
+    ]
+    for entidade, tabela in TABELAS_RASTREADAS.items():
+        comandos += [
+            f"DROP TRIGGER IF EXISTS tr_{tabela}_alteracoes ON {tabela}",
+            f"CREATE TRIGGER tr_{tabela}_alteracoes AFTER INSERT OR UPDATE OR DELETE ON {tabela} "
+            f"FOR EACH ROW EXECUTE FUNCTION registra_alteracao('{entidade}')",
+        ]
+    return comandos
+
+
+@event.listens_for(Base.metadata, "after_create")
+def cria_gatilhos_de_alteracoes(metadata, conexao, **kw):
+    """Cria os gatilhos junto com as tabelas no `create_all` (testes); nos bancos migrados, eles vêm da migração."""
+    if not {AlteracaoModel.__tablename__, *TABELAS_RASTREADAS.values()} <= set(metadata.tables):
+        return
+    comandos = {"sqlite": gatilhos_sqlite, "postgresql": gatilhos_postgresql}.get(conexao.dialect.name)
+    for comando in comandos() if comandos else []:
+        conexao.execute(text(comando))
@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, ForeignKey, Date, DateTime, func
+
+from shared.database import Base
+from shared.dinheiro import Centavos
+
+
+class BaixaModel(Base):
+    """Lançamento de pagamento/recebimento (total ou parcial) de uma conta. Só recebe inserts."""
+    __tablename__ = 'baixas'
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    conta_a_pagar_e_receber_id = Column(
+        Integer, ForeignKey('contas_a_pagar_e_receber.id', ondelete='CASCADE'), nullable=False, index=True
+    )
+    valor = Column(Centavos(), nullable=False)
+    data_baixa = Column(Date(), nullable=False, index=True)
+    criada_em = Column(DateTime(), nullable=False, server_default=func.now())
@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Boolean, Date, DateTime, Index, func
+from sqlalchemy.orm import relationship
+
+from shared.database import Base
+from shared.dinheiro import Centavos
+
+
+class ContasAPagarEReceberArquivadaModel(Base):
+    """Contas baixadas antigas, movidas de `contas_a_pagar_e_receber` pelo arquivamento (mesmo `id`)."""
+    __tablename__ = 'contas_a_pagar_e_receber_arquivada'
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    descricao = Column(String(255))
+    valor = Column(Centavos)
+    tipo = Column(String(30))
+    data_previsao = Column(Date(), nullable=False)
+    data_baixa = Column(Date(), nullable=True)
+    valor_baixada = Column(Centavos(), nullable=True)
+    esta_baixada = Column(Boolean(), nullable=True)
+    serie_id = Column(String(36), nullable=True)
+    parcela = Column(Integer, nullable=True)
+    arquivada_em = Column(DateTime(), nullable=False, server_default=func.now())
+
+    fornecedor_cliente_id = Column(Integer, ForeignKey('fornecedor_cliente.id'))
+    fornecedor = relationship('FornecedorClienteModel')
+
+    __table_args__ = (
+        Index('ix_contas_a_pagar_e_receber_arquivada_fornecedor_data_previsao', 'fornecedor_cliente_id', 'data_previsao'),
+    )
@@ -1,18 +1,42 @@
-from sqlalchemy import Column, Integer, String, Numeric, ForeignKey, Boolean, Date
+from sqlalchemy import Column, Integer, String, ForeignKey, Boolean, Date, DateTime, Index, func
 from sqlalchemy.orm import relationship
 
 from shared.database import Base
+from shared.dinheiro import Centavos
+from shared.particionamento import ParticionamentoPorAno
+
 
 class ContasAPagarEReceberModel(Base):
     __tablename__ = 'contas_a_pagar_e_receber'
     id = Column(Integer, primary_key=True, autoincrement=True)
     descricao = Column(String(255))
-    valor = Column(Numeric)
+    valor = Column(Centavos)
     tipo = Column(String(30))
     data_previsao = Column(Date(), nullable=False)
-    data_baixa = Column(Date(), nullable=True)
-    valor_baixada = Column(Numeric(), nullable=True)
+    data_baixa = Column(Date(), nullable=True, index=True)
+    valor_baixada = Column(Centavos(), nullable=True)
     esta_baixada = Column(Boolean(), nullable=True, default=False)
+    atualizado_em = Column(DateTime, nullable=False, server_default=func.now(), onupdate=func.now())
+    # Contas geradas por uma recorrência compartilham o `serie_id`; `parcela` é a posição na série (1, 2, ...)
+    serie_id = Column(String(36), nullable=True, index=True)
+    parcela = Column(Integer, nullable=True)
 
     fornecedor_cliente_id = Column(Integer, ForeignKey('fornecedor_cliente.id'))
     fornecedor = relationship('FornecedorClienteModel')
+
+    __table_args__ = (
+        # Listagens e resumos por fornecedor sempre filtram pelo fornecedor e ordenam/filtram por data
+        Index('ix_contas_a_pagar_e_receber_fornecedor_data_previsao', 'fornecedor_cliente_id', 'data_previsao'),
+        # Índice parcial só com as contas em aberto: relatórios de vencimento filtram por `esta_baixada IS NOT TRUE`
+        Index(
+            'ix_contas_a_pagar_e_receber_abertas_data_previsao',
+            'data_previsao', 'fornecedor_cliente_id', 'tipo',
+            postgresql_where=esta_baixada.is_not(True),
+            sqlite_where=esta_baixada.is_not(True),
+        ),
+    )
+
+
+# No Postgres a tabela é particionada por ano de `data_previsao` (chave primária (id, data_previsao));
+# consultas devem filtrar `data_previsao` por intervalo para que só as partições do período sejam lidas.
+particoes_de_contas = ParticionamentoPorAno(ContasAPagarEReceberModel.__tablename__, 'data_previsao')
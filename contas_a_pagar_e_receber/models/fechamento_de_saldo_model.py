@@ -0,0 +1,10 @@
+from sqlalchemy import Column, Date
+
+from shared.database import Base
+from shared.dinheiro import Centavos
+
+
+class FechamentoDeSaldoModel(Base):
+    __tablename__ = 'fechamento_de_saldo'
+    data = Column(Date(), primary_key=True)
+    saldo = Column(Centavos(), nullable=False)
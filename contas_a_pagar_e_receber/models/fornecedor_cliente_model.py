@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, DateTime, Integer, String, func
 from sqlalchemy.orm import relationship
 
 from shared.database import Base
@@ -8,4 +8,5 @@ class FornecedorClienteModel(Base):
     __tablename__ = 'fornecedor_cliente'
     id = Column(Integer, primary_key=True, autoincrement=True)
     nome = Column(String(255))
+    atualizado_em = Column(DateTime, nullable=False, server_default=func.now(), onupdate=func.now())
 
@@ -0,0 +1,116 @@
+from typing import List
+
+from fastapi import APIRouter, Depends, Query
+from pydantic import BaseModel, Field
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session, selectinload
+
+from contas_a_pagar_e_receber.models.alteracao_model import AlteracaoModel
+from contas_a_pagar_e_receber.models.contas_a_pagar_e_receber_model import ContasAPagarEReceberModel
+from contas_a_pagar_e_receber.models.fornecedor_cliente_model import FornecedorClienteModel
+from contas_a_pagar_e_receber.routers.contas_a_pagar_e_receber_router import ContaAPagarEReceberResponse
+from contas_a_pagar_e_receber.routers.fornecedor_cliente_router import FornecedorClienteResponse
+from shared.dependencies import get_read_db
+
+router = APIRouter(prefix="/alteracoes", tags=["Alterações"])
+
+
+class AlteracoesResponse(BaseModel):
+    contas: List[ContaAPagarEReceberResponse] = Field(..., description="Contas criadas ou alteradas, no estado atual")
+    fornecedores: List[FornecedorClienteResponse] = Field(
+        ..., description="Fornecedores e clientes criados ou alterados, no estado atual"
+    )
+    contas_excluidas: List[int] = Field(..., description="IDs das contas excluídas ou arquivadas")
+    fornecedores_excluidos: List[int] = Field(..., description="IDs dos fornecedores e clientes excluídos")
+    cursor: int | None = Field(..., description="Valor a enviar em `desde` na próxima sincronização")
+    tem_mais: bool = Field(..., description="Há mais alterações além do limite; chame de novo com o novo cursor")
+
+
+def horizonte_de_versoes(sessao: Session) -> int | None:
+    """
+    Versões a partir deste valor ainda podem ganhar companhia de alterações não confirmadas, e por isso
+    não são entregues. No Postgres é o xmin do snapshot: toda transação com ID menor já terminou, então
+    nenhuma alteração com versão abaixo dele pode aparecer depois. No SQLite (um único escritor) não há limite.
+    """
+    if sessao.get_bind().dialect.name != "postgresql":
+        return None
+    return sessao.execute(text("SELECT CAST(CAST(pg_snapshot_xmin(pg_current_snapshot()) AS text) AS bigint)")).scalar()
+
+
+def busca_alteracoes(sessao: Session, desde: int | None, limite: int) -> tuple[list[AlteracaoModel], bool]:
+    """
+    Alterações com versão maior que `desde`, em ordem de versão, sem separar alterações de uma mesma
+    versão (transação) entre duas páginas.
+
+    Returns:
+        tuple: Alterações encontradas e se há mais alterações além do limite
+    """
+    consulta = select(AlteracaoModel)
+    if desde is not None:
+        consulta = consulta.where(AlteracaoModel.versao > desde)
+    horizonte = horizonte_de_versoes(sessao)
+    if horizonte is not None:
+        consulta = consulta.where(AlteracaoModel.versao < horizonte)
+
+    alteracoes = sessao.execute(
+        consulta.order_by(AlteracaoModel.versao, AlteracaoModel.entidade, AlteracaoModel.entidade_id).limit(limite + 1)
+    ).scalars().all()
+    if len(alteracoes) <= limite:
+        return alteracoes, False
+
+    versao_cortada = alteracoes[limite].versao
+    completas = [alteracao for alteracao in alteracoes[:limite] if alteracao.versao != versao_cortada]
+    if not completas:
+        # Uma única transação maior que o limite: vai inteira, para o cursor não parar no meio dela
+        completas = sessao.execute(
+            select(AlteracaoModel).where(AlteracaoModel.versao == versao_cortada)
+        ).scalars().all()
+    return completas, True
+
+
+@router.get("/", response_model=AlteracoesResponse)
+def listar_alteracoes(
+        desde: int | None = Query(None, description="Cursor devolvido na sincronização anterior; vazio traz tudo"),
+        limite: int = Query(1000, gt=0, le=10000, description="Quantidade máxima de alterações por chamada"),
+        sessao: Session = Depends(get_read_db),
+) -> AlteracoesResponse:
+    """
+    Feed incremental de alterações de contas e fornecedores, para sincronização de clientes.
+
+    O custo é proporcional à quantidade de alterações desde o cursor, e não ao tamanho das tabelas.
+
+    Args:
+        desde: Cursor devolvido na sincronização anterior
+        limite: Quantidade máxima de alterações por chamada
+        sessao: Sessão do banco de dados
+
+    Returns:
+        AlteracoesResponse: Registros alterados, IDs excluídos e o próximo cursor
+    """
+    alteracoes, tem_mais = busca_alteracoes(sessao, desde, limite)
+
+    ids = {"conta": ([], []), "fornecedor": ([], [])}
+    for alteracao in alteracoes:
+        alterados, excluidos = ids[alteracao.entidade]
+        (excluidos if alteracao.excluido else alterados).append(alteracao.entidade_id)
+
+    contas = sessao.execute(
+        select(ContasAPagarEReceberModel)
+        .where(ContasAPagarEReceberModel.id.in_(ids["conta"][0]))
+        .options(selectinload(ContasAPagarEReceberModel.fornecedor))
+        .order_by(ContasAPagarEReceberModel.id)
+    ).scalars().all() if ids["conta"][0] else []
+    fornecedores = sessao.execute(
+        select(FornecedorClienteModel)
+        .where(FornecedorClienteModel.id.in_(ids["fornecedor"][0]))
+        .order_by(FornecedorClienteModel.id)
+    ).scalars().all() if ids["fornecedor"][0] else []
+
+    return AlteracoesResponse(
+        contas=[ContaAPagarEReceberResponse.model_validate(conta) for conta in contas],
+        fornecedores=[FornecedorClienteResponse.model_validate(fornecedor) for fornecedor in fornecedores],
+        contas_excluidas=ids["conta"][1],
+        fornecedores_excluidos=ids["fornecedor"][1],
+        cursor=alteracoes[-1].versao if alteracoes else desde,
+        tem_mais=tem_mais,
+    )
@@ -1,35 +1,48 @@
 from datetime import date
 from decimal import Decimal
 from enum import Enum
-from itertools import groupby
 from typing import List, Any
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from fastapi import HTTPException
 from pydantic import BaseModel, Field, ConfigDict
-from sqlalchemy import extract
+from sqlalchemy import delete, func, insert, lambda_stmt, select, union_all, update
 from sqlalchemy.orm import Session
 
-from contas_a_pagar_e_receber.models.contas_a_pagar_e_receber_model import ContasAPagarEReceberModel
+from contas_a_pagar_e_receber.models.baixa_model import BaixaModel
+from contas_a_pagar_e_receber.models.contas_a_pagar_e_receber_arquivada_model import \
+    ContasAPagarEReceberArquivadaModel
+from contas_a_pagar_e_receber.models.contas_a_pagar_e_receber_model import ContasAPagarEReceberModel, \
+    particoes_de_contas
+from contas_a_pagar_e_receber.models.fechamento_de_saldo_model import FechamentoDeSaldoModel
 from contas_a_pagar_e_receber.models.fornecedor_cliente_model import FornecedorClienteModel
 from contas_a_pagar_e_receber.routers.fornecedor_cliente_router import FornecedorClienteResponse
-from shared.dependencies import get_db
+from shared.dependencies import get_db, get_read_db
+from shared.dinheiro import VALOR_MAXIMO, Valor
+from shared.eventos import hub_de_eventos
 from shared.exceptions import NotFound
 
 router = APIRouter(prefix="/contas-a-pagar-e-receber", tags=["Contas a Pagar e Receber"])
 
 QUANTIDADE_DE_CONTAS_PERMITIDA_POR_MES = 5
+DESCRICAO_INCLUIR_ARQUIVADAS = "Inclui as contas baixadas antigas movidas para o arquivo"
+TAMANHO_DO_LOTE_DE_EXCLUSAO = 1000
+# IDs por evento de exclusão em lote, para caber no limite de 8000 bytes do NOTIFY do Postgres
+IDS_POR_EVENTO_DE_EXCLUSAO = 500
+# Campos da conta que mudam o saldo realizado das baixas já lançadas
+CAMPOS_QUE_ALTERAM_O_SALDO = {"tipo", "valor"}
+MENSAGEM_VALOR_MENOR_QUE_O_BAIXADO = "Valor da conta menor que o valor já baixado"
 
 
 class ContaAPagarEReceberResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
     id: int
     descricao: str
-    valor: float
+    valor: Valor
     tipo: str
     data_previsao: date
     data_baixa: date | None = None,
-    valor_baixada: float | None = None,
+    valor_baixada: Valor | None = None,
     esta_baixada: bool | None = None
     fornecedor: FornecedorClienteResponse | None = None
 
@@ -41,27 +54,144 @@ class ContaPagarEReceberEnum(str, Enum):
 
 class ContaAPagarEReceberRequest(BaseModel):
     descricao: str = Field(..., min_length=3, max_length=255)
-    valor: Decimal = Field(..., gt=0)
+    valor: Decimal = Field(..., gt=0, le=VALOR_MAXIMO, decimal_places=2)
     tipo: str = ContaPagarEReceberEnum
     data_previsao: date
     fornecedor_cliente_id: int | None = None
 
 
+class ContaAPagarEReceberParcialRequest(BaseModel):
+    """Atualização parcial: só os campos enviados são alterados (os obrigatórios não aceitam null)."""
+    descricao: str = Field(None, min_length=3, max_length=255)
+    valor: Decimal = Field(None, gt=0, le=VALOR_MAXIMO, decimal_places=2)
+    tipo: ContaPagarEReceberEnum = None
+    data_previsao: date = None
+    fornecedor_cliente_id: int | None = None
+
+
+class BaixaRequest(BaseModel):
+    valor: Decimal = Field(..., gt=0, le=VALOR_MAXIMO, decimal_places=2, description="Valor pago ou recebido")
+    data_baixa: date | None = Field(None, description="Data do pagamento ou recebimento (padrão: hoje)")
+
+
+class BaixaResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    id: int
+    valor: Valor
+    data_baixa: date
+
+
+class ExclusaoDeContasEmLoteRequest(BaseModel):
+    ids: List[int] | None = Field(None, max_length=10000, description="IDs das contas a excluir")
+    data_inicio: date | None = Field(None, description="Data de previsão inicial (inclusive)")
+    data_fim: date | None = Field(None, description="Data de previsão final (inclusive)")
+    tipo: ContaPagarEReceberEnum | None = None
+    esta_baixada: bool | None = None
+    data_baixa_ate: date | None = Field(None, description="Contas baixadas até esta data (inclusive)")
+    fornecedor_cliente_id: int | None = None
+    serie_id: str | None = Field(None, description="Contas de uma recorrência")
+
+
+class ExclusaoDeContasEmLoteResponse(BaseModel):
+    quantidade_excluida: int
+    lotes: int
+
+
 class PrevisaoGastosPorMesResponse(BaseModel):
     mes: int
-    valor_total: float
+    valor_total: Valor
+
 
+# Colunas comuns às contas ativas e arquivadas, usadas nas consultas que juntam as duas tabelas
+COLUNAS_DA_CONTA = (
+    "id", "descricao", "valor", "tipo", "data_previsao", "data_baixa", "valor_baixada", "esta_baixada",
+    "fornecedor_cliente_id",
+)
 
-def buscar_todas_contas(sessao: Session) -> list[type[ContasAPagarEReceberModel]]:
-    """Busca todas as contas cadastradas no banco de dados."""
-    return sessao.query(ContasAPagarEReceberModel).all()
+
+def buscar_todas_contas(sessao: Session, incluir_arquivadas: bool = False) -> list:
+    """
+    Busca todas as contas cadastradas no banco de dados e, se pedido, também as arquivadas.
+
+    Com as arquivadas, as duas tabelas são juntadas e ordenadas pelo ID no banco (UNION ALL), com o
+    fornecedor no mesmo SELECT.
+    """
+    if not incluir_arquivadas:
+        return sessao.query(ContasAPagarEReceberModel).all()
+
+    uniao = union_all(*(
+        select(*(getattr(modelo, coluna) for coluna in COLUNAS_DA_CONTA))
+        for modelo in (ContasAPagarEReceberModel, ContasAPagarEReceberArquivadaModel)
+    )).subquery()
+    linhas = sessao.execute(
+        select(uniao, FornecedorClienteModel)
+        .outerjoin(FornecedorClienteModel, FornecedorClienteModel.id == uniao.c.fornecedor_cliente_id)
+        .order_by(uniao.c.id)
+    )
+    return [
+        ContaAPagarEReceberResponse.model_validate(
+            {**dict(zip(COLUNAS_DA_CONTA, valores)), "fornecedor": fornecedor}, from_attributes=True
+        )
+        for *valores, fornecedor in linhas
+    ]
+
+
+def filtra_contas(
+        consulta,
+        data_inicio: date | None = None,
+        data_fim: date | None = None,
+        tipo: ContaPagarEReceberEnum | None = None,
+        esta_baixada: bool | None = None,
+        modelo=ContasAPagarEReceberModel,
+):
+    """
+    Aplica os filtros opcionais de período (data de previsão), tipo e situação a uma consulta de contas.
+
+    Contas com `esta_baixada` nulo são tratadas como em aberto. `modelo` permite aplicar os mesmos
+    filtros às contas arquivadas.
+    """
+    if data_inicio is not None:
+        consulta = consulta.filter(modelo.data_previsao >= data_inicio)
+    if data_fim is not None:
+        consulta = consulta.filter(modelo.data_previsao <= data_fim)
+    if tipo is not None:
+        consulta = consulta.filter(modelo.tipo == tipo.value)
+    if esta_baixada is True:
+        consulta = consulta.filter(modelo.esta_baixada.is_(True))
+    elif esta_baixada is False:
+        consulta = consulta.filter(modelo.esta_baixada.is_not(True))
+    return consulta
+
+
+def invalida_fechamentos_de_saldo(db: Session, data_baixa: date | None) -> None:
+    """Remove os fechamentos de saldo que incluem uma baixa alterada ou removida nesta data."""
+    if data_baixa is not None:
+        db.query(FechamentoDeSaldoModel).filter(FechamentoDeSaldoModel.data >= data_baixa).delete()
+
+
+def primeira_baixa_das_contas(db: Session, condicao) -> date | None:
+    """Data da baixa mais antiga das contas que atendem à condição, se houver."""
+    return db.execute(select(func.min(BaixaModel.data_baixa)).where(condicao)).scalar()
+
+
+def exclui_baixas(db: Session, condicao) -> date | None:
+    """
+    Remove as baixas que atendem à condição (antes de excluir as contas) e devolve a data da mais antiga,
+    para invalidar os fechamentos de saldo a partir dela.
+    """
+    datas_de_baixa = db.execute(
+        delete(BaixaModel).where(condicao).returning(BaixaModel.data_baixa).execution_options(synchronize_session=False)
+    ).scalars().all()
+    return min(datas_de_baixa, default=None)
 
 
 def valida_fornecedor(fornecedor_cliente_id, db):
     if fornecedor_cliente_id:
-        fornecedor_cliente_existente = db.query(FornecedorClienteModel).filter_by(
-            id=fornecedor_cliente_id
-        ).first()
+        # Só a existência importa: seleciona o ID, sem montar a entidade. O lambda_stmt reaproveita a
+        # construção e a compilação do SQL entre chamadas; só o parâmetro muda.
+        fornecedor_cliente_existente = db.execute(lambda_stmt(
+            lambda: select(FornecedorClienteModel.id).where(FornecedorClienteModel.id == fornecedor_cliente_id)
+        )).scalar_one_or_none()
 
         if not fornecedor_cliente_existente:
             raise NotFound(f"Fornecedor com ID {fornecedor_cliente_id}")
@@ -70,10 +200,12 @@ def valida_fornecedor(fornecedor_cliente_id, db):
 def recupera_numero_de_registros(db, ano, mes) -> int:
     """Valida o número de registros no banco de dados."""
     # Implementar a lógica de validação do número de registros
+    inicio_do_mes = date(ano, mes, 1)
+    inicio_do_proximo_mes = date(ano + mes // 12, mes % 12 + 1, 1)
     qtde_registros = (
         db.query(ContasAPagarEReceberModel)
-        .filter(extract('year', ContasAPagarEReceberModel.data_previsao) == ano)
-        .filter(extract('month', ContasAPagarEReceberModel.data_previsao) == mes)
+        .filter(ContasAPagarEReceberModel.data_previsao >= inicio_do_mes)
+        .filter(ContasAPagarEReceberModel.data_previsao < inicio_do_proximo_mes)
         .count()
     )
     return qtde_registros
@@ -92,16 +224,26 @@ def valida_se_pode_criar_nova_conta(
 def relatorio_gastos_previstos_por_mes_de_um_ano(
         db: Session,
         ano: int,
+        incluir_arquivadas: bool = False,
 ) -> List[PrevisaoGastosPorMesResponse]:
     """Retorna uma lista de contas a pagar e receber para um determinado mês e ano."""
 
-    contas = (
-        db.query(ContasAPagarEReceberModel)
-        .filter(extract('year', ContasAPagarEReceberModel.data_previsao) == ano)
-        .filter(ContasAPagarEReceberModel.tipo == ContaPagarEReceberEnum.Pagar)
-        .order_by(ContasAPagarEReceberModel.data_previsao.desc())
-        .all()
-    )
+    # Intervalo em vez de extract('year'): permite usar o índice e ler só a partição do ano
+    def contas_a_pagar_do_ano(modelo):
+        return (
+            select(modelo.data_previsao, modelo.valor)
+            .filter(modelo.data_previsao >= date(ano, 1, 1))
+            .filter(modelo.data_previsao < date(ano + 1, 1, 1))
+            .filter(modelo.tipo == ContaPagarEReceberEnum.Pagar)
+        )
+
+    consulta = contas_a_pagar_do_ano(ContasAPagarEReceberModel)
+    if incluir_arquivadas:
+        consulta = union_all(consulta, contas_a_pagar_do_ano(ContasAPagarEReceberArquivadaModel)).subquery()
+        consulta = select(consulta).order_by(consulta.c.data_previsao.desc())
+    else:
+        consulta = consulta.order_by(ContasAPagarEReceberModel.data_previsao.desc())
+    contas = db.execute(consulta).all()
 
     valor_por_mes = {}
 
@@ -114,28 +256,29 @@ def relatorio_gastos_previstos_por_mes_de_um_ano(
 
         valor_por_mes[mes] += valor
 
-    for k, g in groupby(contas, lambda x: x.data_previsao.month):
-        print({k: sum(v.valor for v in g)})
-        # valor_por_mes2[k] = sum(conta.valor for conta in g)
-
     return [PrevisaoGastosPorMesResponse(mes=k, valor_total=v) for k, v in valor_por_mes.items()]
 
 
 
 @router.get("/previsao-gastos-do-mes", response_model=List[PrevisaoGastosPorMesResponse])
-def previsao_de_gastos_por_mes_do_ano(db: Session = Depends(get_db), ano=date.year):
+def previsao_de_gastos_por_mes_do_ano(
+        db: Session = Depends(get_read_db),
+        ano: int | None = None,
+        incluir_arquivadas: bool = Query(False, description=DESCRICAO_INCLUIR_ARQUIVADAS),
+):
     """
     Endpoint para gerar um relatório de gastos previstos por mês de um ano.
 
     Args:
-        ano: Ano para o qual o relatório será gerado
+        ano: Ano para o qual o relatório será gerado (padrão: ano corrente)
         db: Sessão do banco de dados
+        incluir_arquivadas: Inclui as contas arquivadas nos totais
 
     Returns:
         List[ContaAPagarEReceberResponse]: Relatório de gastos previstos
     """
 
-    r = relatorio_gastos_previstos_por_mes_de_um_ano(db, ano)
+    r = relatorio_gastos_previstos_por_mes_de_um_ano(db, ano or date.today().year, incluir_arquivadas)
     return r
 
 
@@ -145,17 +288,21 @@ def previsao_de_gastos_por_mes_do_ano(db: Session = Depends(get_db), ano=date.ye
     summary="Listar todas as contas",
     description="Retorna uma lista com todas as contas a pagar e receber cadastradas"
 )
-def listar_todas_contas(sessao: Session = Depends(get_db)) -> List[ContaAPagarEReceberResponse]:
+def listar_todas_contas(
+        sessao: Session = Depends(get_read_db),
+        incluir_arquivadas: bool = Query(False, description=DESCRICAO_INCLUIR_ARQUIVADAS),
+) -> List[ContaAPagarEReceberResponse]:
     """
     Endpoint para listar todas as contas a pagar e receber.
 
     Args:
         sessao: Sessão do banco de dados
+        incluir_arquivadas: Inclui as contas arquivadas
 
     Returns:
         List[ContaAPagarEReceberResponse]: Lista de contas encontradas
     """
-    return buscar_todas_contas(sessao)
+    return buscar_todas_contas(sessao, incluir_arquivadas)
 
 
 # @router.get("/", response_model=list[ContaAPagarEReceberResponse])
@@ -174,9 +321,13 @@ def listar_todas_contas(sessao: Session = Depends(get_db)) -> List[ContaAPagarER
 #     return [{"conta1": "Conta 1"}, {"conta2": "Conta 2"}]
 
 
-def buscar_conta_por_id(sessao: Session, conta_id: int) -> ContasAPagarEReceberModel:
-    """Busca uma conta pelo ID."""
-    contas_a_pagar_e_receber = sessao.query(ContasAPagarEReceberModel).filter_by(id=conta_id).first()
+def buscar_conta_por_id(sessao: Session, conta_id: int, incluir_arquivadas: bool = False) -> ContasAPagarEReceberModel:
+    """Busca uma conta pelo ID; se pedido, procura também entre as arquivadas."""
+    contas_a_pagar_e_receber = sessao.execute(lambda_stmt(
+        lambda: select(ContasAPagarEReceberModel).where(ContasAPagarEReceberModel.id == conta_id)
+    )).scalar_one_or_none()
+    if not contas_a_pagar_e_receber and incluir_arquivadas:
+        contas_a_pagar_e_receber = sessao.get(ContasAPagarEReceberArquivadaModel, conta_id)
 
     if not contas_a_pagar_e_receber:
         raise NotFound(f"Conta com ID {conta_id} não encontrada")
@@ -184,10 +335,53 @@ def buscar_conta_por_id(sessao: Session, conta_id: int) -> ContasAPagarEReceberM
     return contas_a_pagar_e_receber
 
 
+def publica_evento_de_conta(
+        tipo: str, conta: ContasAPagarEReceberModel | ContaAPagarEReceberResponse, sessao: Session
+) -> None:
+    """Notifica os assinantes de GET /eventos; chamado antes do commit, que confirma a entrega."""
+    hub_de_eventos.publica(tipo, ContaAPagarEReceberResponse.model_validate(conta).model_dump(mode="json"), sessao)
+
+
+def registra_baixa(db: Session, conta_id: int, valor: Decimal, data_baixa: date) -> ContaAPagarEReceberResponse:
+    """
+    Lança uma baixa (total ou parcial) no livro de baixas e atualiza, na mesma transação, os totais
+    desnormalizados da conta (`valor_baixada`, `esta_baixada`, `data_baixa` da última baixa).
+
+    A conta é atualizada com um único UPDATE atômico, que também impede baixar mais que o saldo em aberto.
+
+    Raises:
+        NotFound: Se a conta não for encontrada
+        HTTPException: Se o valor for maior que o saldo em aberto da conta
+    """
+    conta = ContasAPagarEReceberModel
+    valor_baixada = func.coalesce(conta.valor_baixada, 0) + valor
+    atualizada = db.execute(
+        update(conta)
+        .where(conta.id == conta_id, valor_baixada <= conta.valor)
+        .values(valor_baixada=valor_baixada, esta_baixada=valor_baixada >= conta.valor, data_baixa=data_baixa)
+        .returning(conta)
+        .execution_options(synchronize_session=False)
+    ).scalar_one_or_none()
+
+    if atualizada is None:
+        db.rollback()
+        buscar_conta_por_id(db, conta_id)
+        raise HTTPException(status_code=422, detail="Valor da baixa maior que o saldo em aberto da conta")
+
+    db.execute(insert(BaixaModel).values(conta_a_pagar_e_receber_id=conta_id, valor=valor, data_baixa=data_baixa))
+    invalida_fechamentos_de_saldo(db, data_baixa)
+
+    resposta = ContaAPagarEReceberResponse.model_validate(atualizada)
+    publica_evento_de_conta("baixa_registrada", resposta, db)
+    db.commit()
+    return resposta
+
+
 @router.get("/{conta_id}", response_model=ContaAPagarEReceberResponse)
 def listar_conta_por_id(
         conta_id: int,
-        db: Session = Depends(get_db)
+        db: Session = Depends(get_read_db),
+        incluir_arquivadas: bool = Query(False, description=DESCRICAO_INCLUIR_ARQUIVADAS),
 ) -> ContaAPagarEReceberResponse:
     """
     Endpoint para listar uma conta a pagar ou receber pelo ID.
@@ -195,6 +389,7 @@ def listar_conta_por_id(
     Args:
         conta_id: ID da conta a ser buscada
         db: Sessão do banco de dados
+        incluir_arquivadas: Procura também entre as contas arquivadas
 
     Returns:
         ContaAPagarEReceberResponse: Conta encontrada
@@ -202,7 +397,7 @@ def listar_conta_por_id(
     Raises:
         HTTPException: Se a conta não for encontrada
     """
-    contas_a_pagar_e_receber = buscar_conta_por_id(db, conta_id)
+    contas_a_pagar_e_receber = buscar_conta_por_id(db, conta_id, incluir_arquivadas)
 
     if not contas_a_pagar_e_receber:
         raise NotFound(f"Conta com ID {conta_id} não encontrada")
@@ -232,6 +427,9 @@ def criar_conta(conta: ContaAPagarEReceberRequest, db: Session = Depends(get_db)
     # db.refresh(contas_a_pagar_e_receber)
     # return contas_a_pagar_e_receber
 
+    # Antes de qualquer consulta da sessão à tabela de contas (ver `garante_anos`)
+    particoes_de_contas.garante_anos(db.get_bind(), [conta.data_previsao.year])
+
     # Verifica se o fornecedor_cliente_id existe
     valida_fornecedor(conta.fornecedor_cliente_id, db)
 
@@ -250,6 +448,8 @@ def criar_conta(conta: ContaAPagarEReceberRequest, db: Session = Depends(get_db)
 
         contas_a_pagar_e_receber = ContasAPagarEReceberModel(**conta.model_dump())
         db.add(contas_a_pagar_e_receber)
+        db.flush()
+        publica_evento_de_conta("conta_criada", contas_a_pagar_e_receber, db)
         db.commit()
         db.refresh(contas_a_pagar_e_receber)
         return contas_a_pagar_e_receber
@@ -291,15 +491,31 @@ def atualizar_conta(
         HTTPException: Se a conta não for encontrada ou houver erro na atualização
     """
 
+    # Antes de qualquer consulta da sessão à tabela de contas (ver `garante_anos`)
+    particoes_de_contas.garante_anos(db.get_bind(), [conta.data_previsao.year])
     contas_a_pagar_e_receber = buscar_conta_por_id(db, conta_id)
 
     # Verifica se o fornecedor_cliente_id existe
     valida_fornecedor(conta.fornecedor_cliente_id, db)
 
+    valor_baixado = contas_a_pagar_e_receber.valor_baixada or 0
+    if conta.valor < valor_baixado:
+        raise HTTPException(status_code=422, detail=MENSAGEM_VALOR_MENOR_QUE_O_BAIXADO)
+
     try:
-        for key, value in conta.model_dump().items():
+        valores = conta.model_dump()
+        if valores["valor"] != contas_a_pagar_e_receber.valor:
+            # Mesma regra de `registra_baixa`: baixada quando o valor baixado cobre o valor da conta
+            valores["esta_baixada"] = valor_baixado >= valores["valor"]
+        if any(getattr(contas_a_pagar_e_receber, campo) != valores[campo] for campo in CAMPOS_QUE_ALTERAM_O_SALDO):
+            invalida_fechamentos_de_saldo(
+                db, primeira_baixa_das_contas(db, BaixaModel.conta_a_pagar_e_receber_id == conta_id)
+            )
+        for key, value in valores.items():
             setattr(contas_a_pagar_e_receber, key, value)
 
+        db.flush()
+        publica_evento_de_conta("conta_atualizada", contas_a_pagar_e_receber, db)
         db.commit()
         db.refresh(contas_a_pagar_e_receber)
 
@@ -310,52 +526,243 @@ def atualizar_conta(
         raise HTTPException(status_code=500, detail="Erro ao atualizar conta")
 
 
+@router.patch("/{conta_id}", response_model=ContaAPagarEReceberResponse)
+def atualizar_conta_parcialmente(
+        conta_id: int,
+        conta: ContaAPagarEReceberParcialRequest,
+        db: Session = Depends(get_db)
+) -> ContaAPagarEReceberResponse:
+    """
+    Atualiza apenas os campos enviados de uma conta a pagar ou receber, com um único UPDATE ... RETURNING.
+
+    Args:
+        conta_id: ID da conta a ser atualizada
+        conta: Campos a serem alterados
+        db: Sessão do banco de dados
+
+    Returns:
+        ContaAPagarEReceberResponse: Conta atualizada
+
+    Raises:
+        NotFound: Se a conta ou o fornecedor informado não forem encontrados
+        HTTPException: Se o novo valor for menor que o valor já baixado
+    """
+    valores = conta.model_dump(exclude_unset=True)
+    if not valores:
+        return buscar_conta_por_id(db, conta_id)
+
+    if "data_previsao" in valores:
+        # Antes de qualquer consulta da sessão à tabela de contas (ver `garante_anos`)
+        particoes_de_contas.garante_anos(db.get_bind(), [valores["data_previsao"].year])
+    if "tipo" in valores:
+        valores["tipo"] = valores["tipo"].value
+    valida_fornecedor(valores.get("fornecedor_cliente_id"), db)
+
+    condicoes = [ContasAPagarEReceberModel.id == conta_id]
+    if "valor" in valores:
+        # Mesma regra de `registra_baixa`, no mesmo UPDATE: o valor não fica abaixo do já baixado
+        valor_baixado = func.coalesce(ContasAPagarEReceberModel.valor_baixada, 0)
+        condicoes.append(valor_baixado <= valores["valor"])
+        valores["esta_baixada"] = valor_baixado >= valores["valor"]
+
+    contas_a_pagar_e_receber = db.execute(
+        update(ContasAPagarEReceberModel)
+        .where(*condicoes)
+        .values(**valores)
+        .returning(ContasAPagarEReceberModel)
+        .execution_options(synchronize_session=False)
+    ).scalar_one_or_none()
+
+    if contas_a_pagar_e_receber is None:
+        db.rollback()
+        buscar_conta_por_id(db, conta_id)
+        raise HTTPException(status_code=422, detail=MENSAGEM_VALOR_MENOR_QUE_O_BAIXADO)
+
+    if CAMPOS_QUE_ALTERAM_O_SALDO & valores.keys():
+        invalida_fechamentos_de_saldo(db, primeira_baixa_das_contas(db, BaixaModel.conta_a_pagar_e_receber_id == conta_id))
+
+    # Serializa antes do commit, que expiraria o objeto e forçaria um novo SELECT
+    resposta = ContaAPagarEReceberResponse.model_validate(contas_a_pagar_e_receber)
+    publica_evento_de_conta("conta_atualizada", resposta, db)
+    db.commit()
+    return resposta
+
+
 @router.delete("/{conta_id}", status_code=204)
 def deletar_conta(
         conta_id: int,
         db: Session = Depends(get_db)
 ) -> None:
     """
-    Deleta uma conta a pagar ou receber existente.
+    Deleta uma conta a pagar ou receber existente, com um único DELETE ... RETURNING.
 
     Args:
         conta_id: ID da conta a ser deletada
         db: Sessão do banco de dados
 
     Raises:
-        HTTPException: Se a conta não for encontrada ou houver erro na deleção
+        NotFound: Se a conta não for encontrada
     """
 
-    contas_a_pagar_e_receber = buscar_conta_por_id(db, conta_id)
-    db.delete(contas_a_pagar_e_receber)
+    primeira_baixa = exclui_baixas(db, BaixaModel.conta_a_pagar_e_receber_id == conta_id)
+    removida = db.execute(
+        delete(ContasAPagarEReceberModel)
+        .where(ContasAPagarEReceberModel.id == conta_id)
+        .returning(ContasAPagarEReceberModel.id)
+        .execution_options(synchronize_session=False)
+    ).first()
+
+    if removida is None:
+        raise NotFound(f"Conta com ID {conta_id} não encontrada")
+
+    invalida_fechamentos_de_saldo(db, primeira_baixa)
+    hub_de_eventos.publica("conta_excluida", {"id": conta_id}, db)
     db.commit()
 
-    # try:
-    #     # contas_a_pagar_e_receber = db.query(ContasAPagarEReceberModel).filter_by(id=conta_id).first()
-    #     contas_a_pagar_e_receber = buscar_conta_por_id(db, conta_id)
-    #
-    #     if not contas_a_pagar_e_receber:
-    #         raise HTTPException(status_code=404, detail="Conta não encontrada")
-    #
-    #     db.delete(contas_a_pagar_e_receber)
-    #     db.commit()
-    #
-    # except Exception as e:
-    #     db.rollback()
-    #     raise HTTPException(status_code=500, detail="Erro ao deletar conta")
+
+def exclui_contas_em_lotes(
+        db: Session,
+        criterios: ExclusaoDeContasEmLoteRequest,
+        tamanho_do_lote: int = TAMANHO_DO_LOTE_DE_EXCLUSAO,
+) -> ExclusaoDeContasEmLoteResponse:
+    """
+    Exclui as contas que atendem aos critérios, em lotes de `tamanho_do_lote` com um commit por lote,
+    para manter os bloqueios curtos. As contas não são carregadas na sessão.
+    """
+    conta = ContasAPagarEReceberModel
+    consulta = filtra_contas(
+        select(conta.id), criterios.data_inicio, criterios.data_fim, criterios.tipo, criterios.esta_baixada
+    )
+    if criterios.ids is not None:
+        consulta = consulta.where(conta.id.in_(criterios.ids))
+    if criterios.data_baixa_ate is not None:
+        consulta = consulta.where(conta.esta_baixada.is_(True), conta.data_baixa <= criterios.data_baixa_ate)
+    if criterios.fornecedor_cliente_id is not None:
+        consulta = consulta.where(conta.fornecedor_cliente_id == criterios.fornecedor_cliente_id)
+    if criterios.serie_id is not None:
+        consulta = consulta.where(conta.serie_id == criterios.serie_id)
+
+    quantidade_excluida = 0
+    lotes = 0
+    while True:
+        ids = db.execute(consulta.order_by(conta.id).limit(tamanho_do_lote)).scalars().all()
+        if not ids:
+            break
+
+        primeira_baixa = exclui_baixas(db, BaixaModel.conta_a_pagar_e_receber_id.in_(ids))
+        removidas = db.execute(
+            delete(conta).where(conta.id.in_(ids)).execution_options(synchronize_session=False)
+        ).rowcount
+        invalida_fechamentos_de_saldo(db, primeira_baixa)
+        for inicio in range(0, len(ids), IDS_POR_EVENTO_DE_EXCLUSAO):
+            hub_de_eventos.publica("contas_excluidas", {"ids": ids[inicio:inicio + IDS_POR_EVENTO_DE_EXCLUSAO]}, db)
+        db.commit()
+
+        quantidade_excluida += removidas
+        lotes += 1
+        if len(ids) < tamanho_do_lote:
+            break
+
+    return ExclusaoDeContasEmLoteResponse(quantidade_excluida=quantidade_excluida, lotes=lotes)
+
+
+@router.post("/exclusao-em-lote", response_model=ExclusaoDeContasEmLoteResponse, status_code=200)
+def excluir_contas_em_lote(
+        criterios: ExclusaoDeContasEmLoteRequest,
+        db: Session = Depends(get_db)
+) -> ExclusaoDeContasEmLoteResponse:
+    """
+    Exclui em lotes as contas informadas por ID e/ou que atendem aos filtros
+    (ex.: contas baixadas até uma data).
+
+    Args:
+        criterios: IDs e filtros das contas a excluir; os critérios informados são combinados
+        db: Sessão do banco de dados
+
+    Returns:
+        ExclusaoDeContasEmLoteResponse: Quantidade de contas excluídas e de lotes executados
+
+    Raises:
+        HTTPException: Se nenhum ID ou filtro for informado
+    """
+    if not criterios.model_dump(exclude_none=True):
+        raise HTTPException(status_code=422, detail="Informe os IDs ou ao menos um filtro para a exclusão em lote")
+
+    return exclui_contas_em_lotes(db, criterios, TAMANHO_DO_LOTE_DE_EXCLUSAO)
 
 
 @router.post("/{conta_id}/baixar", response_model=ContaAPagarEReceberResponse, status_code=200)
 def baixar_conta(
         conta_id: int,
         db: Session = Depends(get_db)
-) -> ContasAPagarEReceberModel:
-    contas_a_pagar_e_receber = buscar_conta_por_id(db, conta_id)
-    contas_a_pagar_e_receber.data_baixa = date.today()
-    contas_a_pagar_e_receber.esta_baixada = True
-    contas_a_pagar_e_receber.valor_baixada = contas_a_pagar_e_receber.valor
+) -> ContaAPagarEReceberResponse:
+    """
+    Quita o saldo em aberto da conta com uma baixa na data de hoje. Contas já quitadas não são alteradas.
 
-    db.commit()
-    db.refresh(contas_a_pagar_e_receber)
+    Args:
+        conta_id: ID da conta a ser baixada
+        db: Sessão do banco de dados
 
-    return contas_a_pagar_e_receber
+    Returns:
+        ContaAPagarEReceberResponse: Conta baixada
+    """
+    # Bloqueia a conta para que baixas simultâneas não leiam o mesmo saldo em aberto
+    conta = ContasAPagarEReceberModel
+    saldo_em_aberto = (
+        db.query(conta.valor - func.coalesce(conta.valor_baixada, 0))
+        .filter(conta.id == conta_id)
+        .with_for_update()
+        .scalar()
+    )
+    if saldo_em_aberto is None or saldo_em_aberto <= 0:
+        return buscar_conta_por_id(db, conta_id)
+
+    return registra_baixa(db, conta_id, saldo_em_aberto, date.today())
+
+
+@router.post("/{conta_id}/baixas", response_model=ContaAPagarEReceberResponse, status_code=201)
+def registrar_baixa(
+        conta_id: int,
+        baixa: BaixaRequest,
+        db: Session = Depends(get_db)
+) -> ContaAPagarEReceberResponse:
+    """
+    Registra um pagamento ou recebimento, total ou parcial, de uma conta.
+
+    Args:
+        conta_id: ID da conta
+        baixa: Valor e data da baixa
+        db: Sessão do banco de dados
+
+    Returns:
+        ContaAPagarEReceberResponse: Conta com os totais baixados atualizados
+
+    Raises:
+        NotFound: Se a conta não for encontrada
+        HTTPException: Se o valor for maior que o saldo em aberto da conta
+    """
+    return registra_baixa(db, conta_id, baixa.valor, baixa.data_baixa or date.today())
+
+
+@router.get("/{conta_id}/baixas", response_model=List[BaixaResponse])
+def listar_baixas(
+        conta_id: int,
+        db: Session = Depends(get_read_db)
+) -> List[BaixaModel]:
+    """
+    Lista as baixas de uma conta, da mais antiga para a mais recente.
+
+    Args:
+        conta_id: ID da conta
+        db: Sessão do banco de dados
+
+    Returns:
+        List[BaixaResponse]: Baixas registradas para a conta
+    """
+    buscar_conta_por_id(db, conta_id)
+    return (
+        db.query(BaixaModel)
+        .filter(BaixaModel.conta_a_pagar_e_receber_id == conta_id)
+        .order_by(BaixaModel.data_baixa, BaixaModel.id)
+        .all()
+    )
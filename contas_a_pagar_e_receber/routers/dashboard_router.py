@@ -0,0 +1,154 @@
+from datetime import date
+from typing import List
+
+from fastapi import APIRouter, Depends, Query
+from pydantic import BaseModel
+from sqlalchemy import and_, func, select, true
+from sqlalchemy.orm import Session
+
+from config import DASHBOARD_CACHE_TTL_SEGUNDOS
+from contas_a_pagar_e_receber.models.baixa_model import BaixaModel
+from contas_a_pagar_e_receber.models.contas_a_pagar_e_receber_model import ContasAPagarEReceberModel
+from contas_a_pagar_e_receber.models.fornecedor_cliente_model import FornecedorClienteModel
+from contas_a_pagar_e_receber.routers.contas_a_pagar_e_receber_router import ContaPagarEReceberEnum
+from contas_a_pagar_e_receber.routers.relatorios_router import tipo_das_contas
+from shared.cache import CacheComTTL
+from shared.dependencies import get_read_db
+from shared.dinheiro import Valor
+
+router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
+
+cache_do_dashboard = CacheComTTL(DASHBOARD_CACHE_TTL_SEGUNDOS)
+
+
+class FornecedorDoDashboardResponse(BaseModel):
+    fornecedor_cliente_id: int
+    nome: str
+    total_em_aberto: Valor
+
+
+class DashboardResponse(BaseModel):
+    data_base: date
+    a_pagar_no_mes: Valor
+    a_receber_no_mes: Valor
+    quantidade_vencida_a_pagar: int
+    valor_vencido_a_pagar: Valor
+    quantidade_vencida_a_receber: int
+    valor_vencido_a_receber: Valor
+    pago_no_mes: Valor
+    recebido_no_mes: Valor
+    principais_fornecedores: List[FornecedorDoDashboardResponse]
+
+
+def consulta_do_dashboard(data_base: date, quantidade_de_fornecedores: int):
+    """
+    Uma única instrução com três CTEs unidas numa só linha por fornecedor:
+
+    - totais das contas em aberto, com agregação condicional (`FILTER`): saldo a pagar e a receber com
+      previsão no mês e quantidade e saldo das vencidas;
+    - baixas registradas no mês, por tipo;
+    - fornecedores com maior saldo em aberto.
+    """
+    conta = ContasAPagarEReceberModel
+    inicio_do_mes = data_base.replace(day=1)
+    inicio_do_proximo_mes = date(inicio_do_mes.year + inicio_do_mes.month // 12, inicio_do_mes.month % 12 + 1, 1)
+    saldo_em_aberto = conta.valor - func.coalesce(conta.valor_baixada, 0)
+    pagar = conta.tipo == ContaPagarEReceberEnum.Pagar.value
+    receber = conta.tipo == ContaPagarEReceberEnum.Receber.value
+    no_mes = and_(conta.data_previsao >= inicio_do_mes, conta.data_previsao < inicio_do_proximo_mes)
+    vencida = conta.data_previsao < data_base
+
+    def soma(valor, condicao):
+        return func.coalesce(func.sum(valor).filter(condicao), 0)
+
+    totais = (
+        select(
+            soma(saldo_em_aberto, pagar & no_mes).label("a_pagar_no_mes"),
+            soma(saldo_em_aberto, receber & no_mes).label("a_receber_no_mes"),
+            func.count().filter(pagar & vencida).label("quantidade_vencida_a_pagar"),
+            soma(saldo_em_aberto, pagar & vencida).label("valor_vencido_a_pagar"),
+            func.count().filter(receber & vencida).label("quantidade_vencida_a_receber"),
+            soma(saldo_em_aberto, receber & vencida).label("valor_vencido_a_receber"),
+        )
+        .where(conta.esta_baixada.is_not(True))
+        .cte("totais")
+    )
+
+    contas = tipo_das_contas()
+    baixa = BaixaModel
+    baixas = (
+        select(
+            soma(baixa.valor, contas.c.tipo == ContaPagarEReceberEnum.Pagar.value).label("pago_no_mes"),
+            soma(baixa.valor, contas.c.tipo == ContaPagarEReceberEnum.Receber.value).label("recebido_no_mes"),
+        )
+        .select_from(baixa)
+        .join(contas, contas.c.id == baixa.conta_a_pagar_e_receber_id)
+        .where(baixa.data_baixa >= inicio_do_mes, baixa.data_baixa < inicio_do_proximo_mes)
+        .cte("baixas_do_mes")
+    )
+
+    fornecedor = FornecedorClienteModel
+    principais = (
+        select(
+            fornecedor.id.label("fornecedor_cliente_id"),
+            fornecedor.nome.label("nome"),
+            func.sum(saldo_em_aberto).label("total_em_aberto"),
+        )
+        .join(conta, conta.fornecedor_cliente_id == fornecedor.id)
+        .where(conta.esta_baixada.is_not(True))
+        .group_by(fornecedor.id, fornecedor.nome)
+        .order_by(func.sum(saldo_em_aberto).desc(), fornecedor.id)
+        .limit(quantidade_de_fornecedores)
+        .cte("principais_fornecedores")
+    )
+
+    return (
+        select(totais, baixas, principais)
+        .select_from(totais.join(baixas, true()).outerjoin(principais, true()))
+        .order_by(principais.c.total_em_aberto.desc(), principais.c.fornecedor_cliente_id)
+    )
+
+
+def calcula_dashboard(db: Session, data_base: date, quantidade_de_fornecedores: int) -> DashboardResponse:
+    linhas = db.execute(consulta_do_dashboard(data_base, quantidade_de_fornecedores)).mappings().all()
+    primeira = linhas[0]
+    return DashboardResponse(
+        data_base=data_base,
+        **{campo: primeira[campo] for campo in DashboardResponse.model_fields if campo in primeira},
+        principais_fornecedores=[
+            FornecedorDoDashboardResponse(
+                fornecedor_cliente_id=linha["fornecedor_cliente_id"],
+                nome=linha["nome"],
+                total_em_aberto=linha["total_em_aberto"],
+            )
+            for linha in linhas if linha["fornecedor_cliente_id"] is not None
+        ],
+    )
+
+
+@router.get("/", response_model=DashboardResponse)
+def dashboard(
+        data_base: date | None = Query(None, description="Data de referência do mês e dos vencimentos (padrão: hoje)"),
+        quantidade_de_fornecedores: int = Query(5, gt=0, le=50, description="Quantidade de fornecedores no ranking"),
+        db: Session = Depends(get_read_db),
+) -> DashboardResponse:
+    """
+    Resumo da tela inicial em uma única consulta: saldo a pagar e a receber no mês, contas vencidas,
+    valores pagos e recebidos no mês e os fornecedores com maior saldo em aberto.
+
+    O resultado é reaproveitado por DASHBOARD_CACHE_TTL_SEGUNDOS, então pode refletir alterações
+    com alguns segundos de atraso.
+
+    Args:
+        data_base: Data de referência do mês e dos vencimentos
+        quantidade_de_fornecedores: Quantidade de fornecedores no ranking
+        db: Sessão do banco de dados
+
+    Returns:
+        DashboardResponse: Totais do mês, vencidas e principais fornecedores
+    """
+    data_base = data_base or date.today()
+    return cache_do_dashboard.obtem(
+        (data_base, quantidade_de_fornecedores),
+        lambda: calcula_dashboard(db, data_base, quantidade_de_fornecedores),
+    )
@@ -0,0 +1,58 @@
+from typing import AsyncIterator
+
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+
+from config import EVENTOS_INTERVALO_HEARTBEAT_SEGUNDOS
+from shared.eventos import Assinatura, hub_de_eventos
+
+router = APIRouter(prefix="/eventos", tags=["Eventos"])
+
+# Intervalo (ms) que o EventSource do navegador espera antes de reconectar
+INTERVALO_DE_RECONEXAO_MS = 3000
+
+
+async def gera_eventos_sse(
+        assinatura: Assinatura,
+        intervalo_heartbeat: float = EVENTOS_INTERVALO_HEARTBEAT_SEGUNDOS,
+) -> AsyncIterator[bytes]:
+    """
+    Corpo da resposta SSE. Sem eventos, envia um comentário a cada `intervalo_heartbeat` segundos, para
+    manter a conexão aberta nos proxies. Se o assinante for desconectado por não acompanhar o ritmo, envia
+    `event: desconectado` e encerra; o cliente deve então ressincronizar por GET /alteracoes.
+    """
+    try:
+        yield f"retry: {INTERVALO_DE_RECONEXAO_MS}\n\n".encode()
+        while True:
+            try:
+                evento = await assinatura.proximo(timeout=intervalo_heartbeat)
+            except TimeoutError:
+                yield b": heartbeat\n\n"
+                continue
+            if evento is None:
+                yield b'event: desconectado\ndata: {"motivo": "fila cheia"}\n\n'
+                return
+            yield evento.formata_sse()
+    finally:
+        assinatura.cancela()
+
+
+@router.get("/")
+async def acompanhar_eventos() -> StreamingResponse:
+    """
+    Stream (Server-Sent Events) das alterações de contas, enviadas assim que são confirmadas no banco:
+    `conta_criada`, `conta_atualizada`, `baixa_registrada` (com a conta no estado atual),
+    `conta_excluida` (`{"id": ...}`) e `contas_excluidas` (`{"ids": [...]}`, exclusão em lote).
+
+    Eventos perdidos (reconexão, assinante lento) não são reenviados: use GET /alteracoes com o último
+    cursor para recuperar o que mudou.
+
+    Returns:
+        StreamingResponse: Stream `text/event-stream`
+    """
+    assinatura = hub_de_eventos.assina()
+    return StreamingResponse(
+        gera_eventos_sse(assinatura),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Depends
 from pydantic import BaseModel, Field, ConfigDict
+from sqlalchemy import delete, lambda_stmt, select, update
 from sqlalchemy.orm import Session
 
 from contas_a_pagar_e_receber.models.fornecedor_cliente_model import FornecedorClienteModel
-from shared.dependencies import get_db
+from shared.dependencies import get_db, get_read_db
 from shared.exceptions import NotFound
 
 router = APIRouter(prefix="/fornecedor-cliente", tags=["Fornecedor e Cliente"])
@@ -20,7 +21,9 @@ def buscar_fornecedores_clientes_por_id(
     Returns:
         FornecedorClienteModel: Fornecedor ou cliente encontrado
     """
-    fornecedor_cliente = sessao.query(FornecedorClienteModel).filter(FornecedorClienteModel.id == id).first()
+    fornecedor_cliente = sessao.execute(lambda_stmt(
+        lambda: select(FornecedorClienteModel).where(FornecedorClienteModel.id == id)
+    )).scalar_one_or_none()
 
     if not fornecedor_cliente:
         raise NotFound(f"Fornecedor ou cliente com ID {id} não encontrado.")
@@ -38,9 +41,13 @@ class FornecedorClienteRequest(BaseModel):
     nome: str = Field(..., min_length=3, max_length=255, description="Nome do fornecedor")
 
 
+class FornecedorClienteParcialRequest(BaseModel):
+    nome: str = Field(None, min_length=3, max_length=255, description="Nome do fornecedor")
+
+
 @router.get("/", response_model=list[FornecedorClienteResponse], summary="Listar todos os fornecedores e clientes")
 def listar_fornecedores_clientes(
-        sessao: Session = Depends(get_db)
+        sessao: Session = Depends(get_read_db)
 ) -> list[type[FornecedorClienteModel]]:
     """
     Endpoint para listar todos os fornecedores e clientes.
@@ -59,7 +66,7 @@ def listar_fornecedores_clientes(
 
 @router.get("/{id}", response_model=FornecedorClienteResponse, summary="Buscar fornecedor por ID")
 def listar_fornecedor_cliente_por_id(
-        id: int, sessao: Session = Depends(get_db)
+        id: int, sessao: Session = Depends(get_read_db)
 ) -> type[FornecedorClienteModel]:
     """
     Endpoint para buscar um fornecedor cliente pelo ID.
@@ -123,6 +130,44 @@ def atualizar_fornecedor_cliente(
     return fornecedor_cliente_atualizado
 
 
+@router.patch("/{id}", response_model=FornecedorClienteResponse, summary="Atualizar parcialmente fornecedor")
+def atualizar_fornecedor_cliente_parcialmente(
+        id: int,
+        fornecedor_cliente: FornecedorClienteParcialRequest,
+        sessao: Session = Depends(get_db)
+) -> FornecedorClienteResponse:
+    """
+    Endpoint para atualizar apenas os campos enviados de um fornecedor ou cliente, com um único UPDATE ... RETURNING.
+
+    Args:
+        id: ID do fornecedor
+        fornecedor_cliente: Campos a serem alterados
+        sessao: Sessão do banco de dados
+
+    Returns:
+        FornecedorClienteResponse: Fornecedor ou cliente atualizado
+    """
+    valores = fornecedor_cliente.model_dump(exclude_unset=True)
+    if not valores:
+        return buscar_fornecedores_clientes_por_id(sessao, id)
+
+    fornecedor_cliente_atualizado = sessao.execute(
+        update(FornecedorClienteModel)
+        .where(FornecedorClienteModel.id == id)
+        .values(**valores)
+        .returning(FornecedorClienteModel)
+        .execution_options(synchronize_session=False)
+    ).scalar_one_or_none()
+
+    if fornecedor_cliente_atualizado is None:
+        sessao.rollback()
+        raise NotFound(f"Fornecedor ou cliente com ID {id} não encontrado.")
+
+    resposta = FornecedorClienteResponse.model_validate(fornecedor_cliente_atualizado)
+    sessao.commit()
+    return resposta
+
+
 @router.delete("/{id}", status_code=204, summary="Deletar fornecedor")
 def deletar_fornecedor_cliente(
         id: int,
@@ -138,6 +183,13 @@ def deletar_fornecedor_cliente(
     Returns:
         None
     """
-    fornecedor_cliente = buscar_fornecedores_clientes_por_id(sessao, id)
-    sessao.delete(fornecedor_cliente)
+    removido = sessao.execute(
+        delete(FornecedorClienteModel)
+        .where(FornecedorClienteModel.id == id)
+        .returning(FornecedorClienteModel.id)
+        .execution_options(synchronize_session=False)
+    ).first()
+
+    if removido is None:
+        raise NotFound(f"Fornecedor ou cliente com ID {id} não encontrado.")
     sessao.commit()
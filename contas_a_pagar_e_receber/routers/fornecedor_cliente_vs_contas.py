@@ -1,15 +1,170 @@
+from datetime import date
 from typing import List
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
+from pydantic import BaseModel
+from sqlalchemy import case, extract, func, literal, select, union_all
 from sqlalchemy.orm import Session
 
+from contas_a_pagar_e_receber.models.contas_a_pagar_e_receber_arquivada_model import \
+    ContasAPagarEReceberArquivadaModel
 from contas_a_pagar_e_receber.models.contas_a_pagar_e_receber_model import ContasAPagarEReceberModel
 
-from contas_a_pagar_e_receber.routers.contas_a_pagar_e_receber_router import ContaAPagarEReceberResponse
-from shared.dependencies import get_db
+from contas_a_pagar_e_receber.routers.contas_a_pagar_e_receber_router import ContaAPagarEReceberResponse, \
+    ContaPagarEReceberEnum, filtra_contas, DESCRICAO_INCLUIR_ARQUIVADAS
+from shared.dependencies import get_read_db
+from shared.dinheiro import Valor
 
 router = APIRouter(prefix="/fornecedor-cliente", tags=["Fornecedor e Cliente"])
 
+TAMANHO_PADRAO_DA_PAGINA = 100
+TAMANHO_MAXIMO_DA_PAGINA = 1000
+
+
+class ResumoMensalResponse(BaseModel):
+    ano: int
+    mes: int
+    total_a_pagar: Valor
+    total_a_receber: Valor
+
+
+class ResumoContasFornecedorClienteResponse(BaseModel):
+    quantidade_de_contas: int
+    total_a_pagar: Valor
+    total_a_receber: Valor
+    total_baixado: Valor
+    valor_vencido: Valor
+    proxima_data_vencimento: date | None = None
+    por_mes: List[ResumoMensalResponse]
+
+
+def consulta_contas_do_fornecedor_cliente(
+        sessao: Session,
+        id_do_fornecedor_cliente: int,
+        data_inicio: date | None,
+        data_fim: date | None,
+        tipo: ContaPagarEReceberEnum | None,
+        esta_baixada: bool | None,
+        *colunas,
+):
+    """Monta a consulta das contas de um fornecedor ou cliente com os filtros informados."""
+    consulta = sessao.query(*colunas) if colunas else sessao.query(ContasAPagarEReceberModel)
+    consulta = consulta.filter(ContasAPagarEReceberModel.fornecedor_cliente_id == id_do_fornecedor_cliente)
+    return filtra_contas(consulta, data_inicio, data_fim, tipo, esta_baixada)
+
+
+def pagina_de_contas_com_arquivadas(
+        sessao: Session,
+        id_do_fornecedor_cliente: int,
+        data_inicio: date | None,
+        data_fim: date | None,
+        tipo: ContaPagarEReceberEnum | None,
+        esta_baixada: bool | None,
+        pagina: int,
+        tamanho_da_pagina: int,
+) -> list:
+    """
+    Página das contas de um fornecedor ou cliente juntando as ativas e as arquivadas.
+
+    A paginação é feita sobre um UNION ALL só com ID e data de previsão; depois são carregadas
+    apenas as contas da página, uma consulta por tabela.
+    """
+    def chaves(modelo, arquivada: bool):
+        consulta = (
+            select(modelo.id, modelo.data_previsao, literal(arquivada).label("arquivada"))
+            .where(modelo.fornecedor_cliente_id == id_do_fornecedor_cliente)
+        )
+        return filtra_contas(consulta, data_inicio, data_fim, tipo, esta_baixada, modelo=modelo)
+
+    uniao = union_all(
+        chaves(ContasAPagarEReceberModel, False), chaves(ContasAPagarEReceberArquivadaModel, True)
+    ).subquery()
+    chaves_da_pagina = sessao.execute(
+        select(uniao.c.id, uniao.c.arquivada)
+        .order_by(uniao.c.data_previsao, uniao.c.id)
+        .offset((pagina - 1) * tamanho_da_pagina)
+        .limit(tamanho_da_pagina)
+    ).all()
+
+    carregadas = {}
+    for modelo, arquivada in ((ContasAPagarEReceberModel, False), (ContasAPagarEReceberArquivadaModel, True)):
+        ids = [id_da_conta for id_da_conta, da_pagina_arquivada in chaves_da_pagina if bool(da_pagina_arquivada) == arquivada]
+        if ids:
+            carregadas.update(
+                ((arquivada, conta.id), conta) for conta in sessao.query(modelo).filter(modelo.id.in_(ids))
+            )
+    return [carregadas[(bool(arquivada), id_da_conta)] for id_da_conta, arquivada in chaves_da_pagina]
+
+
+def resumo_das_contas_do_fornecedor_cliente(
+        sessao: Session,
+        id_do_fornecedor_cliente: int,
+        data_inicio: date | None = None,
+        data_fim: date | None = None,
+        tipo: ContaPagarEReceberEnum | None = None,
+        esta_baixada: bool | None = None,
+        incluir_arquivadas: bool = False,
+) -> ResumoContasFornecedorClienteResponse:
+    """
+    Calcula no banco de dados os totais das contas de um fornecedor ou cliente.
+
+    São duas consultas agregadas (totais gerais e totais por mês); nenhuma conta é carregada em memória.
+    Com `incluir_arquivadas`, as agregações são feitas sobre o UNION ALL das contas ativas e arquivadas.
+    """
+    def contas(modelo):
+        consulta = select(
+            modelo.id, modelo.valor, modelo.tipo, modelo.data_previsao, modelo.valor_baixada, modelo.esta_baixada,
+        ).where(modelo.fornecedor_cliente_id == id_do_fornecedor_cliente)
+        return filtra_contas(consulta, data_inicio, data_fim, tipo, esta_baixada, modelo=modelo)
+
+    consulta = contas(ContasAPagarEReceberModel)
+    if incluir_arquivadas:
+        consulta = union_all(consulta, contas(ContasAPagarEReceberArquivadaModel))
+    conta = consulta.subquery().c
+
+    hoje = date.today()
+    em_aberto = conta.esta_baixada.is_not(True)
+    saldo_em_aberto = conta.valor - func.coalesce(conta.valor_baixada, 0)
+
+    def soma_se(condicao, valor):
+        return func.coalesce(func.sum(case((condicao, valor), else_=0)), 0)
+
+    totais = sessao.execute(select(
+        func.count(conta.id),
+        soma_se(conta.tipo == ContaPagarEReceberEnum.Pagar.value, conta.valor),
+        soma_se(conta.tipo == ContaPagarEReceberEnum.Receber.value, conta.valor),
+        func.coalesce(func.sum(conta.valor_baixada), 0),
+        soma_se(em_aberto & (conta.data_previsao < hoje), saldo_em_aberto),
+        func.min(case((em_aberto & (conta.data_previsao >= hoje), conta.data_previsao))),
+    )).one()
+
+    ano = extract('year', conta.data_previsao)
+    mes = extract('month', conta.data_previsao)
+    por_mes = sessao.execute(
+        select(
+            ano,
+            mes,
+            soma_se(conta.tipo == ContaPagarEReceberEnum.Pagar.value, conta.valor),
+            soma_se(conta.tipo == ContaPagarEReceberEnum.Receber.value, conta.valor),
+        )
+        .group_by(ano, mes)
+        .order_by(ano, mes)
+    ).all()
+
+    quantidade, total_a_pagar, total_a_receber, total_baixado, valor_vencido, proxima_data_vencimento = totais
+    return ResumoContasFornecedorClienteResponse(
+        quantidade_de_contas=quantidade,
+        total_a_pagar=total_a_pagar,
+        total_a_receber=total_a_receber,
+        total_baixado=total_baixado,
+        valor_vencido=valor_vencido,
+        proxima_data_vencimento=proxima_data_vencimento,
+        por_mes=[
+            ResumoMensalResponse(ano=a, mes=m, total_a_pagar=pagar, total_a_receber=receber)
+            for a, m, pagar, receber in por_mes
+        ],
+    )
+
 
 @router.get(
     "/{id_do_fornecedor_cliente}/contas-a-pagar-e-receber",
@@ -17,15 +172,74 @@ router = APIRouter(prefix="/fornecedor-cliente", tags=["Fornecedor e Cliente"])
     summary="Listar todas as contas a pagar e receber de um fornecedor por ID do fornecedor"
 )
 def listar_todas_as_contas_a_pagar_e_receber_de_um_fornecedor_cliente(
-        id_do_fornecedor_cliente: int, sessao: Session = Depends(get_db)
+        id_do_fornecedor_cliente: int,
+        sessao: Session = Depends(get_read_db),
+        pagina: int = Query(1, ge=1, description="Número da página, começando em 1"),
+        tamanho_da_pagina: int = Query(TAMANHO_PADRAO_DA_PAGINA, ge=1, le=TAMANHO_MAXIMO_DA_PAGINA),
+        data_inicio: date | None = Query(None, description="Data de previsão inicial (inclusive)"),
+        data_fim: date | None = Query(None, description="Data de previsão final (inclusive)"),
+        tipo: ContaPagarEReceberEnum | None = None,
+        esta_baixada: bool | None = None,
+        incluir_arquivadas: bool = Query(False, description=DESCRICAO_INCLUIR_ARQUIVADAS),
 ) -> list[type[ContasAPagarEReceberModel]]:
     """
-    Endpoint para buscar todas as contas a pagar e receber de um fornecedor ou cliente.
+    Endpoint para buscar, de forma paginada, as contas a pagar e receber de um fornecedor ou cliente.
     Args:
         id_do_fornecedor_cliente: ID do fornecedor
         sessao: Sessão do banco de dados
+        pagina: Número da página
+        tamanho_da_pagina: Quantidade de contas por página
+        data_inicio: Filtra contas com data de previsão a partir desta data
+        data_fim: Filtra contas com data de previsão até esta data
+        tipo: Filtra por contas a Pagar ou a Receber
+        esta_baixada: Filtra por contas baixadas ou em aberto
+        incluir_arquivadas: Inclui as contas arquivadas na listagem
     Returns:
-        FornecedorClienteResponse: Fornecedor ou cliente encontrado
+        List[ContaAPagarEReceberResponse]: Contas da página solicitada
     """
+    if incluir_arquivadas:
+        return pagina_de_contas_com_arquivadas(
+            sessao, id_do_fornecedor_cliente, data_inicio, data_fim, tipo, esta_baixada, pagina, tamanho_da_pagina
+        )
+
+    return (
+        consulta_contas_do_fornecedor_cliente(
+            sessao, id_do_fornecedor_cliente, data_inicio, data_fim, tipo, esta_baixada
+        )
+        .order_by(ContasAPagarEReceberModel.data_previsao, ContasAPagarEReceberModel.id)
+        .offset((pagina - 1) * tamanho_da_pagina)
+        .limit(tamanho_da_pagina)
+        .all()
+    )
+
 
-    return sessao.query(ContasAPagarEReceberModel).filter_by(fornecedor_cliente_id=id_do_fornecedor_cliente).all()
\ No newline at end of file
+@router.get(
+    "/{id_do_fornecedor_cliente}/contas-a-pagar-e-receber/resumo",
+    response_model=ResumoContasFornecedorClienteResponse,
+    summary="Resumo das contas a pagar e receber de um fornecedor por ID do fornecedor"
+)
+def resumir_contas_a_pagar_e_receber_de_um_fornecedor_cliente(
+        id_do_fornecedor_cliente: int,
+        sessao: Session = Depends(get_read_db),
+        data_inicio: date | None = Query(None, description="Data de previsão inicial (inclusive)"),
+        data_fim: date | None = Query(None, description="Data de previsão final (inclusive)"),
+        tipo: ContaPagarEReceberEnum | None = None,
+        esta_baixada: bool | None = None,
+        incluir_arquivadas: bool = Query(False, description=DESCRICAO_INCLUIR_ARQUIVADAS),
+) -> ResumoContasFornecedorClienteResponse:
+    """
+    Endpoint com os totais das contas de um fornecedor ou cliente, calculados no banco de dados.
+    Args:
+        id_do_fornecedor_cliente: ID do fornecedor
+        sessao: Sessão do banco de dados
+        data_inicio: Filtra contas com data de previsão a partir desta data
+        data_fim: Filtra contas com data de previsão até esta data
+        tipo: Filtra por contas a Pagar ou a Receber
+        esta_baixada: Filtra por contas baixadas ou em aberto
+        incluir_arquivadas: Inclui as contas arquivadas nos totais
+    Returns:
+        ResumoContasFornecedorClienteResponse: Totais, valor vencido, próximo vencimento e totais por mês
+    """
+    return resumo_das_contas_do_fornecedor_cliente(
+        sessao, id_do_fornecedor_cliente, data_inicio, data_fim, tipo, esta_baixada, incluir_arquivadas
+    )
@@ -0,0 +1,110 @@
+import codecs
+from asyncio import ensure_future
+import queue
+import threading
+from typing import Iterator, List
+
+from fastapi import APIRouter, Depends, Query, Request
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from contas_a_pagar_e_receber.importacao import ImportadorDeContas, TAMANHO_DO_LOTE, TAMANHO_MAXIMO_DO_LOTE
+from shared.dependencies import get_db
+
+router = APIRouter(prefix="/contas-a-pagar-e-receber", tags=["Contas a Pagar e Receber"])
+
+# Quantidade de pedaços do corpo da requisição aguardando o importador (limita a memória usada)
+PEDACOS_EM_ESPERA = 16
+
+
+class ErroDeImportacaoResponse(BaseModel):
+    linha: int
+    mensagem: str
+
+
+class ImportacaoResponse(BaseModel):
+    linhas_lidas: int
+    contas_importadas: int
+    fornecedores_criados: int
+    quantidade_de_erros: int
+    erros: List[ErroDeImportacaoResponse]
+
+
+def linhas_da_fila(fila: queue.Queue) -> Iterator[str]:
+    """
+    Decodifica os pedaços recebidos (bytes UTF-8) e devolve as linhas de texto conforme ficam completas.
+    Bytes inválidos viram U+FFFD, e o importador recusa as linhas onde aparecem.
+    """
+    decodificador = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    resto = ""
+    while (pedaco := fila.get()) is not None:
+        linhas = (resto + decodificador.decode(pedaco)).splitlines(keepends=True)
+        resto = linhas.pop() if linhas and not linhas[-1].endswith(("\n", "\r")) else ""
+        yield from linhas
+    resto += decodificador.decode(b"", final=True)
+    if resto:
+        yield resto
+
+
+def entrega_pedaco(fila: queue.Queue, pedaco: bytes | None, importacao_encerrada: threading.Event) -> None:
+    """Coloca um pedaço na fila, desistindo se o importador já tiver terminado."""
+    while not importacao_encerrada.is_set():
+        try:
+            fila.put(pedaco, timeout=0.1)
+            return
+        except queue.Full:
+            continue
+
+
+@router.post(
+    "/importacao",
+    response_model=ImportacaoResponse,
+    summary="Importar contas de um arquivo CSV",
+    openapi_extra={"requestBody": {"content": {"text/csv": {"schema": {"type": "string"}}}, "required": True}},
+)
+async def importar_contas(
+        request: Request,
+        tamanho_do_lote: int = Query(TAMANHO_DO_LOTE, ge=1, le=TAMANHO_MAXIMO_DO_LOTE),
+        sessao: Session = Depends(get_db),
+) -> ImportacaoResponse:
+    """
+    Endpoint para importar contas a partir do corpo da requisição em CSV (UTF-8, com cabeçalho).
+
+    O corpo é lido em pedaços e entregue ao importador conforme chega, sem carregar o arquivo inteiro
+    em memória. Linhas inválidas são reportadas e não interrompem a importação das demais.
+
+    Args:
+        request: Requisição com o CSV no corpo
+        tamanho_do_lote: Quantidade de contas gravadas por transação
+        sessao: Sessão do banco de dados
+
+    Returns:
+        ImportacaoResponse: Resumo da importação e erros por linha
+    """
+    fila = queue.Queue(maxsize=PEDACOS_EM_ESPERA)
+    importacao_encerrada = threading.Event()
+    importador = ImportadorDeContas(sessao, tamanho_do_lote)
+
+    def importa():
+        try:
+            return importador.importa(linhas_da_fila(fila))
+        finally:
+            importacao_encerrada.set()
+
+    importacao = ensure_future(run_in_threadpool(importa))
+    try:
+        async for pedaco in request.stream():
+            if pedaco:
+                await run_in_threadpool(entrega_pedaco, fila, pedaco, importacao_encerrada)
+    finally:
+        await run_in_threadpool(entrega_pedaco, fila, None, importacao_encerrada)
+
+    resultado = await importacao
+    return ImportacaoResponse(
+        linhas_lidas=resultado.linhas_lidas,
+        contas_importadas=resultado.contas_importadas,
+        fornecedores_criados=resultado.fornecedores_criados,
+        quantidade_de_erros=resultado.quantidade_de_erros,
+        erros=[ErroDeImportacaoResponse(linha=linha, mensagem=mensagem) for linha, mensagem in resultado.erros],
+    )
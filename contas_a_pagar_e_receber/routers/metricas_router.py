@@ -0,0 +1,48 @@
+from typing import Dict
+
+from fastapi import APIRouter, Request
+from pydantic import BaseModel
+
+router = APIRouter(prefix="/metricas", tags=["Métricas"])
+
+
+class MetricasDoLimitadorResponse(BaseModel):
+    limite: int
+    em_execucao: int
+    na_fila: int
+    maximo_na_fila: int
+    maior_fila: int
+    admitidas: int
+    recusadas_fila_cheia: int
+    recusadas_por_espera: int
+
+
+class MetricasDeCoalescenciaResponse(BaseModel):
+    em_andamento: int
+    calculadas: int
+    coalescidas: int
+    recusadas_por_espera: int
+
+
+@router.get("/admissao", response_model=Dict[str, MetricasDoLimitadorResponse])
+async def metricas_de_admissao(request: Request):
+    """
+    Ocupação e fila de cada classe de rota (leitura, escrita, relatorio) no controle de admissão deste
+    worker, e quantas requisições foram recusadas com 503 desde a inicialização.
+
+    Returns:
+        Dict[str, MetricasDoLimitadorResponse]: Métricas por classe de rota
+    """
+    return request.app.state.controle_de_admissao.metricas()
+
+
+@router.get("/coalescencia", response_model=MetricasDeCoalescenciaResponse)
+async def metricas_de_coalescencia(request: Request):
+    """
+    Relatórios em cálculo neste worker, quantos foram calculados e quantas requisições idênticas
+    aproveitaram um cálculo em andamento em vez de consultar o banco.
+
+    Returns:
+        MetricasDeCoalescenciaResponse: Contadores da coalescência
+    """
+    return request.app.state.coalescencia.metricas()
@@ -0,0 +1,299 @@
+import calendar
+import uuid
+from collections import Counter
+from datetime import date, timedelta
+from decimal import Decimal
+from enum import Enum
+from typing import List
+
+from fastapi import APIRouter, Depends, Query
+from fastapi import HTTPException
+from pydantic import BaseModel, Field, model_validator
+from sqlalchemy import extract, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from contas_a_pagar_e_receber.models.baixa_model import BaixaModel
+from contas_a_pagar_e_receber.models.contas_a_pagar_e_receber_model import ContasAPagarEReceberModel, \
+    particoes_de_contas
+from contas_a_pagar_e_receber.routers.contas_a_pagar_e_receber_router import ContaAPagarEReceberResponse, \
+    ContaPagarEReceberEnum, ExclusaoDeContasEmLoteRequest, ExclusaoDeContasEmLoteResponse, \
+    CAMPOS_QUE_ALTERAM_O_SALDO, MENSAGEM_VALOR_MENOR_QUE_O_BAIXADO, QUANTIDADE_DE_CONTAS_PERMITIDA_POR_MES, \
+    exclui_contas_em_lotes, invalida_fechamentos_de_saldo, primeira_baixa_das_contas, publica_evento_de_conta, \
+    valida_fornecedor
+from shared.dependencies import get_db, get_read_db
+from shared.dinheiro import VALOR_MAXIMO
+from shared.exceptions import NotFound
+
+# Incluído antes do router de contas, cujas rotas `/{conta_id}` também casariam com `/recorrencias`
+router = APIRouter(prefix="/contas-a-pagar-e-receber", tags=["Contas a Pagar e Receber"])
+
+QUANTIDADE_MAXIMA_DE_PARCELAS = 120
+
+
+class FrequenciaEnum(str, Enum):
+    mensal = "mensal"
+    semanal = "semanal"
+
+
+class RecorrenciaRequest(BaseModel):
+    descricao: str = Field(..., min_length=3, max_length=255)
+    valor: Decimal = Field(..., gt=0, le=VALOR_MAXIMO, decimal_places=2, description="Valor de cada parcela")
+    tipo: ContaPagarEReceberEnum
+    fornecedor_cliente_id: int | None = None
+    frequencia: FrequenciaEnum = FrequenciaEnum.mensal
+    data_inicio: date = Field(..., description="Data de previsão da primeira parcela")
+    quantidade_de_parcelas: int | None = Field(None, gt=0, le=QUANTIDADE_MAXIMA_DE_PARCELAS)
+    data_fim: date | None = Field(None, description="Gera parcelas até esta data (inclusive)")
+
+    @model_validator(mode="after")
+    def valida_termino(self):
+        if (self.quantidade_de_parcelas is None) == (self.data_fim is None):
+            raise ValueError("Informe a quantidade de parcelas ou a data final da recorrência")
+        if self.data_fim is not None and self.data_fim < self.data_inicio:
+            raise ValueError("A data final deve ser posterior à data de início")
+        return self
+
+
+class SerieDeContasParcialRequest(BaseModel):
+    """Campos alterados em todas as parcelas em aberto da série (as datas de previsão são mantidas)."""
+    descricao: str = Field(None, min_length=3, max_length=255)
+    valor: Decimal = Field(None, gt=0, le=VALOR_MAXIMO, decimal_places=2)
+    tipo: ContaPagarEReceberEnum = None
+    fornecedor_cliente_id: int | None = None
+
+
+class ParcelaResponse(ContaAPagarEReceberResponse):
+    serie_id: str
+    parcela: int
+
+
+class RecorrenciaResponse(BaseModel):
+    serie_id: str
+    contas: List[ParcelaResponse]
+
+
+def soma_meses(data: date, meses: int) -> date:
+    """Mesmo dia `meses` depois; em meses mais curtos, o último dia do mês (31/01 -> 28/02 -> 31/03)."""
+    indice = data.month - 1 + meses
+    ano, mes = data.year + indice // 12, indice % 12 + 1
+    return date(ano, mes, min(data.day, calendar.monthrange(ano, mes)[1]))
+
+
+def datas_das_parcelas(recorrencia: RecorrenciaRequest) -> list[date]:
+    """
+    Datas de previsão das parcelas.
+
+    Raises:
+        HTTPException: Se a recorrência passar de QUANTIDADE_MAXIMA_DE_PARCELAS parcelas
+    """
+    quantidade = recorrencia.quantidade_de_parcelas or QUANTIDADE_MAXIMA_DE_PARCELAS + 1
+    datas = []
+    for indice in range(quantidade):
+        if recorrencia.frequencia == FrequenciaEnum.semanal:
+            data = recorrencia.data_inicio + timedelta(weeks=indice)
+        else:
+            data = soma_meses(recorrencia.data_inicio, indice)
+        if recorrencia.data_fim is not None and data > recorrencia.data_fim:
+            break
+        datas.append(data)
+
+    if len(datas) > QUANTIDADE_MAXIMA_DE_PARCELAS:
+        raise HTTPException(
+            status_code=422, detail=f"A recorrência pode ter no máximo {QUANTIDADE_MAXIMA_DE_PARCELAS} parcelas"
+        )
+    return datas
+
+
+def valida_limite_de_contas_dos_meses(db: Session, datas: list[date]) -> None:
+    """
+    Aplica o limite mensal de contas a todos os meses da recorrência, com uma única consulta agrupada.
+    A regra é a de `criar_conta`, como se as parcelas fossem criadas uma a uma.
+
+    Raises:
+        HTTPException: Se algum mês ultrapassar o limite, listando os meses
+    """
+    conta = ContasAPagarEReceberModel
+    ano, mes = extract("year", conta.data_previsao), extract("month", conta.data_previsao)
+    ultima = max(datas)
+    existentes = {
+        (int(ano_da_conta), int(mes_da_conta)): quantidade
+        for ano_da_conta, mes_da_conta, quantidade in db.execute(
+            select(ano, mes, func.count())
+            .where(conta.data_previsao >= min(datas).replace(day=1))
+            .where(conta.data_previsao < soma_meses(ultima.replace(day=1), 1))
+            .group_by(ano, mes)
+        )
+    }
+
+    excedidos = [
+        f"{mes_da_parcela:02d}/{ano_da_parcela}"
+        for (ano_da_parcela, mes_da_parcela), novas in sorted(Counter((d.year, d.month) for d in datas).items())
+        if existentes.get((ano_da_parcela, mes_da_parcela), 0) + novas - 1 > QUANTIDADE_DE_CONTAS_PERMITIDA_POR_MES
+    ]
+    if excedidos:
+        raise HTTPException(status_code=422, detail=f"Limite de contas atingido para o mês: {', '.join(excedidos)}")
+
+
+def valida_se_serie_existe(db: Session, serie_id: str) -> None:
+    """
+    Raises:
+        NotFound: Se nenhuma conta pertencer à série
+    """
+    conta = ContasAPagarEReceberModel
+    if db.execute(select(conta.id).where(conta.serie_id == serie_id).limit(1)).scalar() is None:
+        raise NotFound(f"Recorrência {serie_id}")
+
+
+def condicao_das_parcelas_em_aberto(serie_id: str, a_partir_de: date | None) -> list:
+    conta = ContasAPagarEReceberModel
+    condicao = [conta.serie_id == serie_id, conta.esta_baixada.is_not(True)]
+    if a_partir_de is not None:
+        condicao.append(conta.data_previsao >= a_partir_de)
+    return condicao
+
+
+@router.post("/recorrencias", response_model=RecorrenciaResponse, status_code=201)
+def criar_recorrencia(recorrencia: RecorrenciaRequest, db: Session = Depends(get_db)) -> RecorrenciaResponse:
+    """
+    Cria as parcelas de uma conta recorrente (aluguel, salários, compras parceladas) de uma só vez.
+
+    O fornecedor é validado uma vez, o limite mensal é verificado para todos os meses numa consulta
+    agrupada e as parcelas são gravadas com um único INSERT em lote, ligadas pelo mesmo `serie_id`.
+
+    Args:
+        recorrencia: Dados das parcelas, frequência e término (quantidade de parcelas ou data final)
+        db: Sessão do banco de dados
+
+    Returns:
+        RecorrenciaResponse: ID da série e parcelas criadas
+
+    Raises:
+        NotFound: Se o fornecedor não for encontrado
+        HTTPException: Se algum mês ultrapassar o limite de contas ou a recorrência for longa demais
+    """
+    datas = datas_das_parcelas(recorrencia)
+    # Antes de qualquer consulta da sessão à tabela de contas (ver `garante_anos`)
+    particoes_de_contas.garante_anos(db.get_bind(), {data.year for data in datas})
+    valida_fornecedor(recorrencia.fornecedor_cliente_id, db)
+    valida_limite_de_contas_dos_meses(db, datas)
+
+    serie_id = str(uuid.uuid4())
+    conta = ContasAPagarEReceberModel
+    contas = db.scalars(
+        insert(conta).returning(conta, sort_by_parameter_order=True),
+        [
+            {
+                "descricao": recorrencia.descricao,
+                "valor": recorrencia.valor,
+                "tipo": recorrencia.tipo.value,
+                "data_previsao": data,
+                "fornecedor_cliente_id": recorrencia.fornecedor_cliente_id,
+                "serie_id": serie_id,
+                "parcela": parcela,
+            }
+            for parcela, data in enumerate(datas, start=1)
+        ],
+    ).all()
+
+    # Serializa antes do commit, que expiraria as parcelas e forçaria um SELECT por parcela
+    parcelas = [ParcelaResponse.model_validate(parcela) for parcela in contas]
+    for parcela in parcelas:
+        publica_evento_de_conta("conta_criada", parcela, db)
+    db.commit()
+    return RecorrenciaResponse(serie_id=serie_id, contas=parcelas)
+
+
+@router.get("/recorrencias/{serie_id}", response_model=List[ParcelaResponse])
+def listar_parcelas(serie_id: str, db: Session = Depends(get_read_db)) -> List[ContasAPagarEReceberModel]:
+    """
+    Lista as parcelas de uma recorrência, em ordem.
+
+    Raises:
+        NotFound: Se a recorrência não for encontrada
+    """
+    conta = ContasAPagarEReceberModel
+    parcelas = db.scalars(select(conta).where(conta.serie_id == serie_id).order_by(conta.parcela)).all()
+    if not parcelas:
+        raise NotFound(f"Recorrência {serie_id}")
+    return parcelas
+
+
+@router.patch("/recorrencias/{serie_id}", response_model=List[ParcelaResponse])
+def atualizar_recorrencia(
+        serie_id: str,
+        alteracao: SerieDeContasParcialRequest,
+        a_partir_de: date | None = Query(None, description="Altera só as parcelas com previsão a partir desta data"),
+        db: Session = Depends(get_db),
+) -> List[ParcelaResponse]:
+    """
+    Altera de uma vez as parcelas em aberto da recorrência, com um único UPDATE ... RETURNING.
+    Parcelas já baixadas não são alteradas.
+
+    Args:
+        serie_id: ID da recorrência
+        alteracao: Campos a serem alterados
+        a_partir_de: Altera só as parcelas com previsão a partir desta data
+        db: Sessão do banco de dados
+
+    Returns:
+        List[ParcelaResponse]: Parcelas alteradas
+
+    Raises:
+        NotFound: Se a recorrência ou o fornecedor informado não forem encontrados
+    """
+    valida_se_serie_existe(db, serie_id)
+    valores = alteracao.model_dump(exclude_unset=True)
+    if "tipo" in valores:
+        valores["tipo"] = valores["tipo"].value
+    valida_fornecedor(valores.get("fornecedor_cliente_id"), db)
+
+    conta = ContasAPagarEReceberModel
+    condicao = condicao_das_parcelas_em_aberto(serie_id, a_partir_de)
+    if not valores:
+        return db.scalars(select(conta).where(*condicao).order_by(conta.parcela)).all()
+
+    if "valor" in valores:
+        # Parcelas em aberto podem ter baixas parciais: o novo valor não fica abaixo do já baixado
+        valor_baixado = func.coalesce(conta.valor_baixada, 0)
+        if db.scalar(select(func.count()).where(*condicao, valor_baixado > valores["valor"])):
+            raise HTTPException(status_code=422, detail=MENSAGEM_VALOR_MENOR_QUE_O_BAIXADO)
+        valores["esta_baixada"] = valor_baixado >= valores["valor"]
+
+    alteradas = db.scalars(
+        update(conta).where(*condicao).values(**valores).returning(conta).execution_options(synchronize_session=False)
+    ).all()
+    if alteradas and CAMPOS_QUE_ALTERAM_O_SALDO & valores.keys():
+        # Parcelas em aberto podem ter baixas parciais
+        invalida_fechamentos_de_saldo(db, primeira_baixa_das_contas(
+            db, BaixaModel.conta_a_pagar_e_receber_id.in_([parcela.id for parcela in alteradas])
+        ))
+    parcelas = sorted((ParcelaResponse.model_validate(parcela) for parcela in alteradas), key=lambda p: p.parcela)
+    for parcela in parcelas:
+        publica_evento_de_conta("conta_atualizada", parcela, db)
+    db.commit()
+    return parcelas
+
+
+@router.delete("/recorrencias/{serie_id}", response_model=ExclusaoDeContasEmLoteResponse)
+def cancelar_recorrencia(
+        serie_id: str,
+        a_partir_de: date | None = Query(None, description="Cancela só as parcelas com previsão a partir desta data"),
+        db: Session = Depends(get_db),
+) -> ExclusaoDeContasEmLoteResponse:
+    """
+    Cancela a recorrência, excluindo as parcelas em aberto; as já baixadas são mantidas.
+
+    Args:
+        serie_id: ID da recorrência
+        a_partir_de: Cancela só as parcelas com previsão a partir desta data
+        db: Sessão do banco de dados
+
+    Returns:
+        ExclusaoDeContasEmLoteResponse: Quantidade de parcelas excluídas
+
+    Raises:
+        NotFound: Se a recorrência não for encontrada
+    """
+    valida_se_serie_existe(db, serie_id)
+    criterios = ExclusaoDeContasEmLoteRequest(serie_id=serie_id, esta_baixada=False, data_inicio=a_partir_de)
+    return exclui_contas_em_lotes(db, criterios)
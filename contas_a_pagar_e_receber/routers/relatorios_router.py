@@ -0,0 +1,418 @@
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+from enum import Enum
+from itertools import accumulate
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import case, func, select, union_all
+from sqlalchemy.orm import Session
+
+from contas_a_pagar_e_receber.models.baixa_model import BaixaModel
+from contas_a_pagar_e_receber.models.contas_a_pagar_e_receber_arquivada_model import \
+    ContasAPagarEReceberArquivadaModel
+from contas_a_pagar_e_receber.models.contas_a_pagar_e_receber_model import ContasAPagarEReceberModel
+from contas_a_pagar_e_receber.models.fechamento_de_saldo_model import FechamentoDeSaldoModel
+from contas_a_pagar_e_receber.models.fornecedor_cliente_model import FornecedorClienteModel
+from contas_a_pagar_e_receber.routers.contas_a_pagar_e_receber_router import ContaPagarEReceberEnum
+from shared.dependencies import get_db, get_read_db
+from shared.dinheiro import Valor
+
+router = APIRouter(prefix="/relatorios", tags=["Relatórios"])
+
+# Maior intervalo aceito no fluxo de caixa projetado (cerca de 10 anos, uma linha por dia)
+MAXIMO_DE_DIAS_DO_FLUXO_DE_CAIXA = 3660
+
+
+class AgingResponse(BaseModel):
+    fornecedor_cliente_id: int | None = None
+    fornecedor_cliente_nome: str | None = None
+    tipo: str
+    a_vencer: Valor
+    vencido_1_a_30_dias: Valor
+    vencido_31_a_60_dias: Valor
+    vencido_61_a_90_dias: Valor
+    vencido_mais_de_90_dias: Valor
+    total_em_aberto: Valor
+
+
+class SaldoRealizadoResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    data: date
+    saldo: Valor
+
+
+class SaldoRealizadoDiarioResponse(BaseModel):
+    data: date
+    movimento: Valor
+    saldo: Valor
+
+
+class FechamentoDeSaldoRequest(BaseModel):
+    data: date
+
+
+class GranularidadeEnum(str, Enum):
+    dia = "dia"
+    semana = "semana"
+
+
+class FluxoDeCaixaPeriodoResponse(BaseModel):
+    data: date
+    entradas: Valor
+    saidas: Valor
+    saldo: Valor
+
+
+class FluxoDeCaixaResponse(BaseModel):
+    granularidade: GranularidadeEnum
+    saldo_inicial: Valor
+    periodos: List[FluxoDeCaixaPeriodoResponse]
+
+
+def valor_com_sinal(conta, valor):
+    """Receber soma e Pagar subtrai do saldo."""
+    return case((conta.tipo == ContaPagarEReceberEnum.Receber.value, valor), else_=-valor)
+
+
+def tipo_das_contas():
+    """ID e tipo das contas ativas e arquivadas: as baixas de contas arquivadas continuam no saldo realizado."""
+    ativas = select(ContasAPagarEReceberModel.id, ContasAPagarEReceberModel.tipo)
+    arquivadas = select(ContasAPagarEReceberArquivadaModel.id, ContasAPagarEReceberArquivadaModel.tipo)
+    return union_all(ativas, arquivadas).subquery()
+
+
+def ultimo_fechamento_ate(db: Session, data: date) -> FechamentoDeSaldoModel | None:
+    """Fechamento de saldo mais recente com data igual ou anterior à informada."""
+    return (
+        db.query(FechamentoDeSaldoModel)
+        .filter(FechamentoDeSaldoModel.data <= data)
+        .order_by(FechamentoDeSaldoModel.data.desc())
+        .first()
+    )
+
+
+def saldo_realizado_ate(db: Session, data: date) -> Decimal:
+    """
+    Saldo realizado (baixas das contas a Receber menos as das contas a Pagar, inclusive parciais)
+    até a data informada.
+
+    Parte do último fechamento de saldo anterior à data e soma apenas as baixas posteriores a ele.
+    """
+    contas = tipo_das_contas()
+    baixa = BaixaModel
+    consulta = (
+        db.query(func.coalesce(func.sum(valor_com_sinal(contas.c, baixa.valor)), 0))
+        .select_from(baixa)
+        .join(contas, contas.c.id == baixa.conta_a_pagar_e_receber_id)
+        .filter(baixa.data_baixa <= data)
+    )
+
+    fechamento = ultimo_fechamento_ate(db, data)
+    if fechamento is None:
+        return Decimal(consulta.scalar())
+
+    return fechamento.saldo + consulta.filter(baixa.data_baixa > fechamento.data).scalar()
+
+
+def serie_do_saldo_realizado(db: Session, data_inicio: date, data_fim: date) -> List[SaldoRealizadoDiarioResponse]:
+    """
+    Saldo realizado ao fim de cada dia com baixas no intervalo.
+
+    O acumulado é calculado pelo banco com `SUM() OVER (ORDER BY data_baixa)` sobre o movimento
+    diário do livro de baixas e somado ao saldo do dia anterior ao início do intervalo.
+    """
+    contas = tipo_das_contas()
+    baixa = BaixaModel
+    movimento = func.sum(valor_com_sinal(contas.c, baixa.valor))
+    linhas = (
+        db.query(
+            baixa.data_baixa,
+            movimento,
+            func.sum(movimento).over(order_by=baixa.data_baixa),
+        )
+        .select_from(baixa)
+        .join(contas, contas.c.id == baixa.conta_a_pagar_e_receber_id)
+        .filter(baixa.data_baixa >= data_inicio)
+        .filter(baixa.data_baixa <= data_fim)
+        .group_by(baixa.data_baixa)
+        .order_by(baixa.data_baixa)
+        .all()
+    )
+
+    saldo_anterior = saldo_realizado_ate(db, data_inicio - timedelta(days=1))
+    return [
+        SaldoRealizadoDiarioResponse(data=data_baixa, movimento=valor, saldo=saldo_anterior + acumulado)
+        for data_baixa, valor, acumulado in linhas
+    ]
+
+
+def fecha_saldo_realizado(db: Session, data: date) -> FechamentoDeSaldoModel:
+    """Grava (ou recalcula) o fechamento do saldo realizado na data informada."""
+    saldo = saldo_realizado_ate(db, data)
+    fechamento = db.get(FechamentoDeSaldoModel, data)
+    if fechamento is None:
+        fechamento = FechamentoDeSaldoModel(data=data, saldo=saldo)
+        db.add(fechamento)
+    else:
+        fechamento.saldo = saldo
+    db.commit()
+    db.refresh(fechamento)
+    return fechamento
+
+
+def erro_no_periodo_do_fluxo_de_caixa(data_inicio: date, data_fim: date) -> str | None:
+    """Mensagem de erro do intervalo pedido, ou None se ele for válido."""
+    if data_fim < data_inicio:
+        return "Data final deve ser igual ou posterior à data inicial"
+    if (data_fim - data_inicio).days >= MAXIMO_DE_DIAS_DO_FLUXO_DE_CAIXA:
+        return f"O período deve ter no máximo {MAXIMO_DE_DIAS_DO_FLUXO_DE_CAIXA} dias"
+    return None
+
+
+def inicio_do_periodo(data: date, granularidade: GranularidadeEnum) -> date:
+    """Primeiro dia do período (o próprio dia, ou a segunda-feira da semana) ao qual a data pertence."""
+    if granularidade == GranularidadeEnum.semana:
+        return data - timedelta(days=data.weekday())
+    return data
+
+
+def relatorio_fluxo_de_caixa_projetado(
+        db: Session,
+        data_inicio: date,
+        data_fim: date,
+        granularidade: GranularidadeEnum = GranularidadeEnum.dia,
+) -> FluxoDeCaixaResponse:
+    """
+    Projeta o fluxo de caixa das contas em aberto entre duas datas, partindo do saldo já realizado.
+
+    Os valores em aberto são somados por dia e tipo em uma única consulta agrupada; os dias sem
+    movimento são preenchidos com zero e o saldo é a soma acumulada das entradas menos as saídas.
+    """
+    conta = ContasAPagarEReceberModel
+    saldo_em_aberto = conta.valor - func.coalesce(conta.valor_baixada, 0)
+    movimentos = (
+        db.query(
+            conta.data_previsao,
+            func.coalesce(func.sum(case((conta.tipo == ContaPagarEReceberEnum.Receber.value, saldo_em_aberto), else_=0)), 0),
+            func.coalesce(func.sum(case((conta.tipo == ContaPagarEReceberEnum.Pagar.value, saldo_em_aberto), else_=0)), 0),
+        )
+        .filter(conta.esta_baixada.is_not(True))
+        .filter(conta.data_previsao >= data_inicio)
+        .filter(conta.data_previsao <= data_fim)
+        .group_by(conta.data_previsao)
+        .all()
+    )
+
+    entradas = defaultdict(Decimal)
+    saidas = defaultdict(Decimal)
+    for data_previsao, entrada, saida in movimentos:
+        periodo = inicio_do_periodo(data_previsao, granularidade)
+        entradas[periodo] += entrada
+        saidas[periodo] += saida
+
+    passo = timedelta(days=7 if granularidade == GranularidadeEnum.semana else 1)
+    primeiro_periodo = inicio_do_periodo(data_inicio, granularidade)
+    periodos = [primeiro_periodo + passo * i for i in range((data_fim - primeiro_periodo) // passo + 1)]
+
+    saldo_inicial = saldo_realizado_ate(db, data_inicio - timedelta(days=1))
+    saldos = accumulate((entradas[p] - saidas[p] for p in periodos), initial=saldo_inicial)
+    next(saldos)
+
+    return FluxoDeCaixaResponse(
+        granularidade=granularidade,
+        saldo_inicial=saldo_inicial,
+        periodos=[
+            FluxoDeCaixaPeriodoResponse(data=p, entradas=entradas[p], saidas=saidas[p], saldo=saldo)
+            for p, saldo in zip(periodos, saldos)
+        ],
+    )
+
+
+def relatorio_aging_de_contas_em_aberto(
+        db: Session,
+        data_base: date,
+        tipo: ContaPagarEReceberEnum | None = None,
+) -> List[AgingResponse]:
+    """
+    Agrupa o saldo em aberto das contas por fornecedor e tipo, em faixas de dias de atraso.
+
+    As faixas são calculadas com datas de corte fixas (data_base - 30, - 60, - 90), de modo que
+    a comparação é feita direto sobre `data_previsao` e o banco pode usar o índice parcial de contas em aberto.
+    """
+    conta = ContasAPagarEReceberModel
+    saldo_em_aberto = conta.valor - func.coalesce(conta.valor_baixada, 0)
+
+    def soma_na_faixa(condicao):
+        return func.coalesce(func.sum(case((condicao, saldo_em_aberto), else_=0)), 0)
+
+    corte_30 = data_base - timedelta(days=30)
+    corte_60 = data_base - timedelta(days=60)
+    corte_90 = data_base - timedelta(days=90)
+
+    consulta = (
+        db.query(
+            conta.fornecedor_cliente_id,
+            FornecedorClienteModel.nome,
+            conta.tipo,
+            soma_na_faixa(conta.data_previsao >= data_base),
+            soma_na_faixa((conta.data_previsao < data_base) & (conta.data_previsao >= corte_30)),
+            soma_na_faixa((conta.data_previsao < corte_30) & (conta.data_previsao >= corte_60)),
+            soma_na_faixa((conta.data_previsao < corte_60) & (conta.data_previsao >= corte_90)),
+            soma_na_faixa(conta.data_previsao < corte_90),
+            func.coalesce(func.sum(saldo_em_aberto), 0),
+        )
+        .outerjoin(FornecedorClienteModel, FornecedorClienteModel.id == conta.fornecedor_cliente_id)
+        .filter(conta.esta_baixada.is_not(True))
+    )
+    if tipo is not None:
+        consulta = consulta.filter(conta.tipo == tipo.value)
+
+    linhas = (
+        consulta
+        .group_by(conta.fornecedor_cliente_id, FornecedorClienteModel.nome, conta.tipo)
+        .order_by(conta.fornecedor_cliente_id, conta.tipo)
+        .all()
+    )
+
+    return [
+        AgingResponse(
+            fornecedor_cliente_id=fornecedor_cliente_id,
+            fornecedor_cliente_nome=nome,
+            tipo=tipo_da_conta,
+            a_vencer=a_vencer,
+            vencido_1_a_30_dias=ate_30,
+            vencido_31_a_60_dias=ate_60,
+            vencido_61_a_90_dias=ate_90,
+            vencido_mais_de_90_dias=mais_de_90,
+            total_em_aberto=total,
+        )
+        for fornecedor_cliente_id, nome, tipo_da_conta, a_vencer, ate_30, ate_60, ate_90, mais_de_90, total in linhas
+    ]
+
+
+@router.get("/aging", response_model=List[AgingResponse], summary="Aging das contas em aberto")
+def aging_de_contas_em_aberto(
+        db: Session = Depends(get_read_db),
+        data_base: date | None = Query(None, description="Data de referência para o cálculo do atraso (padrão: hoje)"),
+        tipo: ContaPagarEReceberEnum | None = None,
+):
+    """
+    Endpoint para gerar o aging das contas a pagar e receber em aberto.
+
+    Args:
+        db: Sessão do banco de dados
+        data_base: Data de referência para o cálculo dos dias de atraso
+        tipo: Filtra por contas a Pagar ou a Receber
+
+    Returns:
+        List[AgingResponse]: Saldo em aberto por fornecedor e tipo, separado por faixa de atraso
+    """
+    return relatorio_aging_de_contas_em_aberto(db, data_base or date.today(), tipo)
+
+
+@router.get("/fluxo-de-caixa", response_model=FluxoDeCaixaResponse, summary="Fluxo de caixa projetado")
+def fluxo_de_caixa_projetado(
+        data_inicio: date,
+        data_fim: date,
+        granularidade: GranularidadeEnum = GranularidadeEnum.dia,
+        db: Session = Depends(get_read_db),
+):
+    """
+    Endpoint para projetar o fluxo de caixa diário ou semanal em um intervalo de datas.
+
+    Args:
+        data_inicio: Primeiro dia da projeção
+        data_fim: Último dia da projeção
+        granularidade: Agrupamento da série, por dia ou por semana
+        db: Sessão do banco de dados
+
+    Returns:
+        FluxoDeCaixaResponse: Saldo inicial realizado e série de entradas, saídas e saldo acumulado
+
+    Raises:
+        HTTPException: Se a data final for anterior à data inicial ou o período passar de
+            MAXIMO_DE_DIAS_DO_FLUXO_DE_CAIXA dias
+    """
+    erro = erro_no_periodo_do_fluxo_de_caixa(data_inicio, data_fim)
+    if erro:
+        raise HTTPException(status_code=422, detail=erro)
+
+    return relatorio_fluxo_de_caixa_projetado(db, data_inicio, data_fim, granularidade)
+
+
+@router.get("/saldo-realizado", response_model=SaldoRealizadoResponse, summary="Saldo realizado em uma data")
+def saldo_realizado(
+        data: date | None = Query(None, description="Data de referência (padrão: hoje)"),
+        db: Session = Depends(get_read_db),
+):
+    """
+    Endpoint para consultar o saldo realizado (baixas a Receber menos baixas a Pagar) até uma data.
+
+    Args:
+        data: Data de referência do saldo
+        db: Sessão do banco de dados
+
+    Returns:
+        SaldoRealizadoResponse: Saldo realizado na data
+    """
+    data = data or date.today()
+    return SaldoRealizadoResponse(data=data, saldo=saldo_realizado_ate(db, data))
+
+
+@router.get(
+    "/saldo-realizado/diario",
+    response_model=List[SaldoRealizadoDiarioResponse],
+    summary="Saldo realizado dia a dia"
+)
+def saldo_realizado_diario(
+        data_inicio: date,
+        data_fim: date,
+        db: Session = Depends(get_read_db),
+):
+    """
+    Endpoint com o movimento e o saldo realizado ao fim de cada dia com baixas no intervalo.
+
+    Args:
+        data_inicio: Primeiro dia da série
+        data_fim: Último dia da série
+        db: Sessão do banco de dados
+
+    Returns:
+        List[SaldoRealizadoDiarioResponse]: Movimento e saldo dos dias com baixa
+
+    Raises:
+        HTTPException: Se a data final for anterior à data inicial
+    """
+    if data_fim < data_inicio:
+        raise HTTPException(status_code=422, detail="Data final deve ser igual ou posterior à data inicial")
+
+    return serie_do_saldo_realizado(db, data_inicio, data_fim)
+
+
+@router.post(
+    "/saldo-realizado/fechamentos",
+    response_model=SaldoRealizadoResponse,
+    status_code=201,
+    summary="Fechar o saldo realizado de um período"
+)
+def fechar_saldo_realizado(fechamento: FechamentoDeSaldoRequest, db: Session = Depends(get_db)):
+    """
+    Endpoint para gravar o saldo realizado de um período encerrado como ponto de partida das próximas consultas.
+
+    Args:
+        fechamento: Data do fechamento
+        db: Sessão do banco de dados
+
+    Returns:
+        SaldoRealizadoResponse: Saldo gravado no fechamento
+
+    Raises:
+        HTTPException: Se a data não for de um período já encerrado (anterior a hoje)
+    """
+    if fechamento.data >= date.today():
+        raise HTTPException(status_code=422, detail="Só é possível fechar o saldo de datas anteriores a hoje")
+
+    return fecha_saldo_realizado(db, fechamento.data)
@@ -0,0 +1,230 @@
+import inspect
+from datetime import date, datetime
+from enum import Enum
+from typing import Annotated, Any, Callable, List
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import FileResponse
+from pydantic import BaseModel, Field, ValidationError, model_validator
+
+from contas_a_pagar_e_receber.models.contas_a_pagar_e_receber_model import ContasAPagarEReceberModel
+from contas_a_pagar_e_receber.routers.contas_a_pagar_e_receber_router import ContaAPagarEReceberResponse, \
+    ContaPagarEReceberEnum, relatorio_gastos_previstos_por_mes_de_um_ano
+from contas_a_pagar_e_receber.routers.relatorios_router import GranularidadeEnum, \
+    erro_no_periodo_do_fluxo_de_caixa, relatorio_aging_de_contas_em_aberto, relatorio_fluxo_de_caixa_projetado
+from shared.dependencies import sessao_de_leitura_avulsa
+from shared.exceptions import NotFound
+from shared.tarefas import FilaDeTarefasCheia, StatusTarefaEnum, Tarefa, gerenciador_de_tarefas
+
+router = APIRouter(prefix="/relatorios/tarefas", tags=["Relatórios"])
+
+LINHAS_POR_LOTE_NA_EXPORTACAO = 1000
+# Cada ano da previsão é uma consulta; os limites evitam tarefas que ocupam a fila por muito tempo
+QUANTIDADE_MAXIMA_DE_ANOS = 10
+ANO_MINIMO = 1900
+ANO_MAXIMO = 2999
+
+
+class TipoDeTarefaEnum(str, Enum):
+    previsao_gastos = "previsao_gastos"
+    aging = "aging"
+    fluxo_de_caixa = "fluxo_de_caixa"
+    exportacao_contas = "exportacao_contas"
+
+
+class ParametrosPrevisaoGastos(BaseModel):
+    anos: List[Annotated[int, Field(ge=ANO_MINIMO, le=ANO_MAXIMO)]] = Field(
+        ..., min_length=1, max_length=QUANTIDADE_MAXIMA_DE_ANOS
+    )
+    incluir_arquivadas: bool = False
+
+
+class ParametrosAging(BaseModel):
+    data_base: date | None = None
+    tipo: ContaPagarEReceberEnum | None = None
+
+
+class ParametrosFluxoDeCaixa(BaseModel):
+    data_inicio: date
+    data_fim: date
+    granularidade: GranularidadeEnum = GranularidadeEnum.dia
+
+    @model_validator(mode="after")
+    def valida_periodo(self):
+        erro = erro_no_periodo_do_fluxo_de_caixa(self.data_inicio, self.data_fim)
+        if erro:
+            raise ValueError(erro)
+        return self
+
+
+class ParametrosExportacaoContas(BaseModel):
+    pass
+
+
+class TarefaRequest(BaseModel):
+    tipo: TipoDeTarefaEnum
+    parametros: dict[str, Any] = {}
+
+
+class TarefaResponse(BaseModel):
+    id: str
+    tipo: TipoDeTarefaEnum
+    status: StatusTarefaEnum
+    criada_em: datetime
+    concluida_em: datetime | None = None
+    erro: str | None = None
+
+
+def previsao_gastos(sessao, tarefa: Tarefa, parametros: ParametrosPrevisaoGastos):
+    resultado = {}
+    for ano in parametros.anos:
+        tarefa.verifica_cancelamento()
+        resultado[ano] = relatorio_gastos_previstos_por_mes_de_um_ano(sessao, ano, parametros.incluir_arquivadas)
+    return resultado
+
+
+def aging(sessao, tarefa: Tarefa, parametros: ParametrosAging):
+    return relatorio_aging_de_contas_em_aberto(sessao, parametros.data_base or date.today(), parametros.tipo)
+
+
+def fluxo_de_caixa(sessao, tarefa: Tarefa, parametros: ParametrosFluxoDeCaixa):
+    return relatorio_fluxo_de_caixa_projetado(
+        sessao, parametros.data_inicio, parametros.data_fim, parametros.granularidade
+    )
+
+
+def exportacao_contas(sessao, tarefa: Tarefa, parametros: ParametrosExportacaoContas):
+    contas = (
+        sessao.query(ContasAPagarEReceberModel)
+        .order_by(ContasAPagarEReceberModel.id)
+        .yield_per(LINHAS_POR_LOTE_NA_EXPORTACAO)
+    )
+    for conta in contas:
+        yield ContaAPagarEReceberResponse.model_validate(conta)
+
+
+TAREFAS: dict[TipoDeTarefaEnum, tuple[type[BaseModel], Callable]] = {
+    TipoDeTarefaEnum.previsao_gastos: (ParametrosPrevisaoGastos, previsao_gastos),
+    TipoDeTarefaEnum.aging: (ParametrosAging, aging),
+    TipoDeTarefaEnum.fluxo_de_caixa: (ParametrosFluxoDeCaixa, fluxo_de_caixa),
+    TipoDeTarefaEnum.exportacao_contas: (ParametrosExportacaoContas, exportacao_contas),
+}
+
+
+def monta_execucao(request: Request, funcao: Callable, parametros: BaseModel) -> Callable[[Tarefa], Any]:
+    """
+    Prepara a função executada em segundo plano, com sessão própria aberta apenas durante a execução.
+    As tarefas só leem, então usam a réplica (ou o pool de leitura do SQLite) quando disponível.
+    """
+    app = request.app
+
+    if inspect.isgeneratorfunction(funcao):
+        # Exportações são consumidas item a item pelo gerenciador; a sessão fica aberta até o fim do gerador
+        def executa(tarefa: Tarefa):
+            with sessao_de_leitura_avulsa(app) as sessao:
+                yield from funcao(sessao, tarefa, parametros)
+    else:
+        def executa(tarefa: Tarefa):
+            with sessao_de_leitura_avulsa(app) as sessao:
+                return funcao(sessao, tarefa, parametros)
+
+    return executa
+
+
+def buscar_tarefa(tarefa_id: str) -> Tarefa:
+    tarefa = gerenciador_de_tarefas.consulta(tarefa_id)
+    if tarefa is None:
+        raise NotFound(f"Tarefa {tarefa_id}")
+    return tarefa
+
+
+def tarefa_response(tarefa: Tarefa) -> TarefaResponse:
+    return TarefaResponse(
+        id=tarefa.id,
+        tipo=tarefa.tipo,
+        status=tarefa.status,
+        criada_em=datetime.fromtimestamp(tarefa.criada_em),
+        concluida_em=datetime.fromtimestamp(tarefa.concluida_em) if tarefa.concluida_em else None,
+        erro=tarefa.erro,
+    )
+
+
+@router.post("", response_model=TarefaResponse, status_code=202, summary="Submeter relatório em segundo plano")
+def submeter_tarefa(tarefa: TarefaRequest, request: Request) -> TarefaResponse:
+    """
+    Endpoint para submeter um relatório ou exportação para execução em segundo plano.
+
+    Args:
+        tarefa: Tipo do relatório e seus parâmetros
+        request: Requisição atual
+
+    Returns:
+        TarefaResponse: Tarefa criada, com o ID usado para acompanhar e baixar o resultado
+
+    Raises:
+        HTTPException: Se os parâmetros forem inválidos ou a fila de tarefas estiver cheia
+    """
+    modelo_dos_parametros, funcao = TAREFAS[tarefa.tipo]
+    try:
+        parametros = modelo_dos_parametros.model_validate(tarefa.parametros)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors(include_url=False, include_context=False))
+
+    try:
+        criada = gerenciador_de_tarefas.submete(tarefa.tipo, monta_execucao(request, funcao, parametros))
+    except FilaDeTarefasCheia:
+        raise HTTPException(
+            status_code=503,
+            detail="Fila de tarefas cheia, tente novamente mais tarde",
+            headers={"Retry-After": "30"},
+        )
+    return tarefa_response(criada)
+
+
+@router.get("/{tarefa_id}", response_model=TarefaResponse, summary="Consultar andamento de uma tarefa")
+def consultar_tarefa(tarefa_id: str) -> TarefaResponse:
+    """
+    Endpoint para acompanhar uma tarefa. Tarefas que deixam de ser consultadas são canceladas.
+
+    Args:
+        tarefa_id: ID da tarefa
+
+    Returns:
+        TarefaResponse: Situação atual da tarefa
+    """
+    return tarefa_response(buscar_tarefa(tarefa_id))
+
+
+@router.get("/{tarefa_id}/resultado", summary="Baixar o resultado de uma tarefa concluída")
+def baixar_resultado_da_tarefa(tarefa_id: str) -> FileResponse:
+    """
+    Endpoint para baixar o resultado (JSON) de uma tarefa concluída.
+
+    Args:
+        tarefa_id: ID da tarefa
+
+    Returns:
+        FileResponse: Arquivo JSON com o resultado
+
+    Raises:
+        HTTPException: Se a tarefa ainda não tiver sido concluída com sucesso
+    """
+    tarefa = buscar_tarefa(tarefa_id)
+    if tarefa.status != StatusTarefaEnum.concluida:
+        raise HTTPException(status_code=409, detail=f"Tarefa com status '{tarefa.status.value}' não possui resultado")
+    return FileResponse(gerenciador_de_tarefas.caminho_do_resultado(tarefa.id), media_type="application/json")
+
+
+@router.delete("/{tarefa_id}", response_model=TarefaResponse, summary="Cancelar uma tarefa")
+def cancelar_tarefa(tarefa_id: str) -> TarefaResponse:
+    """
+    Endpoint para cancelar uma tarefa pendente ou em execução.
+
+    Args:
+        tarefa_id: ID da tarefa
+
+    Returns:
+        TarefaResponse: Tarefa após o pedido de cancelamento
+    """
+    buscar_tarefa(tarefa_id)
+    return tarefa_response(gerenciador_de_tarefas.cancela(tarefa_id))
@@ -1,9 +1,23 @@
+from contextlib import asynccontextmanager
+
 import uvicorn
 from fastapi import FastAPI
+from sqlalchemy.engine import Engine
+
+from config import Settings
+from contas_a_pagar_e_receber.models.contas_a_pagar_e_receber_model import particoes_de_contas
 from contas_a_pagar_e_receber.routers import contas_a_pagar_e_receber_router, fornecedor_cliente_router, \
-    fornecedor_cliente_vs_contas
+    fornecedor_cliente_vs_contas, relatorios_router, importacao_router, tarefas_router, alteracoes_router, \
+    eventos_router, recorrencias_router, dashboard_router, metricas_router
+from shared.admissao import ControleDeAdmissao, ControleDeAdmissaoMiddleware
+from shared.coalescencia import Coalescencia, CoalescenciaMiddleware
+from shared.compressao import CompressaoMiddleware
 from shared.exceptions import NotFound
 from shared.exceptions_handlers import not_found_exception_handler
+from shared.idempotencia import IdempotenciaMiddleware
+from shared.database import configura_banco, descarta_banco, obtem_fabrica_de_leitura
+from shared.eventos import BackendLocal, BackendPostgresNotify, hub_de_eventos
+from shared.replica import LeituraNaPrimariaAposEscritaMiddleware, roteador_de_leitura
 
 # from contas_a_pagar_e_receber.models.contas_a_pagar_e_receber_model import ContasAPagarEReceberModel
 
@@ -12,13 +26,81 @@ from shared.exceptions_handlers import not_found_exception_handler
 # Base.metadata.drop_all(bind=engine)
 # Base.metadata.create_all(bind=engine)
 
-app = FastAPI()
 
-# app.include_router(contas_a_pagar_e_receber_router.router, prefix="/contas-a-pagar-e-receber", tags=["Contas a Pagar e Receber"])
-app.include_router(contas_a_pagar_e_receber_router.router)
-app.include_router(fornecedor_cliente_router.router)
-app.include_router(fornecedor_cliente_vs_contas.router)
-app.add_exception_handler(NotFound, not_found_exception_handler)
+def aquece_pool(engine: Engine) -> None:
+    """Abre de antemão as conexões do pool, para que as primeiras requisições não paguem o connect."""
+    conexoes = [engine.connect() for _ in range(max(getattr(engine.pool, "size", lambda: 1)(), 1))]
+    for conexao in conexoes:
+        conexao.close()
+
+
+def create_app(settings: Settings | None = None) -> FastAPI:
+    """
+    Monta a aplicação. Nenhuma conexão é aberta aqui: as engines são criadas no lifespan, e os
+    aquecimentos (pool e schema OpenAPI) só acontecem se habilitados nas configurações.
+
+    Args:
+        settings: Configurações da aplicação; por padrão, as lidas das variáveis de ambiente
+
+    Returns:
+        FastAPI: Aplicação pronta para ser servida
+    """
+    settings = settings or Settings()
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        engine = configura_banco(
+            settings.database_url, settings.database_read_url, settings.database_echo,
+            settings.database_pool_size, settings.database_max_overflow,
+        )
+        roteador_de_leitura.configura(obtem_fabrica_de_leitura())
+        if settings.garantir_particoes_na_inicializacao:
+            # Partições do ano corrente e dos próximos anos já existem antes das primeiras escritas
+            particoes_de_contas.garante_anos_futuros(engine)
+        if settings.eventos_backend == "postgresql":
+            # Eventos publicados em qualquer worker chegam às conexões SSE de todos eles
+            hub_de_eventos.usa_backend(BackendPostgresNotify(engine))
+        if settings.aquecer_pool_na_inicializacao:
+            aquece_pool(engine)
+        if settings.gerar_openapi_na_inicializacao:
+            app.openapi()
+        yield
+        hub_de_eventos.usa_backend(BackendLocal())
+        roteador_de_leitura.configura(None)
+        descarta_banco()
+
+    app = FastAPI(lifespan=lifespan)
+    app.state.settings = settings
+
+    # app.include_router(contas_a_pagar_e_receber_router.router, prefix="/contas-a-pagar-e-receber", tags=["Contas a Pagar e Receber"])
+    app.include_router(recorrencias_router.router)
+    app.include_router(contas_a_pagar_e_receber_router.router)
+    app.include_router(fornecedor_cliente_router.router)
+    app.include_router(fornecedor_cliente_vs_contas.router)
+    app.include_router(relatorios_router.router)
+    app.include_router(importacao_router.router)
+    app.include_router(tarefas_router.router)
+    app.include_router(alteracoes_router.router)
+    app.include_router(eventos_router.router)
+    app.include_router(dashboard_router.router)
+    app.include_router(metricas_router.router)
+    app.add_exception_handler(NotFound, not_found_exception_handler)
+    app.add_middleware(IdempotenciaMiddleware)
+    app.add_middleware(LeituraNaPrimariaAposEscritaMiddleware)
+    # Por fora da idempotência, que também usa o banco: requisições recusadas não chegam a ocupar conexões
+    app.state.controle_de_admissao = ControleDeAdmissao(
+        pool_size=settings.database_pool_size, max_overflow=settings.database_max_overflow
+    )
+    app.add_middleware(ControleDeAdmissaoMiddleware, controle=app.state.controle_de_admissao)
+    # Por fora da admissão: quem aguarda um relatório idêntico em andamento não ocupa vaga
+    app.state.coalescencia = Coalescencia()
+    app.add_middleware(CoalescenciaMiddleware, coalescencia=app.state.coalescencia)
+    # Por fora da idempotência: respostas repetidas também são negociadas com o cliente que as pediu
+    app.add_middleware(CompressaoMiddleware)
+    return app
+
+
+app = create_app()
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8001)
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=8001)
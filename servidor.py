@@ -0,0 +1,109 @@
+# servidor.py
+#
+# Ponto de entrada de produção: um processo supervisor do uvicorn com vários workers.
+# - O orçamento de conexões (DATABASE_MAX_CONEXOES) é dividido entre os workers, para que
+#   pool_size × workers nunca ultrapasse o limite de conexões do Postgres.
+# - Cada worker é reciclado após SERVIDOR_MAX_REQUISICOES_POR_WORKER requisições; o supervisor
+#   sobe outro no lugar, limitando o crescimento de memória.
+# - `kill -HUP <pid do supervisor>` reinicia os workers um a um, terminando as requisições em andamento.
+# - Com o backend de eventos local, cada worker só notifica as próprias conexões SSE; por isso vários
+#   workers exigem EVENTOS_BACKEND=postgresql.
+#
+# Uso:
+#   $ python servidor.py --workers 4
+#
+# Para desenvolvimento continua valendo `python main.py` (um único processo).
+
+import argparse
+import os
+
+import uvicorn
+
+from config import SERVIDOR_HOST, SERVIDOR_PORTA, SERVIDOR_WORKERS, SERVIDOR_MAX_REQUISICOES_POR_WORKER, \
+    SERVIDOR_TEMPO_DE_DESLIGAMENTO_SEGUNDOS, DATABASE_MAX_CONEXOES, EVENTOS_BACKEND
+
+BACKEND_DE_EVENTOS_ENTRE_WORKERS = "postgresql"
+
+
+def conexoes_por_worker(max_conexoes: int, workers: int) -> int:
+    """
+    Divide o orçamento de conexões igualmente entre os workers.
+
+    Args:
+        max_conexoes: Conexões com o banco que a API pode usar no total
+        workers: Quantidade de processos
+
+    Returns:
+        int: Tamanho do pool de cada worker
+
+    Raises:
+        ValueError: Se não houver ao menos uma conexão para cada worker
+    """
+    if workers < 1:
+        raise ValueError("A quantidade de workers deve ser ao menos 1")
+    por_worker = max_conexoes // workers
+    if por_worker < 1:
+        raise ValueError(
+            f"{max_conexoes} conexões não são suficientes para {workers} workers; "
+            f"reduza os workers ou aumente DATABASE_MAX_CONEXOES"
+        )
+    return por_worker
+
+
+def workers_padrao(eventos_backend: str) -> int:
+    """Um worker por CPU quando os eventos chegam a todos eles; senão, um só."""
+    if eventos_backend == BACKEND_DE_EVENTOS_ENTRE_WORKERS:
+        return os.cpu_count() or 1
+    return 1
+
+
+def valida_workers(workers: int, eventos_backend: str) -> None:
+    """
+    Raises:
+        ValueError: Se houver mais de um worker com o backend de eventos local, em que as conexões SSE
+            de um worker não recebem os eventos das escritas atendidas pelos outros
+    """
+    if workers > 1 and eventos_backend != BACKEND_DE_EVENTOS_ENTRE_WORKERS:
+        raise ValueError(
+            f"{workers} workers com EVENTOS_BACKEND={eventos_backend}: os clientes de GET /eventos perderiam "
+            f"os eventos dos outros workers; use EVENTOS_BACKEND={BACKEND_DE_EVENTOS_ENTRE_WORKERS} ou --workers 1"
+        )
+
+
+def main(argumentos: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Executa a API em produção com vários workers.")
+    parser.add_argument("--host", default=SERVIDOR_HOST)
+    parser.add_argument("--porta", type=int, default=SERVIDOR_PORTA)
+    parser.add_argument("--workers", type=int, default=SERVIDOR_WORKERS,
+                        help="Quantidade de processos (padrão: número de CPUs com EVENTOS_BACKEND=postgresql, senão 1)")
+    parser.add_argument("--max-conexoes", type=int, default=DATABASE_MAX_CONEXOES,
+                        help="Conexões com o banco somando todos os workers")
+    parser.add_argument("--max-requisicoes-por-worker", type=int, default=SERVIDOR_MAX_REQUISICOES_POR_WORKER,
+                        help="Recicla o worker após esta quantidade de requisições (0 desativa)")
+    args = parser.parse_args(argumentos)
+
+    if args.workers is None:
+        args.workers = workers_padrao(EVENTOS_BACKEND)
+    try:
+        valida_workers(args.workers, EVENTOS_BACKEND)
+        pool_size = conexoes_por_worker(args.max_conexoes, args.workers)
+    except ValueError as erro:
+        parser.error(str(erro))
+
+    # Os workers leem as configurações do ambiente ao importar o main (config.Settings)
+    os.environ["DATABASE_POOL_SIZE"] = str(pool_size)
+    os.environ["DATABASE_MAX_OVERFLOW"] = "0"
+
+    uvicorn.run(
+        "main:app",
+        host=args.host,
+        port=args.porta,
+        workers=args.workers,
+        limit_max_requests=args.max_requisicoes_por_worker or None,
+        timeout_graceful_shutdown=SERVIDOR_TEMPO_DE_DESLIGAMENTO_SEGUNDOS,
+        proxy_headers=True,
+    )
+
+
+if __name__ == "__main__":
+    main()
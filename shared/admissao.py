@@ -0,0 +1,204 @@
+# shared/admissao.py
+#
+# Controle de admissão das rotas que usam o banco. Cada classe de rota (leituras, escritas e
+# relatórios) tem um limite de requisições simultâneas e uma fila de espera curta e limitada.
+# Quando a fila está cheia, ou a espera passa do máximo, a requisição recebe 503 com Retry-After
+# na hora, em vez de esperar por uma conexão do pool até o timeout e atrasar todas as outras.
+#
+# Os limites valem por worker (processo), assim como o pool de conexões, e por padrão são calculados a
+# partir do tamanho desse pool.
+
+import asyncio
+import math
+from collections import deque
+
+from starlette.responses import JSONResponse
+
+from config import ADMISSAO_LIMITE_LEITURAS, ADMISSAO_LIMITE_ESCRITAS, ADMISSAO_LIMITE_RELATORIOS, \
+    ADMISSAO_MAXIMO_NA_FILA, ADMISSAO_ESPERA_MAXIMA_SEGUNDOS, ADMISSAO_RETRY_AFTER_SEGUNDOS, \
+    DATABASE_POOL_SIZE, DATABASE_MAX_OVERFLOW
+
+CLASSE_LEITURA = "leitura"
+CLASSE_ESCRITA = "escrita"
+CLASSE_RELATORIO = "relatorio"
+
+# Rotas de agregação pesada, limitadas à parte para não ocuparem as conexões das leituras simples
+PREFIXOS_DE_RELATORIO = ("/relatorios", "/dashboard", "/contas-a-pagar-e-receber/previsao-gastos-do-mes")
+# Rotas que não passam pelo controle: não usam o banco ou ficam abertas por muito tempo (SSE). As tarefas
+# em segundo plano são consultadas em polling enquanto um relatório ocupa a vaga e não usam o banco na rota.
+PREFIXOS_SEM_CONTROLE = ("/eventos", "/metricas", "/relatorios/tarefas", "/docs", "/redoc", "/openapi.json")
+METODOS_DE_LEITURA = ("GET", "HEAD")
+
+# Padrões do QueuePool do SQLAlchemy, usados quando DATABASE_POOL_SIZE/DATABASE_MAX_OVERFLOW não são informados
+POOL_SIZE_PADRAO = 5
+MAX_OVERFLOW_PADRAO = 10
+# Conexões que uma escrita pode ocupar: a da rota e a da sessão avulsa da Idempotency-Key
+CONEXOES_POR_ESCRITA = 2
+
+
+def limites_do_pool(pool_size: int | None, max_overflow: int | None) -> dict[str, int]:
+    """
+    Limites por classe que cabem no pool do worker (pool_size + max_overflow): 1/8 das conexões para
+    relatórios, escritas contadas em dobro em 1/3 delas e o restante para leituras, com ao menos uma
+    vaga por classe. Com o pool sem limite (pool_size 0 ou max_overflow negativo), as classes também ficam.
+    """
+    pool_size = POOL_SIZE_PADRAO if pool_size is None else pool_size
+    max_overflow = MAX_OVERFLOW_PADRAO if max_overflow is None else max_overflow
+    if pool_size <= 0 or max_overflow < 0:
+        return {CLASSE_LEITURA: 0, CLASSE_ESCRITA: 0, CLASSE_RELATORIO: 0}
+
+    conexoes = pool_size + max_overflow
+    relatorios = max(1, conexoes // 8)
+    escritas = max(1, conexoes // (3 * CONEXOES_POR_ESCRITA))
+    leituras = max(1, conexoes - relatorios - escritas * CONEXOES_POR_ESCRITA)
+    return {CLASSE_LEITURA: leituras, CLASSE_ESCRITA: escritas, CLASSE_RELATORIO: relatorios}
+
+
+class LimitadorDeConcorrencia:
+    """
+    Semáforo com fila de espera limitada e tempo máximo de espera. Usado só no event loop do worker,
+    então os contadores não precisam de trava.
+    """
+
+    def __init__(self, limite: int, maximo_na_fila: int, espera_maxima_segundos: float):
+        self.limite = limite
+        self.maximo_na_fila = maximo_na_fila
+        self.espera_maxima_segundos = espera_maxima_segundos
+        self.em_execucao = 0
+        self._fila: deque[asyncio.Future] = deque()
+        self.maior_fila = 0
+        self.admitidas = 0
+        self.recusadas_fila_cheia = 0
+        self.recusadas_por_espera = 0
+
+    @property
+    def na_fila(self) -> int:
+        return len(self._fila)
+
+    async def entra(self) -> bool:
+        """Ocupa uma vaga, esperando na fila se preciso. False quando a requisição deve ser recusada."""
+        if self.em_execucao < self.limite and not self._fila:
+            self.em_execucao += 1
+            self.admitidas += 1
+            return True
+        if len(self._fila) >= self.maximo_na_fila:
+            self.recusadas_fila_cheia += 1
+            return False
+
+        vez = asyncio.get_running_loop().create_future()
+        self._fila.append(vez)
+        self.maior_fila = max(self.maior_fila, len(self._fila))
+        try:
+            await asyncio.wait_for(vez, self.espera_maxima_segundos)
+        except TimeoutError:
+            self._fila.remove(vez)
+            self.recusadas_por_espera += 1
+            return False
+        except asyncio.CancelledError:
+            if vez.done() and not vez.cancelled():
+                # A vaga chegou junto com o cancelamento (cliente desconectou): repassa adiante
+                self.sai()
+            elif vez in self._fila:
+                self._fila.remove(vez)
+            raise
+        self.admitidas += 1
+        return True
+
+    def sai(self) -> None:
+        """Libera a vaga, passando-a direto ao primeiro da fila, se houver."""
+        while self._fila:
+            vez = self._fila.popleft()
+            if not vez.done():
+                vez.set_result(None)
+                return
+        self.em_execucao -= 1
+
+    def metricas(self) -> dict[str, int]:
+        return {
+            "limite": self.limite,
+            "em_execucao": self.em_execucao,
+            "na_fila": self.na_fila,
+            "maximo_na_fila": self.maximo_na_fila,
+            "maior_fila": self.maior_fila,
+            "admitidas": self.admitidas,
+            "recusadas_fila_cheia": self.recusadas_fila_cheia,
+            "recusadas_por_espera": self.recusadas_por_espera,
+        }
+
+
+class ControleDeAdmissao:
+    def __init__(
+            self,
+            limites: dict[str, int] | None = None,
+            pool_size: int | None = DATABASE_POOL_SIZE,
+            max_overflow: int | None = DATABASE_MAX_OVERFLOW,
+            maximo_na_fila: int = ADMISSAO_MAXIMO_NA_FILA,
+            espera_maxima_segundos: float = ADMISSAO_ESPERA_MAXIMA_SEGUNDOS,
+            retry_after_segundos: float = ADMISSAO_RETRY_AFTER_SEGUNDOS,
+    ):
+        """
+        Args:
+            limites: Requisições simultâneas por classe de rota; 0 deixa a classe sem limite. Sem
+                limites, valem os ADMISSAO_LIMITE_* informados e, para os demais, `limites_do_pool`
+            pool_size: Conexões mantidas no pool de cada engine do worker (None = padrão do SQLAlchemy)
+            max_overflow: Conexões extras do pool de cada engine (None = padrão do SQLAlchemy)
+            maximo_na_fila: Requisições que podem aguardar uma vaga, por classe
+            espera_maxima_segundos: Tempo máximo de espera na fila antes do 503
+            retry_after_segundos: Valor do cabeçalho Retry-After das respostas 503
+        """
+        if limites is None:
+            configurados = {
+                CLASSE_LEITURA: ADMISSAO_LIMITE_LEITURAS,
+                CLASSE_ESCRITA: ADMISSAO_LIMITE_ESCRITAS,
+                CLASSE_RELATORIO: ADMISSAO_LIMITE_RELATORIOS,
+            }
+            limites = {
+                classe: limite if configurados[classe] is None else configurados[classe]
+                for classe, limite in limites_do_pool(pool_size, max_overflow).items()
+            }
+        self.limitadores = {
+            classe: LimitadorDeConcorrencia(limite, maximo_na_fila, espera_maxima_segundos)
+            for classe, limite in limites.items() if limite > 0
+        }
+        self.retry_after_segundos = retry_after_segundos
+
+    @staticmethod
+    def classe_da_rota(metodo: str, caminho: str) -> str | None:
+        if caminho.startswith(PREFIXOS_SEM_CONTROLE):
+            return None
+        if caminho.startswith(PREFIXOS_DE_RELATORIO):
+            return CLASSE_RELATORIO
+        return CLASSE_LEITURA if metodo in METODOS_DE_LEITURA else CLASSE_ESCRITA
+
+    def limitador_da_rota(self, metodo: str, caminho: str) -> LimitadorDeConcorrencia | None:
+        return self.limitadores.get(self.classe_da_rota(metodo, caminho))
+
+    def metricas(self) -> dict[str, dict[str, int]]:
+        return {classe: limitador.metricas() for classe, limitador in self.limitadores.items()}
+
+
+class ControleDeAdmissaoMiddleware:
+    def __init__(self, app, controle: ControleDeAdmissao):
+        self.app = app
+        self.controle = controle
+
+    async def __call__(self, scope, receive, send):
+        limitador = self.controle.limitador_da_rota(scope["method"], scope["path"]) \
+            if scope["type"] == "http" else None
+        if limitador is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not await limitador.entra():
+            resposta = JSONResponse(
+                status_code=503,
+                content={"detail": "Servidor sobrecarregado, tente novamente em instantes"},
+                headers={"Retry-After": str(math.ceil(self.controle.retry_after_segundos))},
+            )
+            await resposta(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limitador.sai()
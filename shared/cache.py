@@ -0,0 +1,48 @@
+# shared/cache.py
+#
+# Cache em memória com expiração curta, para respostas caras e lidas com muita frequência (ex.: o
+# dashboard da tela inicial). Cada worker tem o seu; os dados podem ficar até `ttl_segundos` defasados.
+
+import threading
+import time
+from typing import Any, Callable, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class CacheComTTL:
+    def __init__(self, ttl_segundos: float, maximo_de_entradas: int = 128, relogio: Callable[[], float] = time.monotonic):
+        self.ttl_segundos = ttl_segundos
+        self.maximo_de_entradas = maximo_de_entradas
+        self._relogio = relogio
+        self._entradas: dict[Hashable, tuple[float, Any]] = {}
+        self._trava = threading.Lock()
+
+    def obtem(self, chave: Hashable, calcula: Callable[[], T]) -> T:
+        """Valor guardado para a chave, se ainda válido; senão, o resultado de `calcula()`, que passa a ser guardado."""
+        if self.ttl_segundos <= 0:
+            return calcula()
+
+        with self._trava:
+            entrada = self._entradas.get(chave)
+        if entrada is not None and entrada[0] > self._relogio():
+            return entrada[1]
+
+        valor = calcula()
+        agora = self._relogio()
+        with self._trava:
+            if chave not in self._entradas and len(self._entradas) >= self.maximo_de_entradas:
+                self._remove_expiradas(agora)
+                if len(self._entradas) >= self.maximo_de_entradas:
+                    # Sem expiradas para remover: descarta a que expira primeiro
+                    del self._entradas[min(self._entradas, key=lambda c: self._entradas[c][0])]
+            self._entradas[chave] = (agora + self.ttl_segundos, valor)
+        return valor
+
+    def _remove_expiradas(self, agora: float) -> None:
+        for chave in [c for c, (expira_em, _) in self._entradas.items() if expira_em <= agora]:
+            del self._entradas[chave]
+
+    def limpa(self) -> None:
+        with self._trava:
+            self._entradas.clear()
@@ -0,0 +1,185 @@
+# shared/coalescencia.py
+#
+# Coalescência (single-flight) dos relatórios: requisições GET idênticas (mesma rota e mesmos
+# parâmetros) que chegam enquanto uma delas ainda está sendo calculada não disparam a consulta de
+# novo. Elas aguardam a primeira e recebem a mesma resposta. Nada é guardado depois que a primeira
+# termina: a próxima requisição calcula de novo.
+#
+# Cada chave tem um prazo contado a partir do início do cálculo. Quem espera além dele recebe 503
+# com Retry-After, e requisições que chegam depois do prazo iniciam um novo cálculo. Erros do
+# cálculo são repassados a todas as requisições que o aguardavam.
+#
+# A resposta só é guardada até COALESCENCIA_RESPOSTA_MAXIMA_BYTES. Acima disso o corpo segue direto
+# para o primeiro cliente e quem aguardava calcula a própria resposta. As rotas de tarefas em segundo
+# plano (consulta de andamento e download do resultado) não são coalescidas.
+#
+# Clientes que acabaram de escrever leem do banco principal (cookie de shared/replica.py) e não
+# compartilham o cálculo de quem lê da réplica, que pode ainda não ter a escrita.
+
+import asyncio
+import math
+import time
+from dataclasses import dataclass
+from urllib.parse import parse_qsl
+
+from starlette.requests import cookie_parser
+from starlette.responses import JSONResponse
+
+from config import COALESCENCIA_ESPERA_MAXIMA_SEGUNDOS, ADMISSAO_RETRY_AFTER_SEGUNDOS, \
+    COALESCENCIA_RESPOSTA_MAXIMA_BYTES
+from shared.admissao import PREFIXOS_DE_RELATORIO
+from shared.replica import exige_leitura_na_primaria
+
+# A situação da tarefa muda entre consultas e o resultado é um arquivo que pode ser grande
+PREFIXOS_SEM_COALESCENCIA = ("/relatorios/tarefas",)
+
+
+@dataclass
+class CalculoEmAndamento:
+    resposta: asyncio.Future
+    prazo: float
+
+
+def chave_da_requisicao(scope) -> tuple:
+    """
+    Rota (sem a barra final) e parâmetros em ordem, para que `?a=1&b=2` e `?b=2&a=1` coincidam, e se
+    a leitura vai para o banco principal por causa de uma escrita recente do cliente.
+    """
+    parametros = parse_qsl(scope.get("query_string", b"").decode("latin-1"), keep_blank_values=True)
+    cookies = cookie_parser(dict(scope.get("headers", [])).get(b"cookie", b"").decode("latin-1"))
+    return scope["path"].rstrip("/"), tuple(sorted(parametros)), exige_leitura_na_primaria(cookies)
+
+
+def resposta_completa(mensagens: list[dict]) -> bool:
+    return bool(mensagens) and mensagens[-1]["type"] == "http.response.body" and not mensagens[-1].get("more_body")
+
+
+class Coalescencia:
+    """Cálculos em andamento e contadores. Usado só no event loop do worker, então não precisa de trava."""
+
+    def __init__(
+            self,
+            prefixos: tuple[str, ...] = PREFIXOS_DE_RELATORIO,
+            espera_maxima_segundos: float = COALESCENCIA_ESPERA_MAXIMA_SEGUNDOS,
+            retry_after_segundos: float = ADMISSAO_RETRY_AFTER_SEGUNDOS,
+            resposta_maxima_bytes: int = COALESCENCIA_RESPOSTA_MAXIMA_BYTES,
+            excecoes: tuple[str, ...] = PREFIXOS_SEM_COALESCENCIA,
+    ):
+        self.prefixos = prefixos
+        self.excecoes = excecoes
+        self.resposta_maxima_bytes = resposta_maxima_bytes
+        self.espera_maxima_segundos = espera_maxima_segundos
+        self.retry_after_segundos = retry_after_segundos
+        self.em_andamento: dict[tuple, CalculoEmAndamento] = {}
+        self.calculadas = 0
+        self.coalescidas = 0
+        self.recusadas_por_espera = 0
+
+    def aplica_se(self, scope) -> bool:
+        return (
+            scope["type"] == "http" and scope["method"] == "GET"
+            and scope["path"].startswith(self.prefixos) and not scope["path"].startswith(self.excecoes)
+        )
+
+    def metricas(self) -> dict[str, int]:
+        return {
+            "em_andamento": len(self.em_andamento),
+            "calculadas": self.calculadas,
+            "coalescidas": self.coalescidas,
+            "recusadas_por_espera": self.recusadas_por_espera,
+        }
+
+
+class CoalescenciaMiddleware:
+    def __init__(self, app, coalescencia: Coalescencia):
+        self.app = app
+        self.coalescencia = coalescencia
+
+    async def __call__(self, scope, receive, send):
+        if not self.coalescencia.aplica_se(scope):
+            await self.app(scope, receive, send)
+            return
+
+        chave = chave_da_requisicao(scope)
+        agora = time.monotonic()
+        calculo = self.coalescencia.em_andamento.get(chave)
+        # Só aguarda cálculos do mesmo event loop (em produção, um por worker)
+        if calculo is not None and calculo.prazo > agora and calculo.resposta.get_loop() is asyncio.get_running_loop():
+            if await self._aguarda(calculo, agora, scope, receive, send):
+                return
+
+        await self._calcula(chave, scope, receive, send)
+
+    async def _aguarda(self, calculo: CalculoEmAndamento, agora: float, scope, receive, send) -> bool:
+        """
+        Repassa a resposta do cálculo em andamento. False se ele foi cancelado ou se a resposta era grande
+        demais para ser guardada, e é preciso calcular de novo.
+        """
+        try:
+            mensagens = await asyncio.wait_for(asyncio.shield(calculo.resposta), calculo.prazo - agora)
+        except TimeoutError:
+            self.coalescencia.recusadas_por_espera += 1
+            resposta = JSONResponse(
+                status_code=503,
+                content={"detail": "Relatório ainda em processamento, tente novamente em instantes"},
+                headers={"Retry-After": str(math.ceil(self.coalescencia.retry_after_segundos))},
+            )
+            await resposta(scope, receive, send)
+            return True
+        except asyncio.CancelledError:
+            if calculo.resposta.cancelled() and not asyncio.current_task().cancelling():
+                return False
+            raise
+
+        if mensagens is None:
+            return False
+        self.coalescencia.coalescidas += 1
+        for mensagem in mensagens:
+            await send(mensagem)
+        return True
+
+    async def _calcula(self, chave: tuple, scope, receive, send) -> None:
+        calculo = CalculoEmAndamento(
+            asyncio.get_running_loop().create_future(), time.monotonic() + self.coalescencia.espera_maxima_segundos
+        )
+        # Evita o aviso de exceção nunca lida quando ninguém estava aguardando
+        calculo.resposta.add_done_callback(lambda futuro: futuro.cancelled() or futuro.exception())
+        self.coalescencia.em_andamento[chave] = calculo
+        self.coalescencia.calculadas += 1
+        mensagens = []
+        tamanho = 0
+
+        async def send_gravando(mensagem):
+            nonlocal mensagens, tamanho
+            if mensagens is not None:
+                tamanho += len(mensagem.get("body", b""))
+                if tamanho <= self.coalescencia.resposta_maxima_bytes:
+                    mensagens.append(mensagem)
+                else:
+                    # Grande demais para guardar: quem aguarda calcula a sua e quem chegar não espera por esta
+                    mensagens = None
+                    if self.coalescencia.em_andamento.get(chave) is calculo:
+                        del self.coalescencia.em_andamento[chave]
+                    calculo.resposta.set_result(None)
+            await send(mensagem)
+
+        try:
+            await self.app(scope, receive, send_gravando)
+        except asyncio.CancelledError:
+            calculo.resposta.cancel()
+            raise
+        except Exception as erro:
+            if calculo.resposta.done():
+                pass  # Quem aguardava já foi liberado ao passar do tamanho máximo
+            elif resposta_completa(mensagens):
+                # O cálculo terminou e só o envio ao primeiro cliente falhou (ex.: desconexão)
+                calculo.resposta.set_result(mensagens)
+            else:
+                calculo.resposta.set_exception(erro)
+            raise
+        else:
+            if not calculo.resposta.done():
+                calculo.resposta.set_result(mensagens)
+        finally:
+            if self.coalescencia.em_andamento.get(chave) is calculo:
+                del self.coalescencia.em_andamento[chave]
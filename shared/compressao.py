@@ -0,0 +1,174 @@
+# shared/compressao.py
+#
+# Compressão das respostas negociada pelo Accept-Encoding. Usa zstd e brotli quando os pacotes
+# `zstandard` e `brotli` estão instalados (são opcionais) e gzip, da biblioteca padrão, nos demais casos.
+# Respostas pequenas saem sem compressão; respostas em streaming são comprimidas pedaço a pedaço,
+# com flush a cada pedaço para que o cliente receba os dados sem esperar o fim da resposta.
+
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from config import COMPRESSAO_TAMANHO_MINIMO, COMPRESSAO_NIVEL_GZIP, COMPRESSAO_NIVEL_BROTLI, COMPRESSAO_NIVEL_ZSTD
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - dependência opcional
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - dependência opcional
+    zstandard = None
+
+TIPOS_COMPRESSIVEIS = ("text/", "application/json", "application/javascript", "application/xml")
+
+
+class CompressorGzip:
+    codificacao = "gzip"
+
+    def __init__(self, nivel: int = COMPRESSAO_NIVEL_GZIP):
+        self._compressor = zlib.compressobj(nivel, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def comprime(self, dados: bytes) -> bytes:
+        return self._compressor.compress(dados) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finaliza(self, dados: bytes = b"") -> bytes:
+        return self._compressor.compress(dados) + self._compressor.flush(zlib.Z_FINISH)
+
+
+class CompressorBrotli:
+    codificacao = "br"
+
+    def __init__(self, nivel: int = COMPRESSAO_NIVEL_BROTLI):
+        self._compressor = brotli.Compressor(quality=nivel)
+
+    def comprime(self, dados: bytes) -> bytes:
+        return self._compressor.process(dados) + self._compressor.flush()
+
+    def finaliza(self, dados: bytes = b"") -> bytes:
+        return self._compressor.process(dados) + self._compressor.finish()
+
+
+class CompressorZstd:
+    codificacao = "zstd"
+
+    def __init__(self, nivel: int = COMPRESSAO_NIVEL_ZSTD):
+        self._compressor = zstandard.ZstdCompressor(level=nivel).compressobj()
+
+    def comprime(self, dados: bytes) -> bytes:
+        return self._compressor.compress(dados) + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finaliza(self, dados: bytes = b"") -> bytes:
+        return self._compressor.compress(dados) + self._compressor.flush()
+
+
+def compressores_disponiveis() -> dict[str, type]:
+    """Compressores instalados, na ordem de preferência do servidor."""
+    compressores = {}
+    if zstandard is not None:
+        compressores["zstd"] = CompressorZstd
+    if brotli is not None:
+        compressores["br"] = CompressorBrotli
+    compressores["gzip"] = CompressorGzip
+    return compressores
+
+
+def escolhe_codificacao(accept_encoding: str, disponiveis: list[str]) -> str | None:
+    """
+    Escolhe a codificação de maior peso (q) aceita pelo cliente; em caso de empate, vale a ordem de `disponiveis`.
+
+    Args:
+        accept_encoding: Valor do cabeçalho Accept-Encoding
+        disponiveis: Codificações suportadas pelo servidor, em ordem de preferência
+
+    Returns:
+        str | None: Codificação escolhida, ou None para responder sem compressão
+    """
+    pesos = {}
+    for item in accept_encoding.split(","):
+        nome, _, parametros = item.strip().partition(";")
+        peso = 1.0
+        parametro, _, valor = parametros.strip().partition("=")
+        if parametro.strip() == "q":
+            try:
+                peso = float(valor)
+            except ValueError:
+                peso = 0.0
+        if nome:
+            pesos[nome.strip().lower()] = peso
+
+    candidatas = [(pesos.get(nome, pesos.get("*", 0.0)), -ordem, nome) for ordem, nome in enumerate(disponiveis)]
+    peso, _, nome = max(candidatas, default=(0.0, 0, None))
+    return nome if peso > 0 else None
+
+
+def eh_compressivel(cabecalhos: Headers) -> bool:
+    if "content-encoding" in cabecalhos:
+        return False
+    tipo = cabecalhos.get("content-type", "")
+    return tipo.startswith(TIPOS_COMPRESSIVEIS) or "+json" in tipo or "+xml" in tipo
+
+
+class CompressaoMiddleware:
+    def __init__(self, app, tamanho_minimo: int = COMPRESSAO_TAMANHO_MINIMO, compressores: dict[str, type] | None = None):
+        self.app = app
+        self.tamanho_minimo = tamanho_minimo
+        self.compressores = compressores if compressores is not None else compressores_disponiveis()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        codificacao = escolhe_codificacao(Headers(scope=scope).get("accept-encoding", ""), list(self.compressores))
+        if codificacao is None:
+            await self.app(scope, receive, send)
+            return
+
+        inicio = {}
+        compressor = None
+        decidido = False
+
+        async def send_comprimido(message):
+            nonlocal compressor, decidido
+            if message["type"] == "http.response.start":
+                inicio.update(message)
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            corpo = message.get("body", b"")
+            continua = message.get("more_body", False)
+            if not decidido:
+                decidido = True
+                cabecalhos = MutableHeaders(raw=list(inicio.get("headers", [])))
+                cabecalhos.add_vary_header("Accept-Encoding")
+                inicio["headers"] = cabecalhos.raw
+                if not eh_compressivel(cabecalhos) or (not continua and len(corpo) < self.tamanho_minimo):
+                    await send(inicio)
+                    await send(message)
+                    return
+
+                compressor = self.compressores[codificacao]()
+                cabecalhos["Content-Encoding"] = codificacao
+                if continua:
+                    # Streaming: o tamanho final não é conhecido
+                    del cabecalhos["Content-Length"]
+                    corpo = compressor.comprime(corpo)
+                else:
+                    corpo = compressor.finaliza(corpo)
+                    cabecalhos["Content-Length"] = str(len(corpo))
+                inicio["headers"] = cabecalhos.raw
+                await send(inicio)
+                await send({"type": "http.response.body", "body": corpo, "more_body": continua})
+                return
+
+            if compressor is None:
+                await send(message)
+                return
+            corpo = compressor.comprime(corpo) if continua else compressor.finaliza(corpo)
+            await send({"type": "http.response.body", "body": corpo, "more_body": continua})
+
+        await self.app(scope, receive, send_comprimido)
@@ -1,15 +1,142 @@
 # contas_a_pagar_e_receber/database.py
+#
+# As engines não são criadas na importação: `configura_banco` é chamado no lifespan da aplicação
+# (ver `main.create_app`). Fora da aplicação (scripts de linha de comando), a primeira sessão
+# aberta cria a engine com a DATABASE_URL do config.
+#
+# Com uma URL SQLite, as escritas passam por uma engine com uma única conexão (um escritor por vez,
+# sem disputa pelo lock do arquivo) e as leituras usam uma segunda engine, com pool, configurada
+# como réplica de leitura. Em WAL, leitores não esperam o escritor.
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, make_url
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.orm import sessionmaker
-from config import DATABASE_URL
+from config import DATABASE_URL, DATABASE_READ_URL, DATABASE_ECHO, DATABASE_POOL_SIZE, DATABASE_MAX_OVERFLOW, \
+    DATABASE_SQLITE_ESCRITOR_UNICO, DATABASE_SQLITE_BUSY_TIMEOUT_MS, DATABASE_SQLITE_CACHE_KIB, \
+    DATABASE_SQLITE_MMAP_BYTES
+
+_engine: Engine | None = None
+_read_engine: Engine | None = None
+
+
+class FabricaDeSessoes(sessionmaker):
+    """sessionmaker que cria a engine padrão na primeira sessão, caso nenhuma tenha sido configurada."""
+
+    def __call__(self, **local_kw):
+        if self.kw.get("bind") is None and "bind" not in local_kw:
+            obtem_engine()
+        return super().__call__(**local_kw)
 
-# Cria a engine para conexão com o banco
-engine = create_engine(DATABASE_URL, echo=True)
 
 # Cria a fábrica de sessões
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = FabricaDeSessoes(autocommit=False, autoflush=False)
+
+# Fábrica de sessões da réplica de leitura, associada a uma engine só quando a réplica é configurada
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False)
+
+
+PRAGMAS_SQLITE = (
+    "PRAGMA journal_mode=WAL",
+    # Em WAL, NORMAL só sincroniza no checkpoint: não corrompe o banco, e um commit pode ser perdido
+    # apenas em queda de energia/sistema operacional
+    "PRAGMA synchronous=NORMAL",
+    f"PRAGMA busy_timeout={DATABASE_SQLITE_BUSY_TIMEOUT_MS}",
+    f"PRAGMA cache_size=-{DATABASE_SQLITE_CACHE_KIB}",
+    f"PRAGMA mmap_size={DATABASE_SQLITE_MMAP_BYTES}",
+    "PRAGMA temp_store=MEMORY",
+)
+
+
+def aplica_pragmas_sqlite(conexao_dbapi, _registro_de_conexao) -> None:
+    cursor = conexao_dbapi.cursor()
+    for pragma in PRAGMAS_SQLITE:
+        cursor.execute(pragma)
+    cursor.close()
+
+
+def _cria_engine(url: str, **opcoes) -> Engine:
+    if not url.startswith("sqlite"):
+        return create_engine(url, **opcoes)
+
+    # As rotas síncronas rodam no threadpool, fora da thread que abriu a conexão
+    opcoes.setdefault("connect_args", {"check_same_thread": False})
+    engine = create_engine(url, **opcoes)
+    if DATABASE_SQLITE_ESCRITOR_UNICO:
+        event.listen(engine, "connect", aplica_pragmas_sqlite)
+    return engine
+
+
+def _eh_sqlite_em_arquivo(url: str) -> bool:
+    # Bancos em memória existem só dentro de uma conexão: não dá para separar escritor e leitores
+    url = make_url(url)
+    return url.get_backend_name() == "sqlite" and url.database not in (None, "", ":memory:") \
+        and url.query.get("mode") != "memory"
+
+
+def configura_banco(
+        database_url: str = DATABASE_URL,
+        database_read_url: str | None = DATABASE_READ_URL,
+        echo: bool = DATABASE_ECHO,
+        pool_size: int | None = DATABASE_POOL_SIZE,
+        max_overflow: int | None = DATABASE_MAX_OVERFLOW,
+) -> Engine:
+    """
+    Cria as engines (sem abrir conexões) e associa as fábricas de sessões a elas.
+
+    Args:
+        database_url: URL do banco principal
+        database_read_url: URL da réplica de leitura, se houver
+        echo: Registra no log cada comando SQL executado
+        pool_size: Conexões mantidas no pool de cada engine (None = padrão do SQLAlchemy); no SQLite,
+            só o pool de leitura, já que as escritas usam uma única conexão
+        max_overflow: Conexões extras abertas sob demanda além do pool (None = padrão do SQLAlchemy)
+
+    Returns:
+        Engine: Engine do banco principal
+    """
+    global _engine, _read_engine
+    descarta_banco()
+    opcoes_do_pool = {
+        nome: valor for nome, valor in (("pool_size", pool_size), ("max_overflow", max_overflow)) if valor is not None
+    }
+    if _eh_sqlite_em_arquivo(database_url) and DATABASE_SQLITE_ESCRITOR_UNICO and not database_read_url:
+        _engine = _cria_engine(database_url, echo=echo, pool_size=1, max_overflow=0)
+        SessionLocal.configure(bind=_engine)
+        _read_engine = _cria_engine(database_url, echo=echo, **opcoes_do_pool)
+        ReadSessionLocal.configure(bind=_read_engine)
+        return _engine
+
+    _engine = _cria_engine(database_url, echo=echo, **opcoes_do_pool)
+    SessionLocal.configure(bind=_engine)
+    if database_read_url:
+        _read_engine = _cria_engine(database_read_url, **opcoes_do_pool)
+        ReadSessionLocal.configure(bind=_read_engine)
+    return _engine
+
+
+def obtem_engine() -> Engine:
+    """Engine do banco principal, criada com as configurações padrão se ainda não existir."""
+    if _engine is None:
+        configura_banco()
+    return _engine
+
+
+def obtem_fabrica_de_leitura() -> sessionmaker | None:
+    """Fábrica de sessões da réplica, ou None quando não há réplica configurada."""
+    return ReadSessionLocal if _read_engine is not None else None
+
+
+def descarta_banco() -> None:
+    """Fecha as conexões do pool e desfaz a configuração das engines."""
+    global _engine, _read_engine
+    for engine in (_engine, _read_engine):
+        if engine is not None:
+            engine.dispose()
+    _engine = _read_engine = None
+    SessionLocal.configure(bind=None)
+    ReadSessionLocal.configure(bind=None)
+
 
 # Cria a classe base para os modelos
 Base = declarative_base()
@@ -1,4 +1,9 @@
+from contextlib import contextmanager
+
+from fastapi import FastAPI, Request
+
 from shared.database import SessionLocal
+from shared.replica import roteador_de_leitura
 
 # Dependency
 def get_db():
@@ -6,4 +11,49 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+def get_read_db(request: Request):
+    """
+    Sessão para rotas somente leitura: usa a réplica quando configurada e saudável e o cliente não
+    escreveu há pouco; caso contrário, usa o mesmo `get_db` das escritas.
+    """
+    if not roteador_de_leitura.usa_replica(request.cookies):
+        yield from request.app.dependency_overrides.get(get_db, get_db)()
+        return
+
+    db = roteador_de_leitura.fabrica_de_sessoes()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@contextmanager
+def sessao_avulsa(app: FastAPI):
+    """
+    Abre uma sessão fora do ciclo de uma requisição (ex.: tarefas em segundo plano).
+
+    Usa o mesmo `get_db` das rotas, inclusive quando ele é substituído em `app.dependency_overrides`.
+    """
+    gerador = app.dependency_overrides.get(get_db, get_db)()
+    try:
+        yield next(gerador)
+    finally:
+        gerador.close()
+
+
+@contextmanager
+def sessao_de_leitura_avulsa(app: FastAPI):
+    """
+    Como `sessao_avulsa`, mas para trabalhos somente leitura e demorados (ex.: exportações): usa a
+    réplica quando disponível, sem ocupar o banco principal (no SQLite, a conexão única de escrita).
+    """
+    if not roteador_de_leitura.usa_replica({}):
+        with sessao_avulsa(app) as sessao:
+            yield sessao
+        return
+
+    with roteador_de_leitura.fabrica_de_sessoes() as sessao:
+        yield sessao
@@ -0,0 +1,73 @@
+# shared/dinheiro.py
+#
+# Valores monetários gravados como inteiros de centavos (BIGINT). No Python continuam sendo Decimal
+# em reais; no banco, somas e comparações são feitas sobre inteiros nativos, sem aritmética de
+# NUMERIC de precisão arbitrária e sem arredondamento de ponto flutuante.
+
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Annotated
+
+from pydantic import PlainSerializer
+from sqlalchemy import BigInteger, Integer
+from sqlalchemy.sql import operators
+from sqlalchemy.types import TypeDecorator
+
+from config import VALORES_COMO_TEXTO
+
+CENTAVO = Decimal("0.01")
+MAXIMO_DE_CENTAVOS = 2 ** 63 - 1
+# Maior valor aceito nas requisições: metade do BIGINT, para que `valor_baixada + nova baixa` e a soma
+# de duas contas ainda caibam em centavos
+VALOR_MAXIMO = Decimal(MAXIMO_DE_CENTAVOS // 2).scaleb(-2)
+
+
+def para_centavos(valor) -> int:
+    """Reais (Decimal, int, float ou str) em centavos; frações de centavo são arredondadas como no round() do Postgres."""
+    return int(Decimal(str(valor)).quantize(CENTAVO, rounding=ROUND_HALF_UP).scaleb(2))
+
+
+def de_centavos(centavos) -> Decimal:
+    return Decimal(int(centavos)).scaleb(-2)
+
+
+def serializa_valor(valor: Decimal) -> float | str:
+    """Número JSON, como sempre foi, ou texto exato com duas casas (`"100.10"`) com VALORES_COMO_TEXTO."""
+    if VALORES_COMO_TEXTO:
+        return str(Decimal(valor).quantize(CENTAVO, rounding=ROUND_HALF_UP))
+    return float(valor)
+
+
+# Campo de valor das respostas da API
+Valor = Annotated[Decimal, PlainSerializer(serializa_valor, return_type=float | str, when_used="json")]
+
+
+class Centavos(TypeDecorator):
+    """
+    Coluna de valor em reais armazenada em centavos. Comparações com literais (`valor <= :x`) convertem
+    o literal para centavos, e somas, subtrações e produtos por inteiro continuam sendo `Centavos`,
+    então os resultados de `sum(valor - valor_baixada)` voltam em reais.
+    """
+    impl = BigInteger
+    cache_ok = True
+
+    class Comparator(TypeDecorator.Comparator):
+        def _adapt_expression(self, op, other_comparator):
+            if op in (operators.add, operators.sub) or (
+                    op is operators.mul and isinstance(other_comparator.type, Integer)
+            ):
+                return op, self.type
+            return super()._adapt_expression(op, other_comparator)
+
+    comparator_factory = Comparator
+
+    def coerce_compared_value(self, op, value):
+        # Em `valor * 2` o 2 é um fator, não um valor em reais
+        if op is operators.mul and isinstance(value, int):
+            return Integer()
+        return self
+
+    def process_bind_param(self, value, dialect):
+        return None if value is None else para_centavos(value)
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else de_centavos(value)
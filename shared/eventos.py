@@ -0,0 +1,259 @@
+# shared/eventos.py
+#
+# Hub de eventos para as notificações em tempo real (SSE). As rotas publicam o evento na sessão da
+# requisição, antes do commit, e ele só é entregue se a transação for confirmada; cada assinante (uma
+# conexão SSE) tem uma fila própria e limitada, e um assinante lento não atrasa os demais: quando a
+# fila enche, ele é desconectado (ou perde os eventos mais antigos, conforme a política) e deve
+# ressincronizar pelo feed de alterações.
+#
+# A distribuição passa por um backend plugável: o local entrega só aos assinantes deste processo; o do
+# Postgres (LISTEN/NOTIFY) entrega aos assinantes de todos os workers.
+
+import asyncio
+import json
+import logging
+import select
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+from config import EVENTOS_TAMANHO_DA_FILA, EVENTOS_POLITICA_DE_FILA_CHEIA
+
+logger = logging.getLogger(__name__)
+
+POLITICA_DESCONECTAR = "desconectar"
+POLITICA_DESCARTAR = "descartar"
+
+
+@dataclass(frozen=True)
+class Evento:
+    tipo: str
+    dados: dict[str, Any]
+
+    def formata_sse(self) -> bytes:
+        return f"event: {self.tipo}\ndata: {json.dumps(self.dados, default=str)}\n\n".encode()
+
+    def para_json(self) -> str:
+        return json.dumps({"tipo": self.tipo, "dados": self.dados}, default=str)
+
+    @classmethod
+    def de_json(cls, conteudo: str) -> "Evento":
+        evento = json.loads(conteudo)
+        return cls(evento["tipo"], evento["dados"])
+
+
+class Assinatura:
+    """Fila de eventos de um assinante. Deve ser criada e consumida no event loop da conexão."""
+
+    def __init__(self, hub: "HubDeEventos", tamanho_da_fila: int, politica: str):
+        self._hub = hub
+        self._loop = asyncio.get_running_loop()
+        self._fila: asyncio.Queue[Evento | None] = asyncio.Queue(maxsize=tamanho_da_fila)
+        self.politica = politica
+        self.descartados = 0
+        self.desconectada = False
+
+    def agenda_entrega(self, evento: Evento) -> None:
+        """Pode ser chamado de qualquer thread."""
+        self._loop.call_soon_threadsafe(self._entrega, evento)
+
+    def _entrega(self, evento: Evento) -> None:
+        if self.desconectada:
+            return
+        if self._fila.full():
+            if self.politica == POLITICA_DESCARTAR:
+                self._fila.get_nowait()
+                self.descartados += 1
+            else:
+                # Esvazia a fila e deixa só o aviso de desconexão para o consumidor
+                while not self._fila.empty():
+                    self._fila.get_nowait()
+                self._fila.put_nowait(None)
+                self.desconectada = True
+                self._hub.cancela(self)
+                return
+        self._fila.put_nowait(evento)
+
+    async def proximo(self, timeout: float | None = None) -> Evento | None:
+        """
+        Próximo evento; None quando a assinatura foi desconectada por não acompanhar o ritmo.
+
+        Raises:
+            TimeoutError: Se nenhum evento chegar dentro do `timeout`
+        """
+        return await asyncio.wait_for(self._fila.get(), timeout)
+
+    def cancela(self) -> None:
+        self._hub.cancela(self)
+
+
+def _entrega_apos_commit(sessao: Session) -> None:
+    pendentes = list(sessao.info["eventos_apos_commit"])
+    sessao.info["eventos_apos_commit"].clear()
+    for entrega in pendentes:
+        try:
+            entrega()
+        except Exception:
+            logger.exception("Falha ao entregar evento após o commit")
+
+
+def _descarta_apos_rollback(sessao: Session) -> None:
+    sessao.info["eventos_apos_commit"].clear()
+
+
+def executa_apos_commit(sessao: Session, funcao: Callable[[], None]) -> None:
+    """Agenda `funcao` para depois do próximo commit da sessão; um rollback a descarta."""
+    if "eventos_apos_commit" not in sessao.info:
+        sessao.info["eventos_apos_commit"] = []
+        event.listen(sessao, "after_commit", _entrega_apos_commit)
+        event.listen(sessao, "after_rollback", _descarta_apos_rollback)
+    sessao.info["eventos_apos_commit"].append(funcao)
+
+
+class BackendLocal:
+    """Entrega os eventos só aos assinantes deste processo."""
+
+    def conecta(self, distribui: Callable[[Evento], None]) -> None:
+        self._distribui = distribui
+
+    def publica(self, evento: Evento) -> None:
+        self._distribui(evento)
+
+    def publica_na_transacao(self, evento: Evento, sessao: Session) -> None:
+        executa_apos_commit(sessao, lambda: self._distribui(evento))
+
+    def encerra(self) -> None:
+        pass
+
+
+class BackendPostgresNotify:
+    """
+    Distribui os eventos entre os workers pelo LISTEN/NOTIFY do Postgres (driver psycopg2). Cada worker
+    mantém uma conexão escutando o canal, numa thread própria, e entrega o que chega ao hub local.
+    Essa conexão fica fora do pool da aplicação, para não ocupar uma das vagas reservadas às requisições.
+    """
+
+    canal = "eventos_contas"
+
+    def __init__(self, engine: Engine, intervalo_segundos: float = 1.0):
+        self._engine_de_escuta = create_engine(engine.url, poolclass=NullPool)
+        self.intervalo_segundos = intervalo_segundos
+        self._parar = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def conecta(self, distribui: Callable[[Evento], None]) -> None:
+        self._distribui = distribui
+        self._parar.clear()
+        self._thread = threading.Thread(target=self._escuta, name="eventos-listen", daemon=True)
+        self._thread.start()
+
+    def _escuta(self) -> None:
+        conexao = self._engine_de_escuta.raw_connection()
+        try:
+            dbapi = conexao.driver_connection
+            dbapi.autocommit = True
+            with dbapi.cursor() as cursor:
+                cursor.execute(f"LISTEN {self.canal}")
+            while not self._parar.is_set():
+                if select.select([dbapi], [], [], self.intervalo_segundos) == ([], [], []):
+                    continue
+                dbapi.poll()
+                while dbapi.notifies:
+                    notificacao = dbapi.notifies.pop(0)
+                    try:
+                        self._distribui(Evento.de_json(notificacao.payload))
+                    except Exception:
+                        logger.exception("Evento inválido recebido no canal %s", self.canal)
+        finally:
+            conexao.close()
+
+    def publica(self, evento: Evento) -> None:
+        """Fora de uma transação: conexão avulsa, fora do pool das requisições."""
+        with self._engine_de_escuta.connect() as conexao:
+            conexao.execute(
+                text("SELECT pg_notify(:canal, :conteudo)"), {"canal": self.canal, "conteudo": evento.para_json()}
+            )
+            conexao.commit()
+
+    def publica_na_transacao(self, evento: Evento, sessao: Session) -> None:
+        """
+        NOTIFY na própria conexão da requisição: o Postgres só entrega no commit e descarta no rollback,
+        e a requisição não precisa de uma segunda conexão do pool.
+        """
+        sessao.execute(
+            text("SELECT pg_notify(:canal, :conteudo)"), {"canal": self.canal, "conteudo": evento.para_json()}
+        )
+
+    def encerra(self) -> None:
+        self._parar.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.intervalo_segundos * 2)
+        self._engine_de_escuta.dispose()
+
+
+class HubDeEventos:
+    def __init__(
+            self,
+            backend=None,
+            tamanho_da_fila: int = EVENTOS_TAMANHO_DA_FILA,
+            politica: str = EVENTOS_POLITICA_DE_FILA_CHEIA,
+    ):
+        self.tamanho_da_fila = tamanho_da_fila
+        self.politica = politica
+        self._assinaturas: set[Assinatura] = set()
+        self._trava = threading.Lock()
+        self.backend = None
+        self.usa_backend(backend or BackendLocal())
+
+    def usa_backend(self, backend) -> None:
+        if self.backend is not None:
+            self.backend.encerra()
+        self.backend = backend
+        backend.conecta(self.distribui)
+
+    def assina(self) -> Assinatura:
+        assinatura = Assinatura(self, self.tamanho_da_fila, self.politica)
+        with self._trava:
+            self._assinaturas.add(assinatura)
+        return assinatura
+
+    def cancela(self, assinatura: Assinatura) -> None:
+        with self._trava:
+            self._assinaturas.discard(assinatura)
+
+    @property
+    def quantidade_de_assinantes(self) -> int:
+        return len(self._assinaturas)
+
+    def publica(self, tipo: str, dados: dict[str, Any], sessao: Session | None = None) -> None:
+        """
+        Publica um evento. Com `sessao`, deve ser chamado antes do commit: o evento faz parte da transação
+        e só é entregue se ela for confirmada. Sem sessão, é entregue na hora, e uma falha aqui não falha
+        quem publicou.
+        """
+        evento = Evento(tipo, dados)
+        if sessao is not None:
+            self.backend.publica_na_transacao(evento, sessao)
+            return
+        try:
+            self.backend.publica(evento)
+        except Exception:
+            logger.exception("Falha ao publicar o evento %s", tipo)
+
+    def distribui(self, evento: Evento) -> None:
+        with self._trava:
+            assinaturas = list(self._assinaturas)
+        for assinatura in assinaturas:
+            try:
+                assinatura.agenda_entrega(evento)
+            except RuntimeError:
+                # Event loop da conexão já encerrado
+                self.cancela(assinatura)
+
+
+hub_de_eventos = HubDeEventos()
@@ -0,0 +1,246 @@
+# shared/idempotencia.py
+#
+# Suporte ao cabeçalho Idempotency-Key nos POSTs. A primeira requisição com uma chave reserva a
+# chave no banco, é executada normalmente e tem a resposta gravada. Repetições com a mesma chave
+# recebem a resposta gravada sem passar pela rota (sem validação, sem insert); repetições que
+# chegam enquanto a primeira ainda executa aguardam o resultado dela. O corpo é lido uma vez, com o hash
+# calculado aos poucos, e guardado num arquivo temporário quando passa de CORPO_EM_MEMORIA_BYTES (ex.:
+# importação de CSV), para ser entregue à rota depois da reserva da chave.
+
+import asyncio
+import hashlib
+import json
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import Boolean, Column, DateTime, Integer, LargeBinary, String, Text
+from sqlalchemy.exc import IntegrityError
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse
+
+from config import IDEMPOTENCIA_TTL_SEGUNDOS, IDEMPOTENCIA_ESPERA_SEGUNDOS
+from shared.database import Base
+from shared.dependencies import sessao_avulsa
+
+CABECALHO_IDEMPOTENCIA = b"idempotency-key"
+INTERVALO_DE_ESPERA_SEGUNDOS = 0.05
+INTERVALO_DE_LIMPEZA_SEGUNDOS = 60
+CORPO_EM_MEMORIA_BYTES = 1024 * 1024
+TAMANHO_DO_PEDACO = 64 * 1024
+
+
+class ChaveIdempotenciaModel(Base):
+    __tablename__ = 'chave_idempotencia'
+    chave = Column(String(255), primary_key=True)
+    impressao_digital = Column(String(64), nullable=False)
+    concluida = Column(Boolean(), nullable=False, default=False)
+    status_code = Column(Integer, nullable=True)
+    cabecalhos = Column(Text, nullable=True)
+    corpo = Column(LargeBinary, nullable=True)
+    expira_em = Column(DateTime, nullable=False, index=True)
+
+
+def impressao_digital_da_requisicao(scope, corpo: bytes) -> str:
+    """Identifica a requisição pelo método, caminho (sem a barra final), query string e corpo."""
+    return _impressao_digital(scope, hashlib.sha256(corpo).hexdigest())
+
+
+def _impressao_digital(scope, hash_do_corpo: str) -> str:
+    digest = hashlib.sha256()
+    for parte in (
+            scope["method"].encode(), scope["path"].rstrip("/").encode(), scope.get("query_string", b""),
+            hash_do_corpo.encode(),
+    ):
+        digest.update(parte)
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class IdempotenciaMiddleware:
+    def __init__(
+            self,
+            app,
+            ttl_segundos: float = IDEMPOTENCIA_TTL_SEGUNDOS,
+            espera_segundos: float = IDEMPOTENCIA_ESPERA_SEGUNDOS,
+    ):
+        self.app = app
+        self.ttl_segundos = ttl_segundos
+        self.espera_segundos = espera_segundos
+        self._ultima_limpeza = 0.0
+
+    async def __call__(self, scope, receive, send):
+        chave = None
+        if scope["type"] == "http" and scope["method"] == "POST":
+            chave = dict(scope["headers"]).get(CABECALHO_IDEMPOTENCIA)
+        if not chave:
+            await self.app(scope, receive, send)
+            return
+
+        chave = chave.decode("latin-1")
+        corpo, hash_do_corpo, em_disco = await self._le_corpo(receive)
+        with corpo:
+            impressao = _impressao_digital(scope, hash_do_corpo)
+            await self._atende(scope, receive, chave, impressao, corpo, em_disco, send)
+
+    async def _atende(self, scope, receive, chave: str, impressao: str, corpo, em_disco: bool, send) -> None:
+        aplicacao = scope["app"]
+
+        limite = time.monotonic() + self.espera_segundos
+        while True:
+            registro = await run_in_threadpool(self._reserva, aplicacao, chave, impressao)
+            if registro is None:
+                break
+            if registro.impressao_digital != impressao:
+                resposta = JSONResponse(
+                    status_code=422,
+                    content={"detail": "Idempotency-Key já utilizada em uma requisição diferente"},
+                )
+                await resposta(scope, receive, send)
+                return
+            if registro.concluida:
+                await self._repete_resposta(registro, send)
+                return
+            if time.monotonic() >= limite:
+                resposta = JSONResponse(
+                    status_code=409,
+                    content={"detail": "Requisição com esta Idempotency-Key ainda em processamento"},
+                    headers={"Retry-After": "1"},
+                )
+                await resposta(scope, receive, send)
+                return
+            await asyncio.sleep(INTERVALO_DE_ESPERA_SEGUNDOS)
+
+        await self._executa_e_grava(aplicacao, chave, scope, corpo, em_disco, send)
+
+    @staticmethod
+    async def _le_corpo(receive) -> tuple[tempfile.SpooledTemporaryFile, str, bool]:
+        """
+        Lê o corpo inteiro, devolvendo-o (em memória ou em disco, conforme o tamanho), o seu hash e se
+        foi para o disco. O arquivo passa para o disco quando o tamanho escrito excede o `max_size`.
+        """
+        corpo = tempfile.SpooledTemporaryFile(max_size=CORPO_EM_MEMORIA_BYTES)
+        digest = hashlib.sha256()
+        tamanho = 0
+        while True:
+            message = await receive()
+            pedaco = message.get("body", b"")
+            digest.update(pedaco)
+            tamanho += len(pedaco)
+            if tamanho > CORPO_EM_MEMORIA_BYTES:
+                await run_in_threadpool(corpo.write, pedaco)
+            else:
+                corpo.write(pedaco)
+            if not message.get("more_body", False):
+                corpo.seek(0)
+                return corpo, digest.hexdigest(), tamanho > CORPO_EM_MEMORIA_BYTES
+
+    def _reserva(self, aplicacao, chave: str, impressao: str) -> ChaveIdempotenciaModel | None:
+        """
+        Tenta reservar a chave para esta requisição. Devolve None se conseguiu; caso contrário,
+        devolve o registro existente (concluído ou ainda em processamento).
+        """
+        agora = datetime.now()
+        with sessao_avulsa(aplicacao) as sessao:
+            if time.monotonic() - self._ultima_limpeza > INTERVALO_DE_LIMPEZA_SEGUNDOS:
+                sessao.query(ChaveIdempotenciaModel).filter(ChaveIdempotenciaModel.expira_em < agora).delete()
+                sessao.commit()
+                self._ultima_limpeza = time.monotonic()
+
+            # A chave pode ser liberada ou expirar entre o insert recusado e a leitura; nesse caso
+            # tenta reservar de novo, até conseguir ou encontrar o registro de outra requisição
+            while True:
+                sessao.add(ChaveIdempotenciaModel(
+                    chave=chave,
+                    impressao_digital=impressao,
+                    concluida=False,
+                    expira_em=agora + timedelta(seconds=self.ttl_segundos),
+                ))
+                try:
+                    sessao.commit()
+                    return None
+                except IntegrityError:
+                    sessao.rollback()
+
+                registro = sessao.get(ChaveIdempotenciaModel, chave)
+                if registro is None:
+                    continue
+                if registro.expira_em < agora:
+                    sessao.delete(registro)
+                    sessao.commit()
+                    continue
+                sessao.expunge(registro)
+                return registro
+
+    @staticmethod
+    def _conclui(aplicacao, chave: str, status_code: int, cabecalhos: list, corpo: bytes) -> None:
+        with sessao_avulsa(aplicacao) as sessao:
+            registro = sessao.get(ChaveIdempotenciaModel, chave)
+            if registro is None:
+                # A reserva expirou e foi removida durante a execução; a resposta já foi entregue
+                return
+            registro.concluida = True
+            registro.status_code = status_code
+            registro.cabecalhos = json.dumps(cabecalhos)
+            registro.corpo = corpo
+            sessao.commit()
+
+    @staticmethod
+    def _libera(aplicacao, chave: str) -> None:
+        """Remove a reserva de uma requisição que falhou, para que uma nova tentativa seja executada."""
+        with sessao_avulsa(aplicacao) as sessao:
+            sessao.query(ChaveIdempotenciaModel).filter(ChaveIdempotenciaModel.chave == chave).delete()
+            sessao.commit()
+
+    async def _executa_e_grava(self, aplicacao, chave: str, scope, corpo, em_disco: bool, send) -> None:
+        entregue = False
+
+        async def receive():
+            nonlocal entregue
+            if entregue:
+                # Corpo já entregue: a partir daqui só resta aguardar a desconexão
+                await asyncio.Event().wait()
+            pedaco = await run_in_threadpool(corpo.read, TAMANHO_DO_PEDACO) if em_disco \
+                else corpo.read(TAMANHO_DO_PEDACO)
+            entregue = len(pedaco) < TAMANHO_DO_PEDACO
+            return {"type": "http.request", "body": pedaco, "more_body": not entregue}
+
+        inicio = {}
+        partes = []
+
+        async def send_e_guarda(message):
+            if message["type"] == "http.response.start":
+                inicio.update(message)
+            elif message["type"] == "http.response.body":
+                partes.append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_e_guarda)
+        except BaseException:
+            await run_in_threadpool(self._libera, aplicacao, chave)
+            raise
+
+        # Redirecionamentos (ex.: barra final) são seguidos pelo cliente com a mesma chave em outro caminho;
+        # erros do servidor podem ser tentados novamente. Em ambos os casos a chave é liberada.
+        status_code = inicio.get("status", 500)
+        if status_code >= 500 or 300 <= status_code < 400:
+            await run_in_threadpool(self._libera, aplicacao, chave)
+            return
+
+        cabecalhos = [
+            [nome.decode("latin-1"), valor.decode("latin-1")]
+            for nome, valor in inicio.get("headers", [])
+            if nome.lower() in (b"content-type", b"location")
+        ]
+        await run_in_threadpool(self._conclui, aplicacao, chave, status_code, cabecalhos, b"".join(partes))
+
+    @staticmethod
+    async def _repete_resposta(registro: ChaveIdempotenciaModel, send) -> None:
+        cabecalhos = [(nome.encode("latin-1"), valor.encode("latin-1")) for nome, valor in json.loads(registro.cabecalhos)]
+        cabecalhos += [
+            (b"content-length", str(len(registro.corpo)).encode()),
+            (b"idempotent-replayed", b"true"),
+        ]
+        await send({"type": "http.response.start", "status": registro.status_code, "headers": cabecalhos})
+        await send({"type": "http.response.body", "body": registro.corpo})
@@ -0,0 +1,76 @@
+# shared/particionamento.py
+#
+# Partições anuais (PARTITION BY RANGE) de tabelas particionadas no Postgres. A tabela particionada
+# é criada pela migração; aqui só são criadas as partições dos anos que ainda não existem. Em bancos
+# sem particionamento (ex.: SQLite nos testes) ou com a tabela ainda não particionada, nada é feito.
+
+import threading
+from datetime import date
+from typing import Iterable
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+from config import PARTICOES_ANOS_A_FRENTE
+
+# Espera máxima pelo lock da tabela ao criar uma partição. A DDL pede ACCESS EXCLUSIVE: sem limite, ela
+# ficaria na fila atrás de qualquer transação aberta na tabela, e todas as consultas seguintes atrás dela.
+LOCK_TIMEOUT_DA_PARTICAO = "5s"
+
+
+class ParticionamentoPorAno:
+    def __init__(self, tabela: str, coluna: str, anos_a_frente: int = PARTICOES_ANOS_A_FRENTE):
+        self.tabela = tabela
+        self.coluna = coluna
+        self.anos_a_frente = anos_a_frente
+        self._anos_garantidos: set[int] = set()
+        self._trava = threading.Lock()
+
+    def nome_da_particao(self, ano: int) -> str:
+        return f"{self.tabela}_{ano}"
+
+    def ddl_da_particao(self, ano: int) -> str:
+        return (
+            f"CREATE TABLE IF NOT EXISTS {self.nome_da_particao(ano)} PARTITION OF {self.tabela} "
+            f"FOR VALUES FROM ('{ano}-01-01') TO ('{ano + 1}-01-01')"
+        )
+
+    def esta_particionada(self, conexao: Connection) -> bool:
+        return conexao.execute(
+            text(
+                "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table p "
+                "JOIN pg_class c ON c.oid = p.partrelid WHERE c.relname = :tabela)"
+            ),
+            {"tabela": self.tabela},
+        ).scalar()
+
+    def cria_particoes(self, conexao: Connection, anos: Iterable[int]) -> None:
+        for ano in sorted(set(anos)):
+            conexao.execute(text(self.ddl_da_particao(ano)))
+
+    def garante_anos(self, engine: Engine, anos: Iterable[int]) -> None:
+        """
+        Cria as partições dos anos informados que ainda não existem, em uma transação própria
+        (fora da transação da requisição). Os anos já garantidos ficam em memória, então o custo
+        é só o da primeira conta de cada ano em cada processo.
+
+        Deve ser chamado antes de a sessão da requisição ler ou gravar a tabela: a transação aberta
+        dela seguraria um lock que a DDL, em outra conexão, esperaria até o LOCK_TIMEOUT_DA_PARTICAO.
+        """
+        faltantes = set(anos) - self._anos_garantidos
+        if not faltantes:
+            return
+
+        with self._trava:
+            faltantes -= self._anos_garantidos
+            if faltantes and engine.dialect.name == "postgresql":
+                with engine.begin() as conexao:
+                    conexao.execute(text(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT_DA_PARTICAO}'"))
+                    if self.esta_particionada(conexao):
+                        self.cria_particoes(conexao, faltantes)
+            self._anos_garantidos |= faltantes
+
+    def garante_anos_futuros(self, engine: Engine, hoje: date | None = None) -> None:
+        """Garante as partições do ano corrente e dos próximos `anos_a_frente` anos."""
+        ano_corrente = (hoje or date.today()).year
+        self.garante_anos(engine, range(ano_corrente, ano_corrente + self.anos_a_frente + 1))
@@ -0,0 +1,114 @@
+# shared/replica.py
+#
+# Roteamento das leituras para a réplica. A réplica só é usada quando está respondendo e com
+# atraso de replicação aceitável; além disso, um cliente que acabou de escrever continua lendo
+# do banco principal por alguns segundos (cookie), para enxergar as próprias escritas.
+
+import threading
+import time
+from typing import Callable
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session, sessionmaker
+
+from config import DATABASE_READ_MAX_LAG_SECONDS, REPLICA_INTERVALO_VERIFICACAO_SEGUNDOS, \
+    LEITURA_NA_PRIMARIA_APOS_ESCRITA_SEGUNDOS
+
+COOKIE_LEITURA_NA_PRIMARIA = "leitura_na_primaria_ate"
+METODOS_DE_ESCRITA = {"POST", "PUT", "PATCH", "DELETE"}
+
+
+def atraso_de_replicacao(sessao: Session) -> float:
+    """Atraso da réplica em segundos. Em bancos sem replicação (ex.: SQLite) é sempre zero."""
+    if sessao.get_bind().dialect.name != "postgresql":
+        sessao.execute(text("SELECT 1"))
+        return 0.0
+    return float(sessao.execute(text(
+        "SELECT CASE WHEN pg_is_in_recovery() "
+        "THEN COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) ELSE 0 END"
+    )).scalar())
+
+
+class MonitorDaReplica:
+    """Verifica a saúde e o atraso da réplica, reaproveitando o resultado por alguns segundos."""
+
+    def __init__(
+            self,
+            fabrica_de_sessoes: sessionmaker,
+            atraso_maximo_segundos: float = DATABASE_READ_MAX_LAG_SECONDS,
+            intervalo_segundos: float = REPLICA_INTERVALO_VERIFICACAO_SEGUNDOS,
+            mede_atraso: Callable[[Session], float] = atraso_de_replicacao,
+    ):
+        self.fabrica_de_sessoes = fabrica_de_sessoes
+        self.atraso_maximo_segundos = atraso_maximo_segundos
+        self.intervalo_segundos = intervalo_segundos
+        self.mede_atraso = mede_atraso
+        self._saudavel = False
+        self._verificado_em = 0.0
+        self._trava = threading.Lock()
+
+    def esta_saudavel(self) -> bool:
+        if time.monotonic() - self._verificado_em < self.intervalo_segundos:
+            return self._saudavel
+
+        with self._trava:
+            if time.monotonic() - self._verificado_em >= self.intervalo_segundos:
+                try:
+                    with self.fabrica_de_sessoes() as sessao:
+                        self._saudavel = self.mede_atraso(sessao) <= self.atraso_maximo_segundos
+                except Exception:
+                    self._saudavel = False
+                self._verificado_em = time.monotonic()
+        return self._saudavel
+
+
+def exige_leitura_na_primaria(cookies: dict[str, str]) -> bool:
+    """True enquanto o cookie de leitura após escrita estiver valendo para este cliente."""
+    try:
+        return float(cookies.get(COOKIE_LEITURA_NA_PRIMARIA, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+class RoteadorDeLeitura:
+    """Decide se uma leitura pode ir para a réplica."""
+
+    def __init__(self, fabrica_de_sessoes: sessionmaker | None = None, monitor: MonitorDaReplica | None = None):
+        self.configura(fabrica_de_sessoes, monitor)
+
+    def configura(self, fabrica_de_sessoes: sessionmaker | None, monitor: MonitorDaReplica | None = None) -> None:
+        self.fabrica_de_sessoes = fabrica_de_sessoes
+        if fabrica_de_sessoes is not None and monitor is None:
+            monitor = MonitorDaReplica(fabrica_de_sessoes)
+        self.monitor = monitor
+
+    def usa_replica(self, cookies: dict[str, str]) -> bool:
+        if self.fabrica_de_sessoes is None or exige_leitura_na_primaria(cookies):
+            return False
+        return self.monitor.esta_saudavel()
+
+
+# Configurado no lifespan da aplicação, quando há réplica (ver `main.create_app`)
+roteador_de_leitura = RoteadorDeLeitura()
+
+
+class LeituraNaPrimariaAposEscritaMiddleware:
+    """Marca com um cookie os clientes que escreveram, para que leiam do banco principal por alguns segundos."""
+
+    def __init__(self, app, segundos: float = LEITURA_NA_PRIMARIA_APOS_ESCRITA_SEGUNDOS):
+        self.app = app
+        self.segundos = segundos
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in METODOS_DE_ESCRITA or self.segundos <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_com_cookie(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                ate = time.time() + self.segundos
+                cookie = f"{COOKIE_LEITURA_NA_PRIMARIA}={ate:.3f}; Max-Age={int(self.segundos) + 1}; Path=/; HttpOnly"
+                message["headers"] = list(message.get("headers", [])) + [(b"set-cookie", cookie.encode("latin-1"))]
+            await send(message)
+
+        await self.app(scope, receive, send_com_cookie)
@@ -0,0 +1,299 @@
+# shared/tarefas.py
+#
+# Execução de relatórios e exportações pesadas fora da requisição. O cliente submete a tarefa,
+# recebe um ID, consulta o andamento e baixa o resultado depois. O resultado é gravado em
+# disco como JSON e removido quando expira; tarefas que o cliente parou de consultar são canceladas.
+#
+# A tarefa roda no worker que a recebeu, mas a situação dela também fica em disco, em
+# TAREFAS_DIRETORIO: qualquer worker do servidor consulta, baixa o resultado ou cancela a tarefa
+# (o cancelamento é um arquivo marcador que o worker dono verifica entre as etapas).
+
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Callable
+
+from fastapi.encoders import jsonable_encoder
+
+from config import TAREFAS_DIRETORIO, TAREFAS_EXECUCOES_SIMULTANEAS, TAREFAS_MAXIMO_NA_FILA, \
+    TAREFAS_TTL_SEGUNDOS, TAREFAS_ABANDONO_SEGUNDOS
+
+INTERVALO_DE_LIMPEZA_SEGUNDOS = 30
+# IDs gerados por uuid4().hex; qualquer outro valor nem chega a virar caminho de arquivo
+FORMATO_DO_ID = re.compile(r"[0-9a-f]{32}")
+
+
+class StatusTarefaEnum(str, Enum):
+    pendente = "pendente"
+    executando = "executando"
+    concluida = "concluida"
+    falhou = "falhou"
+    cancelada = "cancelada"
+
+
+STATUS_FINAIS = {StatusTarefaEnum.concluida, StatusTarefaEnum.falhou, StatusTarefaEnum.cancelada}
+
+
+class FilaDeTarefasCheia(Exception):
+    pass
+
+
+class TarefaCancelada(Exception):
+    pass
+
+
+@dataclass
+class Tarefa:
+    id: str
+    tipo: str
+    status: StatusTarefaEnum = StatusTarefaEnum.pendente
+    criada_em: float = field(default_factory=time.time)
+    concluida_em: float | None = None
+    ultimo_acesso: float = field(default_factory=time.time)
+    erro: str | None = None
+    cancelamento: threading.Event = field(default_factory=threading.Event, repr=False)
+    # Arquivo criado por outro worker para pedir o cancelamento
+    marcador_de_cancelamento: str | None = field(default=None, repr=False)
+
+    def cancelamento_pedido(self) -> bool:
+        if not self.cancelamento.is_set() and self.marcador_de_cancelamento \
+                and os.path.exists(self.marcador_de_cancelamento):
+            self.cancelamento.set()
+        return self.cancelamento.is_set()
+
+    def verifica_cancelamento(self) -> None:
+        """Chamado pelas tarefas longas entre etapas para interromper a execução quando cancelada."""
+        if self.cancelamento_pedido():
+            raise TarefaCancelada()
+
+
+def processo_ativo(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class GerenciadorDeTarefas:
+    """Executa tarefas em um pool limitado de threads e guarda os resultados em disco com prazo de validade."""
+
+    def __init__(
+            self,
+            diretorio: str = TAREFAS_DIRETORIO,
+            execucoes_simultaneas: int = TAREFAS_EXECUCOES_SIMULTANEAS,
+            maximo_na_fila: int = TAREFAS_MAXIMO_NA_FILA,
+            ttl_segundos: float = TAREFAS_TTL_SEGUNDOS,
+            abandono_segundos: float = TAREFAS_ABANDONO_SEGUNDOS,
+    ):
+        self.diretorio = diretorio
+        self.execucoes_simultaneas = execucoes_simultaneas
+        self.maximo_na_fila = maximo_na_fila
+        self.ttl_segundos = ttl_segundos
+        self.abandono_segundos = abandono_segundos
+        self.tarefas: dict[str, Tarefa] = {}
+        self._trava = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None
+        self._limpeza: threading.Thread | None = None
+
+    def _inicia(self) -> None:
+        if self._executor is None:
+            os.makedirs(self.diretorio, exist_ok=True)
+            self._executor = ThreadPoolExecutor(self.execucoes_simultaneas, thread_name_prefix="tarefa")
+            self._limpeza = threading.Thread(target=self._limpa_periodicamente, daemon=True)
+            self._limpeza.start()
+
+    def caminho_do_resultado(self, tarefa_id: str) -> str:
+        return os.path.join(self.diretorio, f"{tarefa_id}.json")
+
+    def _caminho(self, tarefa_id: str, tipo_de_arquivo: str) -> str:
+        """Arquivos compartilhados entre os workers: `tarefa` (situação), `acesso` e `cancelar` (marcadores)."""
+        return os.path.join(self.diretorio, f"{tarefa_id}.{tipo_de_arquivo}")
+
+    def _grava_situacao(self, tarefa: Tarefa) -> None:
+        caminho = self._caminho(tarefa.id, "tarefa")
+        temporario = f"{caminho}.{os.getpid()}.{threading.get_ident()}"
+        with open(temporario, "w", encoding="utf-8") as arquivo:
+            json.dump({
+                "id": tarefa.id, "tipo": tarefa.tipo, "status": tarefa.status.value, "criada_em": tarefa.criada_em,
+                "concluida_em": tarefa.concluida_em, "erro": tarefa.erro, "pid": os.getpid(),
+            }, arquivo)
+        os.replace(temporario, caminho)
+
+    def _le_situacao(self, tarefa_id: str) -> dict | None:
+        try:
+            with open(self._caminho(tarefa_id, "tarefa"), encoding="utf-8") as arquivo:
+                return json.load(arquivo)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _tarefa_de_outro_worker(self, tarefa_id: str) -> Tarefa | None:
+        situacao = self._le_situacao(tarefa_id)
+        if situacao is None:
+            return None
+        tarefa = Tarefa(
+            id=situacao["id"], tipo=situacao["tipo"], status=StatusTarefaEnum(situacao["status"]),
+            criada_em=situacao["criada_em"], concluida_em=situacao["concluida_em"], erro=situacao["erro"],
+        )
+        if tarefa.status not in STATUS_FINAIS and not processo_ativo(situacao["pid"]):
+            # O worker dono foi encerrado (reciclado ou reiniciado) com a tarefa em andamento
+            tarefa.status = StatusTarefaEnum.falhou
+            tarefa.erro = "A tarefa foi interrompida pelo encerramento do worker que a executava"
+            tarefa.concluida_em = os.path.getmtime(self._caminho(tarefa_id, "tarefa"))
+        return tarefa
+
+    def _remove_arquivos(self, tarefa_id: str) -> None:
+        for caminho in (
+                self.caminho_do_resultado(tarefa_id), self._caminho(tarefa_id, "tarefa"),
+                self._caminho(tarefa_id, "acesso"), self._caminho(tarefa_id, "cancelar"),
+        ):
+            if os.path.exists(caminho):
+                os.remove(caminho)
+
+    def submete(self, tipo: str, funcao: Callable[[Tarefa], Any]) -> Tarefa:
+        """
+        Agenda a execução de `funcao(tarefa)`. O retorno é gravado como JSON; se for um iterador
+        (ex.: gerador de linhas de uma exportação) é gravado como lista, item a item.
+
+        Raises:
+            FilaDeTarefasCheia: Se já houver o máximo de tarefas pendentes ou em execução
+        """
+        with self._trava:
+            self._inicia()
+            ativas = sum(1 for t in self.tarefas.values() if t.status not in STATUS_FINAIS)
+            if ativas >= self.maximo_na_fila:
+                raise FilaDeTarefasCheia()
+            tarefa = Tarefa(id=uuid.uuid4().hex, tipo=tipo)
+            tarefa.marcador_de_cancelamento = self._caminho(tarefa.id, "cancelar")
+            self.tarefas[tarefa.id] = tarefa
+            self._grava_situacao(tarefa)
+
+        self._executor.submit(self._executa, tarefa, funcao)
+        return tarefa
+
+    def consulta(self, tarefa_id: str) -> Tarefa | None:
+        """
+        Devolve a tarefa e registra o acesso, mantendo-a viva enquanto o cliente acompanha. Tarefas de
+        outros workers são lidas do disco; o acesso fica registrado no marcador `acesso`.
+        """
+        if not FORMATO_DO_ID.fullmatch(tarefa_id):
+            return None
+        tarefa = self.tarefas.get(tarefa_id)
+        if tarefa is not None:
+            tarefa.ultimo_acesso = time.time()
+            return tarefa
+
+        tarefa = self._tarefa_de_outro_worker(tarefa_id)
+        if tarefa is not None and tarefa.status not in STATUS_FINAIS:
+            with open(self._caminho(tarefa_id, "acesso"), "w"):
+                pass
+        return tarefa
+
+    def cancela(self, tarefa_id: str) -> Tarefa | None:
+        tarefa = self.tarefas.get(tarefa_id)
+        if tarefa is None:
+            # De outro worker: pede o cancelamento pelo marcador, verificado por ele entre as etapas
+            tarefa = self.consulta(tarefa_id)
+            if tarefa is not None and tarefa.status not in STATUS_FINAIS:
+                with open(self._caminho(tarefa_id, "cancelar"), "w"):
+                    pass
+            return tarefa
+
+        if tarefa.status not in STATUS_FINAIS:
+            tarefa.cancelamento.set()
+            if tarefa.status == StatusTarefaEnum.pendente:
+                self._finaliza(tarefa, StatusTarefaEnum.cancelada)
+        return tarefa
+
+    def _executa(self, tarefa: Tarefa, funcao: Callable[[Tarefa], Any]) -> None:
+        if tarefa.cancelamento_pedido():
+            if tarefa.status == StatusTarefaEnum.pendente:
+                self._finaliza(tarefa, StatusTarefaEnum.cancelada)
+            return
+        tarefa.status = StatusTarefaEnum.executando
+        self._grava_situacao(tarefa)
+        caminho = self.caminho_do_resultado(tarefa.id)
+        temporario = f"{caminho}.parcial"
+        try:
+            resultado = funcao(tarefa)
+            with open(temporario, "w", encoding="utf-8") as arquivo:
+                self._grava_json(arquivo, resultado, tarefa)
+            tarefa.verifica_cancelamento()
+            os.replace(temporario, caminho)
+            self._finaliza(tarefa, StatusTarefaEnum.concluida)
+        except TarefaCancelada:
+            self._finaliza(tarefa, StatusTarefaEnum.cancelada)
+        except Exception as e:
+            tarefa.erro = f"{e.__class__.__name__}: {e}"
+            self._finaliza(tarefa, StatusTarefaEnum.falhou)
+        finally:
+            if os.path.exists(temporario):
+                os.remove(temporario)
+
+    @staticmethod
+    def _grava_json(arquivo, resultado: Any, tarefa: Tarefa) -> None:
+        if not isinstance(resultado, Iterator):
+            json.dump(jsonable_encoder(resultado), arquivo)
+            return
+
+        arquivo.write("[")
+        for i, item in enumerate(resultado):
+            if i % 1000 == 0:
+                tarefa.verifica_cancelamento()
+            if i:
+                arquivo.write(",")
+            json.dump(jsonable_encoder(item), arquivo)
+        arquivo.write("]")
+
+    def _finaliza(self, tarefa: Tarefa, status: StatusTarefaEnum) -> None:
+        tarefa.status = status
+        tarefa.concluida_em = time.time()
+        self._grava_situacao(tarefa)
+
+    def _ultimo_acesso(self, tarefa: Tarefa) -> float:
+        """Acesso mais recente, por este worker ou por outro (marcador `acesso`)."""
+        try:
+            return max(tarefa.ultimo_acesso, os.path.getmtime(self._caminho(tarefa.id, "acesso")))
+        except FileNotFoundError:
+            return tarefa.ultimo_acesso
+
+    def limpa(self) -> None:
+        """
+        Cancela tarefas abandonadas e remove as finalizadas há mais tempo que o TTL, inclusive as de
+        workers já encerrados.
+        """
+        agora = time.time()
+        for tarefa in list(self.tarefas.values()):
+            if tarefa.status not in STATUS_FINAIS and agora - self._ultimo_acesso(tarefa) > self.abandono_segundos:
+                self.cancela(tarefa.id)
+            elif tarefa.status in STATUS_FINAIS and agora - tarefa.concluida_em > self.ttl_segundos:
+                with self._trava:
+                    self.tarefas.pop(tarefa.id, None)
+                self._remove_arquivos(tarefa.id)
+
+        if not os.path.isdir(self.diretorio):
+            return
+        for nome in os.listdir(self.diretorio):
+            tarefa_id, _, extensao = nome.partition(".")
+            if extensao != "tarefa" or tarefa_id in self.tarefas:
+                continue
+            tarefa = self._tarefa_de_outro_worker(tarefa_id)
+            if tarefa is not None and tarefa.status in STATUS_FINAIS and agora - tarefa.concluida_em > self.ttl_segundos:
+                self._remove_arquivos(tarefa_id)
+
+    def _limpa_periodicamente(self) -> None:
+        while True:
+            time.sleep(INTERVALO_DE_LIMPEZA_SEGUNDOS)
+            self.limpa()
+
+
+gerenciador_de_tarefas = GerenciadorDeTarefas()
@@ -0,0 +1,109 @@
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from contas_a_pagar_e_receber.models.contas_a_pagar_e_receber_model import ContasAPagarEReceberModel
+from main import app
+from shared.database import Base
+from shared.dependencies import get_db
+
+client = TestClient(app)
+
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
+
+engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def override_get_db():
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+app.dependency_overrides[get_db] = override_get_db  # type: ignore
+
+
+def cria_conta(descricao, fornecedor_cliente_id=None):
+    return client.post("/contas-a-pagar-e-receber", json={
+        "descricao": descricao,
+        "valor": 100.0,
+        "tipo": "Pagar",
+        "data_previsao": "2026-03-10",
+        "fornecedor_cliente_id": fornecedor_cliente_id,
+    }).json()["id"]
+
+
+def test_deve_trazer_tudo_na_primeira_sincronizacao():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    id_fornecedor = client.post("/fornecedor-cliente", json={"nome": "Fornecedor 1"}).json()["id"]
+    id_conta = cria_conta("Aluguel", id_fornecedor)
+
+    response = client.get("/alteracoes")
+
+    assert response.status_code == 200
+    assert [c["id"] for c in response.json()["contas"]] == [id_conta]
+    assert response.json()["contas"][0]["fornecedor"]["nome"] == "Fornecedor 1"
+    assert response.json()["fornecedores"] == [{"id": id_fornecedor, "nome": "Fornecedor 1"}]
+    assert response.json()["contas_excluidas"] == []
+    assert response.json()["tem_mais"] is False
+    assert response.json()["cursor"] is not None
+
+
+def test_deve_trazer_somente_o_que_mudou_desde_o_cursor():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    id_fornecedor = client.post("/fornecedor-cliente", json={"nome": "Fornecedor 1"}).json()["id"]
+    ids = [cria_conta(f"Conta {i}") for i in range(3)]
+    cursor = client.get("/alteracoes").json()["cursor"]
+
+    client.patch(f"/contas-a-pagar-e-receber/{ids[1]}", json={"descricao": "Conta alterada"})
+    client.delete(f"/contas-a-pagar-e-receber/{ids[2]}")
+    client.delete(f"/fornecedor-cliente/{id_fornecedor}")
+    response = client.get("/alteracoes", params={"desde": cursor})
+
+    assert [(c["id"], c["descricao"]) for c in response.json()["contas"]] == [(ids[1], "Conta alterada")]
+    assert response.json()["contas_excluidas"] == [ids[2]]
+    assert response.json()["fornecedores"] == []
+    assert response.json()["fornecedores_excluidos"] == [id_fornecedor]
+    assert response.json()["cursor"] > cursor
+
+    sem_alteracoes = client.get("/alteracoes", params={"desde": response.json()["cursor"]}).json()
+    assert sem_alteracoes["contas"] == [] and sem_alteracoes["contas_excluidas"] == []
+    assert sem_alteracoes["cursor"] == response.json()["cursor"]
+
+
+def test_deve_paginar_as_alteracoes_pelo_limite():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    ids = [cria_conta(f"Conta {i}") for i in range(5)]
+
+    primeira = client.get("/alteracoes", params={"limite": 3}).json()
+    segunda = client.get("/alteracoes", params={"limite": 3, "desde": primeira["cursor"]}).json()
+
+    assert [c["id"] for c in primeira["contas"]] == ids[:3]
+    assert primeira["tem_mais"] is True
+    assert [c["id"] for c in segunda["contas"]] == ids[3:]
+    assert segunda["tem_mais"] is False
+
+
+def test_deve_atualizar_a_data_de_alteracao_da_conta():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    id_conta = cria_conta("Aluguel")
+    with TestingSessionLocal() as sessao:
+        sessao.query(ContasAPagarEReceberModel).update({"atualizado_em": datetime(2000, 1, 1)})
+        sessao.commit()
+
+    client.put(f"/contas-a-pagar-e-receber/{id_conta}", json={
+        "descricao": "Aluguel novo", "valor": 100.0, "tipo": "Pagar", "data_previsao": "2026-03-10",
+    })
+
+    with TestingSessionLocal() as sessao:
+        assert sessao.get(ContasAPagarEReceberModel, id_conta).atualizado_em.year > 2000
@@ -1,3 +1,4 @@
+from datetime import date
 from unittest.mock import MagicMock
 
 import pytest
@@ -5,7 +6,9 @@ from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
+from contas_a_pagar_e_receber.routers import contas_a_pagar_e_receber_router
 from main import app
+from shared import dinheiro
 from shared.database import Base
 from shared.dependencies import get_db
 
@@ -258,6 +261,70 @@ def test_deve_retornar_erro_404_ao_atualizar_conta_nao_encontrada(nova_conta_fix
     assert response.json() == {'message': 'Oops! Conta com ID 999 não encontrada não encontrado(a).'}
 
 
+def test_deve_atualizar_parcialmente_conta_a_pagar_e_receber(nova_conta_fixture):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    response = client.post("/contas-a-pagar-e-receber", json=nova_conta_fixture)
+    id_conta_criada = response.json()["id"]
+
+    response = client.patch(f"/contas-a-pagar-e-receber/{id_conta_criada}", json={"valor": 250.5, "tipo": "Pagar"})
+    assert response.status_code == 200
+    assert response.json() == {
+        "id": id_conta_criada,
+        "descricao": "Conta de Teste",
+        "valor": 250.5,
+        "tipo": "Pagar",
+        'fornecedor': None,
+        'esta_baixada': False,
+        'valor_baixada': None,
+        'data_baixa': None,
+        "data_previsao": "2025-05-23",
+    }
+    assert client.get(f"/contas-a-pagar-e-receber/{id_conta_criada}").json() == response.json()
+
+
+def test_deve_atualizar_parcialmente_fornecedor_cliente_da_conta(nova_conta_fixture):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    response_fornecedor = client.post("/fornecedor-cliente", json={"nome": "Fornecedor 1"})
+    response = client.post("/contas-a-pagar-e-receber", json=nova_conta_fixture)
+
+    response = client.patch(
+        f"/contas-a-pagar-e-receber/{response.json()['id']}",
+        json={"fornecedor_cliente_id": response_fornecedor.json()["id"]},
+    )
+    assert response.status_code == 200
+    assert response.json()["fornecedor"] == response_fornecedor.json()
+
+
+def test_deve_retornar_erro_ao_atualizar_parcialmente_conta_com_fornecedor_cliente_invalido(nova_conta_fixture):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    response = client.post("/contas-a-pagar-e-receber", json=nova_conta_fixture)
+
+    response = client.patch(f"/contas-a-pagar-e-receber/{response.json()['id']}", json={"fornecedor_cliente_id": 999})
+    assert response.status_code == 404
+    assert response.json() == {'message': 'Oops! Fornecedor com ID 999 não encontrado(a).'}
+
+
+def test_deve_retornar_erro_422_ao_atualizar_parcialmente_conta_com_campo_obrigatorio_nulo(nova_conta_fixture):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    response = client.post("/contas-a-pagar-e-receber", json=nova_conta_fixture)
+
+    response = client.patch(f"/contas-a-pagar-e-receber/{response.json()['id']}", json={"valor": None})
+    assert response.status_code == 422
+
+
+def test_deve_retornar_erro_404_ao_atualizar_parcialmente_conta_nao_encontrada():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    response = client.patch("/contas-a-pagar-e-receber/999", json={"descricao": "Conta Atualizada"})
+    assert response.status_code == 404
+    assert response.json() == {'message': 'Oops! Conta com ID 999 não encontrada não encontrado(a).'}
+
+
 def test_deve_deletar_conta_a_pagar_e_receber(nova_conta_fixture):
     Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
@@ -278,6 +345,42 @@ def test_deve_retornar_erro_404_ao_deletar_conta_nao_encontrada():
     assert response.json() == {'message': 'Oops! Conta com ID 999 não encontrada não encontrado(a).'}
 
 
+def test_deve_excluir_contas_em_lote_por_ids(nova_conta_fixture):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    ids = [client.post("/contas-a-pagar-e-receber", json=nova_conta_fixture).json()["id"] for _ in range(3)]
+
+    response = client.post("/contas-a-pagar-e-receber/exclusao-em-lote", json={"ids": ids[:2] + [999]})
+    assert response.status_code == 200
+    assert response.json() == {"quantidade_excluida": 2, "lotes": 1}
+    assert [conta["id"] for conta in client.get("/contas-a-pagar-e-receber").json()] == ids[2:]
+
+
+def test_deve_excluir_em_lotes_as_contas_baixadas_ate_uma_data(nova_conta_fixture, monkeypatch):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    monkeypatch.setattr(contas_a_pagar_e_receber_router, "TAMANHO_DO_LOTE_DE_EXCLUSAO", 3)
+    ids = [client.post("/contas-a-pagar-e-receber", json=nova_conta_fixture).json()["id"] for _ in range(5)]
+    for id_conta in ids[:4]:
+        client.post(f"/contas-a-pagar-e-receber/{id_conta}/baixar")
+
+    response = client.post(
+        "/contas-a-pagar-e-receber/exclusao-em-lote", json={"data_baixa_ate": date.today().isoformat()}
+    )
+    assert response.status_code == 200
+    assert response.json() == {"quantidade_excluida": 4, "lotes": 2}
+    assert [conta["id"] for conta in client.get("/contas-a-pagar-e-receber").json()] == ids[4:]
+
+
+def test_deve_retornar_erro_422_ao_excluir_contas_em_lote_sem_criterios():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    response = client.post("/contas-a-pagar-e-receber/exclusao-em-lote", json={})
+    assert response.status_code == 422
+    assert response.json() == {"detail": "Informe os IDs ou ao menos um filtro para a exclusão em lote"}
+
+
 def test_baixar_conta_a_pagar_e_receber(nova_conta_fixture):
     Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
@@ -359,4 +462,122 @@ def test_previsao_de_gastos_por_mes_sem_lancamentos():
 
     response = client.get("/contas-a-pagar-e-receber/previsao-gastos-do-mes?ano=2025")
     assert response.status_code == 200
-    assert response.json() == []
\ No newline at end of file
+    assert response.json() == []
+
+def test_deve_registrar_baixas_parciais_ate_quitar_a_conta(nova_conta_fixture):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    id_conta = client.post("/contas-a-pagar-e-receber", json=nova_conta_fixture).json()["id"]
+
+    response = client.post(
+        f"/contas-a-pagar-e-receber/{id_conta}/baixas", json={"valor": 40.0, "data_baixa": "2025-05-10"}
+    )
+    assert response.status_code == 201
+    assert response.json()["valor_baixada"] == 40.0
+    assert response.json()["esta_baixada"] is False
+    assert response.json()["data_baixa"] == "2025-05-10"
+
+    response = client.post(
+        f"/contas-a-pagar-e-receber/{id_conta}/baixas", json={"valor": 60.0, "data_baixa": "2025-05-20"}
+    )
+    assert response.json()["valor_baixada"] == 100.0
+    assert response.json()["esta_baixada"] is True
+    assert response.json()["data_baixa"] == "2025-05-20"
+
+    response = client.get(f"/contas-a-pagar-e-receber/{id_conta}/baixas")
+    assert [(baixa["valor"], baixa["data_baixa"]) for baixa in response.json()] == [
+        (40.0, "2025-05-10"), (60.0, "2025-05-20")
+    ]
+
+
+def test_deve_quitar_o_saldo_em_aberto_ao_baixar_conta_com_baixa_parcial(nova_conta_fixture):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    id_conta = client.post("/contas-a-pagar-e-receber", json=nova_conta_fixture).json()["id"]
+    client.post(f"/contas-a-pagar-e-receber/{id_conta}/baixas", json={"valor": 30.0})
+
+    response = client.post(f"/contas-a-pagar-e-receber/{id_conta}/baixar")
+    assert response.json()["valor_baixada"] == 100.0
+    assert response.json()["esta_baixada"] is True
+
+    response = client.post(f"/contas-a-pagar-e-receber/{id_conta}/baixar")
+    assert response.status_code == 200
+    assert [baixa["valor"] for baixa in client.get(f"/contas-a-pagar-e-receber/{id_conta}/baixas").json()] == [30.0, 70.0]
+
+
+def test_deve_retornar_erro_422_ao_baixar_valor_maior_que_o_saldo_em_aberto(nova_conta_fixture):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    id_conta = client.post("/contas-a-pagar-e-receber", json=nova_conta_fixture).json()["id"]
+    client.post(f"/contas-a-pagar-e-receber/{id_conta}/baixas", json={"valor": 80.0})
+
+    response = client.post(f"/contas-a-pagar-e-receber/{id_conta}/baixas", json={"valor": 20.01})
+    assert response.status_code == 422
+    assert response.json() == {"detail": "Valor da baixa maior que o saldo em aberto da conta"}
+    assert len(client.get(f"/contas-a-pagar-e-receber/{id_conta}/baixas").json()) == 1
+
+
+
+def test_deve_recalcular_esta_baixada_ao_alterar_o_valor_da_conta(nova_conta_fixture):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    id_conta = client.post("/contas-a-pagar-e-receber", json=nova_conta_fixture).json()["id"]
+    client.post(f"/contas-a-pagar-e-receber/{id_conta}/baixas", json={"valor": 60.0})
+
+    for alteracao in (
+            lambda valor: client.patch(f"/contas-a-pagar-e-receber/{id_conta}", json={"valor": valor}),
+            lambda valor: client.put(f"/contas-a-pagar-e-receber/{id_conta}",
+                                     json={**nova_conta_fixture, "valor": valor}),
+    ):
+        response = alteracao(59.99)
+        assert response.status_code == 422
+        assert response.json() == {"detail": "Valor da conta menor que o valor já baixado"}
+
+        response = alteracao(60.0)
+        assert (response.json()["valor"], response.json()["esta_baixada"]) == (60.0, True)
+
+        response = alteracao(100.0)
+        assert (response.json()["valor"], response.json()["esta_baixada"]) == (100.0, False)
+
+    response = client.patch("/contas-a-pagar-e-receber/999", json={"valor": 10.0})
+    assert response.status_code == 404
+
+def test_deve_retornar_erro_404_ao_registrar_baixa_de_conta_nao_encontrada():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    response = client.post("/contas-a-pagar-e-receber/999/baixas", json={"valor": 10.0})
+    assert response.status_code == 404
+    assert response.json() == {'message': 'Oops! Conta com ID 999 não encontrada não encontrado(a).'}
+
+
+def test_deve_retornar_erro_422_para_valor_acima_do_maximo_em_centavos(nova_conta_fixture):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    id_conta = client.post("/contas-a-pagar-e-receber", json=nova_conta_fixture).json()["id"]
+
+    assert client.post("/contas-a-pagar-e-receber", json={**nova_conta_fixture, "valor": 1e17}).status_code == 422
+    assert client.patch(f"/contas-a-pagar-e-receber/{id_conta}", json={"valor": 1e17}).status_code == 422
+    assert client.post(f"/contas-a-pagar-e-receber/{id_conta}/baixas", json={"valor": 1e17}).status_code == 422
+
+    maximo = str(dinheiro.VALOR_MAXIMO)
+    response = client.patch(f"/contas-a-pagar-e-receber/{id_conta}", json={"valor": maximo})
+    assert response.status_code == 200
+    response = client.post(f"/contas-a-pagar-e-receber/{id_conta}/baixas", json={"valor": maximo})
+    assert response.status_code == 201
+    response = client.post(f"/contas-a-pagar-e-receber/{id_conta}/baixas", json={"valor": maximo})
+    assert response.status_code == 422
+    assert response.json() == {"detail": "Valor da baixa maior que o saldo em aberto da conta"}
+
+
+def test_deve_devolver_valores_como_texto_quando_configurado(nova_conta_fixture, monkeypatch):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    monkeypatch.setattr(dinheiro, "VALORES_COMO_TEXTO", True)
+
+    response = client.post("/contas-a-pagar-e-receber", json={**nova_conta_fixture, "valor": "100.1"})
+    id_conta = response.json()["id"]
+    assert response.json()["valor"] == "100.10"
+    response = client.post(f"/contas-a-pagar-e-receber/{id_conta}/baixas", json={"valor": 0.3})
+    assert response.json()["valor_baixada"] == "0.30"
+    assert client.get(f"/contas-a-pagar-e-receber/{id_conta}/baixas").json()[0]["valor"] == "0.30"
@@ -0,0 +1,105 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from contas_a_pagar_e_receber.routers.dashboard_router import cache_do_dashboard
+from main import app
+from shared.database import Base
+from shared.dependencies import get_db
+
+client = TestClient(app)
+
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
+
+engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def override_get_db():
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+app.dependency_overrides[get_db] = override_get_db  # type: ignore
+
+
+def cria_conta(descricao, valor, tipo, data_previsao, fornecedor_cliente_id=None):
+    return client.post("/contas-a-pagar-e-receber", json={
+        "descricao": descricao, "valor": valor, "tipo": tipo, "data_previsao": data_previsao,
+        "fornecedor_cliente_id": fornecedor_cliente_id,
+    }).json()["id"]
+
+
+def test_deve_calcular_o_dashboard_do_mes():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    cache_do_dashboard.limpa()
+    id_fornecedor_1 = client.post("/fornecedor-cliente", json={"nome": "Fornecedor 1"}).json()["id"]
+    id_fornecedor_2 = client.post("/fornecedor-cliente", json={"nome": "Fornecedor 2"}).json()["id"]
+    cria_conta("Aluguel", 1000.0, "Pagar", "2026-03-10", id_fornecedor_1)
+    cria_conta("Energia", 200.0, "Pagar", "2026-03-25", id_fornecedor_2)
+    cria_conta("Venda", 500.0, "Receber", "2026-03-20")
+    id_atrasada = cria_conta("Internet", 100.0, "Pagar", "2026-02-10", id_fornecedor_2)
+    cria_conta("Serviço", 300.0, "Receber", "2026-02-05")
+    id_parcial = cria_conta("Consultoria", 800.0, "Receber", "2026-03-01")
+    client.post(f"/contas-a-pagar-e-receber/{id_parcial}/baixas", json={"valor": 300.0, "data_baixa": "2026-03-02"})
+    client.post(f"/contas-a-pagar-e-receber/{id_atrasada}/baixas", json={"valor": 100.0, "data_baixa": "2026-03-03"})
+
+    response = client.get("/dashboard", params={"data_base": "2026-03-15"})
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "data_base": "2026-03-15",
+        "a_pagar_no_mes": 1200.0,
+        "a_receber_no_mes": 1000.0,
+        "quantidade_vencida_a_pagar": 1,
+        "valor_vencido_a_pagar": 1000.0,
+        "quantidade_vencida_a_receber": 2,
+        "valor_vencido_a_receber": 800.0,
+        "pago_no_mes": 100.0,
+        "recebido_no_mes": 300.0,
+        "principais_fornecedores": [
+            {"fornecedor_cliente_id": id_fornecedor_1, "nome": "Fornecedor 1", "total_em_aberto": 1000.0},
+            {"fornecedor_cliente_id": id_fornecedor_2, "nome": "Fornecedor 2", "total_em_aberto": 200.0},
+        ],
+    }
+
+
+def test_deve_retornar_o_dashboard_zerado_sem_contas():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    cache_do_dashboard.limpa()
+
+    response = client.get("/dashboard", params={"data_base": "2026-03-15"})
+
+    assert response.json()["a_pagar_no_mes"] == 0
+    assert response.json()["quantidade_vencida_a_receber"] == 0
+    assert response.json()["principais_fornecedores"] == []
+
+
+def test_deve_calcular_o_dashboard_em_uma_consulta_e_reaproveitar_o_resultado():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    cache_do_dashboard.limpa()
+    consultas = []
+
+    def conta_consultas(conexao, cursor, instrucao, *args):
+        consultas.append(instrucao)
+
+    event.listen(engine, "before_cursor_execute", conta_consultas)
+    try:
+        primeira = client.get("/dashboard", params={"data_base": "2026-03-15"}).json()
+        cria_conta("Aluguel", 1000.0, "Pagar", "2026-03-10")
+        consultas.clear()
+        segunda = client.get("/dashboard", params={"data_base": "2026-03-15"}).json()
+    finally:
+        event.remove(engine, "before_cursor_execute", conta_consultas)
+
+    assert consultas == []
+    assert segunda == primeira
+    cache_do_dashboard.limpa()
+    assert client.get("/dashboard", params={"data_base": "2026-03-15"}).json()["a_pagar_no_mes"] == 1000.0
@@ -0,0 +1,130 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from main import app
+from shared.database import Base
+from shared.dependencies import get_db
+from shared.eventos import hub_de_eventos
+
+client = TestClient(app)
+
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
+
+engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def override_get_db():
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+app.dependency_overrides[get_db] = override_get_db  # type: ignore
+
+CONTA = {"descricao": "Aluguel", "valor": 100.0, "tipo": "Pagar", "data_previsao": "2026-03-10"}
+
+
+def eventos_publicados_durante(*requisicoes) -> list[tuple[str, dict]]:
+    """Executa as requisições com um assinante conectado e devolve os eventos recebidos por ele."""
+    async def cenario():
+        assinatura = hub_de_eventos.assina()
+        try:
+            for requisicao in requisicoes:
+                await asyncio.to_thread(requisicao)
+            eventos = []
+            while True:
+                try:
+                    evento = await assinatura.proximo(timeout=0.1)
+                except TimeoutError:
+                    return eventos
+                eventos.append((evento.tipo, evento.dados))
+        finally:
+            assinatura.cancela()
+
+    return asyncio.run(cenario())
+
+
+def test_deve_publicar_eventos_das_alteracoes_de_contas():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    id_conta = client.post("/contas-a-pagar-e-receber", json=CONTA).json()["id"]
+
+    eventos = eventos_publicados_durante(
+        lambda: client.patch(f"/contas-a-pagar-e-receber/{id_conta}", json={"descricao": "Aluguel novo"}),
+        lambda: client.post(f"/contas-a-pagar-e-receber/{id_conta}/baixas", json={"valor": 40.0}),
+        lambda: client.delete(f"/contas-a-pagar-e-receber/{id_conta}"),
+    )
+
+    assert [tipo for tipo, _ in eventos] == ["conta_atualizada", "baixa_registrada", "conta_excluida"]
+    assert eventos[0][1]["descricao"] == "Aluguel novo"
+    assert eventos[1][1]["valor_baixada"] == 40.0
+    assert eventos[2][1] == {"id": id_conta}
+
+
+def test_deve_publicar_a_conta_criada_e_as_excluidas_em_lote():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    eventos = eventos_publicados_durante(
+        lambda: client.post("/contas-a-pagar-e-receber", json=CONTA),
+        lambda: client.post("/contas-a-pagar-e-receber/exclusao-em-lote", json={"tipo": "Pagar"}),
+    )
+
+    assert eventos[0][0] == "conta_criada"
+    assert eventos[0][1]["descricao"] == "Aluguel"
+    assert eventos[1] == ("contas_excluidas", {"ids": [eventos[0][1]["id"]]})
+
+
+def test_nao_deve_publicar_evento_quando_a_alteracao_falha():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    eventos = eventos_publicados_durante(
+        lambda: client.patch("/contas-a-pagar-e-receber/999", json={"descricao": "Inexistente"}),
+    )
+
+    assert eventos == []
+
+
+def test_deve_transmitir_os_eventos_pelo_endpoint_sse():
+    async def cenario():
+        desconectar = asyncio.Event()
+        recebido = asyncio.Event()
+        mensagens = []
+
+        async def receive():
+            await desconectar.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(mensagem):
+            mensagens.append(mensagem)
+            if b"conta_excluida" in mensagem.get("body", b""):
+                recebido.set()
+
+        scope = {
+            "type": "http", "method": "GET", "path": "/eventos/", "raw_path": b"/eventos/", "query_string": b"",
+            "headers": [], "http_version": "1.1", "scheme": "http", "server": ("test", 80), "client": ("test", 1),
+            "root_path": "",
+        }
+        requisicao = asyncio.create_task(app(scope, receive, send))
+        while not hub_de_eventos.quantidade_de_assinantes:
+            await asyncio.sleep(0.01)
+        hub_de_eventos.publica("conta_excluida", {"id": 1})
+        await asyncio.wait_for(recebido.wait(), 1)
+        desconectar.set()
+        await asyncio.wait_for(requisicao, 1)
+        return mensagens, hub_de_eventos.quantidade_de_assinantes
+
+    mensagens, assinantes = asyncio.run(cenario())
+
+    assert mensagens[0]["status"] == 200
+    assert (b"content-type", b"text/event-stream; charset=utf-8") in mensagens[0]["headers"]
+    assert b"".join(m.get("body", b"") for m in mensagens[1:]).endswith(b'event: conta_excluida\ndata: {"id": 1}\n\n')
+    assert assinantes == 0
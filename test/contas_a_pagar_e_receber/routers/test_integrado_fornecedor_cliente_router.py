@@ -147,6 +147,39 @@ def test_deve_retornar_erro_404_ao_atualizar_fornecedor_cliente_nao_encontrado()
                                           'encontrado(a).'}
 
 
+def test_deve_atualizar_parcialmente_fornecedor_cliente():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    response = client.post("/fornecedor-cliente", json={"nome": "Fornecedor 1"})
+    id_fornecedor_cliente_criado = response.json()["id"]
+
+    response = client.patch(f"/fornecedor-cliente/{id_fornecedor_cliente_criado}", json={"nome": "Fornecedor Atualizado"})
+    assert response.status_code == 200
+    assert response.json() == {
+        "id": id_fornecedor_cliente_criado,
+        "nome": "Fornecedor Atualizado"
+    }
+    assert client.get(f"/fornecedor-cliente/{id_fornecedor_cliente_criado}").json()["nome"] == "Fornecedor Atualizado"
+
+
+def test_deve_retornar_erro_404_ao_atualizar_parcialmente_fornecedor_cliente_nao_encontrado():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    response = client.patch("/fornecedor-cliente/999", json={"nome": "Fornecedor Atualizado"})
+    assert response.status_code == 404
+    assert response.json() == {'message': 'Oops! Fornecedor ou cliente com ID 999 não encontrado. não '
+                                          'encontrado(a).'}
+
+
+def test_deve_retornar_erro_422_ao_atualizar_parcialmente_fornecedor_cliente_com_nome_nulo():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    response = client.post("/fornecedor-cliente", json={"nome": "Fornecedor 1"})
+
+    response = client.patch(f"/fornecedor-cliente/{response.json()['id']}", json={"nome": None})
+    assert response.status_code == 422
+
+
 def test_deve_deletar_fornecedor_cliente():
     Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
@@ -72,3 +72,89 @@ def test_deve_retornar_lista_vazia_contas_a_pagar_e_receber_sem_fornecedor_clien
     response = client.get("/fornecedor-cliente/999/contas-a-pagar-e-receber")
     assert response.status_code == 200
     assert response.json() == []
+
+
+def cria_fornecedor_com_contas(contas):
+    response_fornecedor = client.post("/fornecedor-cliente", json={"nome": "Fornecedor 1"})
+    id_do_fornecedor_cliente = response_fornecedor.json()["id"]
+
+    for conta in contas:
+        response = client.post(
+            "/contas-a-pagar-e-receber",
+            json={**conta, "fornecedor_cliente_id": id_do_fornecedor_cliente}
+        )
+        assert response.status_code == 201
+
+    return id_do_fornecedor_cliente
+
+
+def test_deve_paginar_e_filtrar_contas_a_pagar_e_receber_de_um_fornecedor_cliente():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    id_do_fornecedor_cliente = cria_fornecedor_com_contas([
+        {"descricao": "Conta 1", "valor": 100.0, "tipo": "Pagar", "data_previsao": "2025-01-10"},
+        {"descricao": "Conta 2", "valor": 200.0, "tipo": "Receber", "data_previsao": "2025-02-10"},
+        {"descricao": "Conta 3", "valor": 300.0, "tipo": "Pagar", "data_previsao": "2025-03-10"},
+    ])
+    url = f"/fornecedor-cliente/{id_do_fornecedor_cliente}/contas-a-pagar-e-receber"
+
+    response = client.get(url, params={"pagina": 2, "tamanho_da_pagina": 2})
+    assert response.status_code == 200
+    assert [conta["descricao"] for conta in response.json()] == ["Conta 3"]
+
+    response = client.get(url, params={"tipo": "Pagar"})
+    assert [conta["descricao"] for conta in response.json()] == ["Conta 1", "Conta 3"]
+
+    response = client.get(url, params={"data_inicio": "2025-02-01", "data_fim": "2025-02-28"})
+    assert [conta["descricao"] for conta in response.json()] == ["Conta 2"]
+
+    client.post("/contas-a-pagar-e-receber/1/baixar")
+    response = client.get(url, params={"esta_baixada": False})
+    assert [conta["descricao"] for conta in response.json()] == ["Conta 2", "Conta 3"]
+
+
+def test_deve_retornar_resumo_das_contas_a_pagar_e_receber_de_um_fornecedor_cliente():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    id_do_fornecedor_cliente = cria_fornecedor_com_contas([
+        {"descricao": "Conta 1", "valor": 100.0, "tipo": "Pagar", "data_previsao": "2000-01-10"},
+        {"descricao": "Conta 2", "valor": 200.0, "tipo": "Receber", "data_previsao": "2000-01-20"},
+        {"descricao": "Conta 3", "valor": 300.0, "tipo": "Pagar", "data_previsao": "2000-03-10"},
+        {"descricao": "Conta 4", "valor": 50.0, "tipo": "Receber", "data_previsao": "2999-12-31"},
+    ])
+    client.post("/contas-a-pagar-e-receber/1/baixar")
+
+    response = client.get(f"/fornecedor-cliente/{id_do_fornecedor_cliente}/contas-a-pagar-e-receber/resumo")
+    assert response.status_code == 200
+    assert response.json() == {
+        "quantidade_de_contas": 4,
+        "total_a_pagar": 400.0,
+        "total_a_receber": 250.0,
+        "total_baixado": 100.0,
+        "valor_vencido": 500.0,
+        "proxima_data_vencimento": "2999-12-31",
+        "por_mes": [
+            {"ano": 2000, "mes": 1, "total_a_pagar": 100.0, "total_a_receber": 200.0},
+            {"ano": 2000, "mes": 3, "total_a_pagar": 300.0, "total_a_receber": 0.0},
+            {"ano": 2999, "mes": 12, "total_a_pagar": 0.0, "total_a_receber": 50.0},
+        ]
+    }
+
+
+def test_deve_retornar_resumo_zerado_sem_contas_do_fornecedor_cliente():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    response = client.get("/fornecedor-cliente/999/contas-a-pagar-e-receber/resumo")
+    assert response.status_code == 200
+    assert response.json() == {
+        "quantidade_de_contas": 0,
+        "total_a_pagar": 0.0,
+        "total_a_receber": 0.0,
+        "total_baixado": 0.0,
+        "valor_vencido": 0.0,
+        "proxima_data_vencimento": None,
+        "por_mes": []
+    }
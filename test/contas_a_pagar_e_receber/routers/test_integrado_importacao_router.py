@@ -0,0 +1,166 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from main import app
+from shared.database import Base
+from shared.dependencies import get_db
+
+client = TestClient(app)
+
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
+
+engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def override_get_db():
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+app.dependency_overrides[get_db] = override_get_db  # type: ignore
+
+
+def test_deve_importar_contas_de_csv_criando_fornecedores_e_reportando_erros():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    client.post("/fornecedor-cliente", json={"nome": "Fornecedor Existente"})
+
+    csv = (
+        "descricao,valor,tipo,data_previsao,fornecedor,data_baixa,valor_baixada\n"
+        "Aluguel,1500.00,Pagar,2020-01-10,Fornecedor Existente,2020-01-10,\n"
+        "Venda,300.50,Receber,2020-01-15,Cliente Novo,,\n"
+        "Sem tipo valido,10,Outro,2020-01-15,,,\n"
+        "Valor negativo,-10,Pagar,2020-01-15,,,\n"
+        "\"Descrição com, vírgula\",20,Pagar,2020-02-01,Cliente Novo,,\n"
+    )
+    response = client.post(
+        "/contas-a-pagar-e-receber/importacao",
+        content=csv.encode("utf-8"),
+        headers={"Content-Type": "text/csv"},
+        params={"tamanho_do_lote": 2},
+    )
+    assert response.status_code == 200
+    resultado = response.json()
+    assert resultado["linhas_lidas"] == 5
+    assert resultado["contas_importadas"] == 3
+    assert resultado["fornecedores_criados"] == 1
+    assert resultado["quantidade_de_erros"] == 2
+    assert [erro["linha"] for erro in resultado["erros"]] == [4, 5]
+    assert resultado["erros"][0]["mensagem"] == "Tipo deve ser 'Pagar' ou 'Receber'"
+
+    contas = client.get("/contas-a-pagar-e-receber").json()
+    assert [(c["descricao"], c["fornecedor"]["nome"], c["esta_baixada"]) for c in contas] == [
+        ("Aluguel", "Fornecedor Existente", True),
+        ("Venda", "Cliente Novo", False),
+        ("Descrição com, vírgula", "Cliente Novo", False),
+    ]
+    assert contas[0]["valor_baixada"] == 1500.0
+    baixas = client.get(f"/contas-a-pagar-e-receber/{contas[0]['id']}/baixas").json()
+    assert [(b["valor"], b["data_baixa"]) for b in baixas] == [(1500.0, "2020-01-10")]
+
+
+def test_deve_reportar_erro_de_cabecalho_invalido_na_importacao():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    response = client.post(
+        "/contas-a-pagar-e-receber/importacao",
+        content=b"nome,valor\nConta,10\n",
+        headers={"Content-Type": "text/csv"},
+    )
+    assert response.status_code == 200
+    assert response.json() == {
+        "linhas_lidas": 0,
+        "contas_importadas": 0,
+        "fornecedores_criados": 0,
+        "quantidade_de_erros": 1,
+        "erros": [{"linha": 1, "mensagem": "Cabeçalho deve conter: descricao, valor, tipo, data_previsao"}],
+    }
+
+
+def test_deve_reportar_linhas_que_nao_sao_utf8_na_importacao():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    csv = (
+        b"descricao,valor,tipo,data_previsao\n"
+        b"Conta v\xe1lida em latin-1,10,Pagar,2020-01-10\n"
+        b"Aluguel,20,Pagar,2020-01-10\n"
+    )
+    response = client.post(
+        "/contas-a-pagar-e-receber/importacao", content=csv, headers={"Content-Type": "text/csv"}
+    )
+    assert response.status_code == 200
+    assert response.json()["contas_importadas"] == 1
+    assert response.json()["erros"] == [
+        {"linha": 2, "mensagem": "Linha contém caracteres que não são UTF-8 válido"},
+    ]
+
+
+def test_deve_retornar_erro_422_com_tamanho_do_lote_fora_dos_limites():
+    for tamanho_do_lote in (0, 50_001):
+        response = client.post(
+            "/contas-a-pagar-e-receber/importacao",
+            params={"tamanho_do_lote": tamanho_do_lote},
+            content=b"descricao,valor,tipo,data_previsao\n",
+            headers={"Content-Type": "text/csv"},
+        )
+        assert response.status_code == 422
+
+
+def test_deve_recusar_linha_com_valor_baixada_invalido_sem_perder_o_lote():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    csv = (
+        "descricao,valor,tipo,data_previsao,fornecedor,data_baixa,valor_baixada\n"
+        "Nao numero,10,Pagar,2020-01-10,,2020-01-10,NaN\n"
+        "Maior que o valor,10,Pagar,2020-01-10,,2020-01-10,99\n"
+        "Negativo,10,Pagar,2020-01-10,,2020-01-10,-5\n"
+        "Tres casas,10,Pagar,2020-01-10,,2020-01-10,1.005\n"
+        "Valida,10,Pagar,2020-01-10,,2020-01-10,4\n"
+    )
+    response = client.post(
+        "/contas-a-pagar-e-receber/importacao",
+        content=csv.encode("utf-8"),
+        headers={"Content-Type": "text/csv"},
+    )
+    assert response.status_code == 200
+    assert response.json()["contas_importadas"] == 1
+    erros = response.json()["erros"]
+    assert [erro["linha"] for erro in erros] == [2, 3, 4, 5]
+    assert erros[1]["mensagem"] == "valor_baixada maior que o valor da conta"
+    assert all(erro["mensagem"].startswith("Baixa inválida") for erro in erros[:1] + erros[2:])
+    contas = client.get("/contas-a-pagar-e-receber").json()
+    assert [(c["descricao"], c["valor_baixada"]) for c in contas] == [("Valida", 4.0)]
+
+
+def test_deve_importar_baixa_parcial_como_conta_em_aberto():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    csv = (
+        "descricao,valor,tipo,data_previsao,fornecedor,data_baixa,valor_baixada\n"
+        "Parcial,10,Pagar,2020-01-10,,2020-01-10,3\n"
+    )
+    response = client.post(
+        "/contas-a-pagar-e-receber/importacao",
+        content=csv.encode("utf-8"),
+        headers={"Content-Type": "text/csv"},
+    )
+    assert response.json()["contas_importadas"] == 1
+    conta = client.get("/contas-a-pagar-e-receber").json()[0]
+    assert (conta["valor_baixada"], conta["esta_baixada"]) == (3.0, False)
+    baixas = client.get(f"/contas-a-pagar-e-receber/{conta['id']}/baixas").json()
+    assert [b["valor"] for b in baixas] == [3.0]
+
+    response = client.post(f"/contas-a-pagar-e-receber/{conta['id']}/baixas", json={"valor": 15.0})
+    assert response.status_code == 422
+    response = client.post(f"/contas-a-pagar-e-receber/{conta['id']}/baixar")
+    assert (response.json()["valor_baixada"], response.json()["esta_baixada"]) == (10.0, True)
@@ -0,0 +1,123 @@
+from datetime import date
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from contas_a_pagar_e_receber.routers.recorrencias_router import soma_meses
+from main import app
+from shared.database import Base
+from shared.dependencies import get_db
+
+client = TestClient(app)
+
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
+
+engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def override_get_db():
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+app.dependency_overrides[get_db] = override_get_db  # type: ignore
+
+RECORRENCIA = {"descricao": "Aluguel", "valor": 1500.0, "tipo": "Pagar", "data_inicio": "2026-01-31"}
+
+
+def test_deve_criar_as_parcelas_mensais_da_recorrencia():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    id_fornecedor = client.post("/fornecedor-cliente", json={"nome": "Imobiliária"}).json()["id"]
+
+    response = client.post("/contas-a-pagar-e-receber/recorrencias", json={
+        **RECORRENCIA, "quantidade_de_parcelas": 3, "fornecedor_cliente_id": id_fornecedor,
+    })
+
+    assert response.status_code == 201
+    contas = response.json()["contas"]
+    assert [conta["data_previsao"] for conta in contas] == ["2026-01-31", "2026-02-28", "2026-03-31"]
+    assert [conta["parcela"] for conta in contas] == [1, 2, 3]
+    assert {conta["serie_id"] for conta in contas} == {response.json()["serie_id"]}
+    assert all(conta["fornecedor"]["nome"] == "Imobiliária" for conta in contas)
+    assert len(client.get("/contas-a-pagar-e-receber").json()) == 3
+
+
+def test_deve_criar_parcelas_semanais_ate_a_data_final():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    response = client.post("/contas-a-pagar-e-receber/recorrencias", json={
+        **RECORRENCIA, "data_inicio": "2026-03-02", "frequencia": "semanal", "data_fim": "2026-03-23",
+    })
+
+    assert [c["data_previsao"] for c in response.json()["contas"]] == ["2026-03-02", "2026-03-09", "2026-03-16", "2026-03-23"]
+
+
+def test_deve_validar_o_termino_da_recorrencia():
+    response = client.post("/contas-a-pagar-e-receber/recorrencias", json=RECORRENCIA)
+    assert response.status_code == 422
+
+    response = client.post("/contas-a-pagar-e-receber/recorrencias", json={
+        **RECORRENCIA, "data_inicio": "2026-01-01", "data_fim": "2040-01-01",
+    })
+    assert response.status_code == 422
+
+
+def test_deve_recusar_a_recorrencia_que_ultrapassa_o_limite_mensal_sem_gravar_nada():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    for i in range(5):
+        client.post("/contas-a-pagar-e-receber", json={
+            "descricao": f"Conta {i}", "valor": 10.0, "tipo": "Pagar", "data_previsao": "2026-02-10",
+        })
+
+    response = client.post("/contas-a-pagar-e-receber/recorrencias", json={
+        **RECORRENCIA, "data_inicio": "2026-02-02", "frequencia": "semanal", "quantidade_de_parcelas": 2,
+    })
+
+    assert response.status_code == 422
+    assert response.json()["detail"] == "Limite de contas atingido para o mês: 02/2026"
+    assert len(client.get("/contas-a-pagar-e-receber").json()) == 5
+
+
+def test_deve_alterar_e_cancelar_as_parcelas_em_aberto_da_serie():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    recorrencia = client.post("/contas-a-pagar-e-receber/recorrencias", json={
+        **RECORRENCIA, "quantidade_de_parcelas": 4,
+    }).json()
+    serie_id, ids = recorrencia["serie_id"], [conta["id"] for conta in recorrencia["contas"]]
+    client.post(f"/contas-a-pagar-e-receber/{ids[0]}/baixar")
+
+    alteradas = client.patch(f"/contas-a-pagar-e-receber/recorrencias/{serie_id}", json={"valor": 1600.0})
+    assert [(c["parcela"], c["valor"]) for c in alteradas.json()] == [(2, 1600.0), (3, 1600.0), (4, 1600.0)]
+
+    cancelamento = client.delete(
+        f"/contas-a-pagar-e-receber/recorrencias/{serie_id}", params={"a_partir_de": "2026-03-01"}
+    )
+    assert cancelamento.json()["quantidade_excluida"] == 2
+
+    parcelas = client.get(f"/contas-a-pagar-e-receber/recorrencias/{serie_id}").json()
+    assert [(c["parcela"], c["valor"], c["esta_baixada"]) for c in parcelas] == [(1, 1500.0, True), (2, 1600.0, False)]
+
+
+def test_deve_retornar_404_para_recorrencia_inexistente():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    assert client.get("/contas-a-pagar-e-receber/recorrencias/nao-existe").status_code == 404
+    assert client.patch("/contas-a-pagar-e-receber/recorrencias/nao-existe", json={}).status_code == 404
+    assert client.delete("/contas-a-pagar-e-receber/recorrencias/nao-existe").status_code == 404
+
+
+def test_deve_somar_meses_ajustando_ao_fim_do_mes():
+    assert soma_meses(date(2026, 1, 31), 1) == date(2026, 2, 28)
+    assert soma_meses(date(2028, 1, 31), 1) == date(2028, 2, 29)
+    assert soma_meses(date(2026, 11, 15), 3) == date(2027, 2, 15)
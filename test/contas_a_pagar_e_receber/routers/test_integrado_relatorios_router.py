@@ -0,0 +1,273 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from main import app
+from shared.database import Base
+from shared.dependencies import get_db
+
+client = TestClient(app)
+
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
+
+engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def override_get_db():
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+app.dependency_overrides[get_db] = override_get_db  # type: ignore
+
+
+def cria_conta(descricao, valor, tipo, data_previsao, fornecedor_cliente_id=None):
+    response = client.post("/contas-a-pagar-e-receber", json={
+        "descricao": descricao,
+        "valor": valor,
+        "tipo": tipo,
+        "data_previsao": data_previsao,
+        "fornecedor_cliente_id": fornecedor_cliente_id,
+    })
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def test_deve_gerar_aging_das_contas_em_aberto_por_fornecedor_e_tipo():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    id_fornecedor = client.post("/fornecedor-cliente", json={"nome": "Fornecedor 1"}).json()["id"]
+    cria_conta("A vencer", 10.0, "Pagar", "2025-06-30", id_fornecedor)
+    cria_conta("Vencida 10 dias", 20.0, "Pagar", "2025-06-20", id_fornecedor)
+    cria_conta("Vencida 45 dias", 30.0, "Pagar", "2025-05-16", id_fornecedor)
+    cria_conta("Vencida 75 dias", 40.0, "Pagar", "2025-04-16", id_fornecedor)
+    cria_conta("Vencida 120 dias", 50.0, "Pagar", "2025-03-02", id_fornecedor)
+    id_baixada = cria_conta("Baixada", 1000.0, "Pagar", "2025-03-02", id_fornecedor)
+    cria_conta("Sem fornecedor", 70.0, "Receber", "2025-06-29")
+    client.post(f"/contas-a-pagar-e-receber/{id_baixada}/baixar")
+
+    response = client.get("/relatorios/aging", params={"data_base": "2025-06-30"})
+    assert response.status_code == 200
+    assert response.json() == [
+        {
+            "fornecedor_cliente_id": None,
+            "fornecedor_cliente_nome": None,
+            "tipo": "Receber",
+            "a_vencer": 0.0,
+            "vencido_1_a_30_dias": 70.0,
+            "vencido_31_a_60_dias": 0.0,
+            "vencido_61_a_90_dias": 0.0,
+            "vencido_mais_de_90_dias": 0.0,
+            "total_em_aberto": 70.0,
+        },
+        {
+            "fornecedor_cliente_id": id_fornecedor,
+            "fornecedor_cliente_nome": "Fornecedor 1",
+            "tipo": "Pagar",
+            "a_vencer": 10.0,
+            "vencido_1_a_30_dias": 20.0,
+            "vencido_31_a_60_dias": 30.0,
+            "vencido_61_a_90_dias": 40.0,
+            "vencido_mais_de_90_dias": 50.0,
+            "total_em_aberto": 150.0,
+        },
+    ]
+
+    response = client.get("/relatorios/aging", params={"data_base": "2025-06-30", "tipo": "Receber"})
+    assert [linha["tipo"] for linha in response.json()] == ["Receber"]
+
+
+def test_deve_gerar_aging_vazio_sem_contas_em_aberto():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    response = client.get("/relatorios/aging")
+    assert response.status_code == 200
+    assert response.json() == []
+
+
+def test_deve_projetar_fluxo_de_caixa_diario_a_partir_do_saldo_realizado():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    id_recebida = cria_conta("Recebida", 500.0, "Receber", "2000-01-01")
+    client.post(f"/contas-a-pagar-e-receber/{id_recebida}/baixar")
+    cria_conta("Entrada", 100.0, "Receber", "2999-01-02")
+    cria_conta("Saida", 40.0, "Pagar", "2999-01-02")
+    cria_conta("Saida 2", 10.0, "Pagar", "2999-01-04")
+    cria_conta("Fora do periodo", 1000.0, "Pagar", "2999-02-01")
+
+    response = client.get(
+        "/relatorios/fluxo-de-caixa",
+        params={"data_inicio": "2999-01-01", "data_fim": "2999-01-04"}
+    )
+    assert response.status_code == 200
+    assert response.json() == {
+        "granularidade": "dia",
+        "saldo_inicial": 500.0,
+        "periodos": [
+            {"data": "2999-01-01", "entradas": 0.0, "saidas": 0.0, "saldo": 500.0},
+            {"data": "2999-01-02", "entradas": 100.0, "saidas": 40.0, "saldo": 560.0},
+            {"data": "2999-01-03", "entradas": 0.0, "saidas": 0.0, "saldo": 560.0},
+            {"data": "2999-01-04", "entradas": 0.0, "saidas": 10.0, "saldo": 550.0},
+        ]
+    }
+
+
+def test_deve_projetar_fluxo_de_caixa_semanal():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    cria_conta("Entrada", 100.0, "Receber", "2025-06-04")
+    cria_conta("Saida", 30.0, "Pagar", "2025-06-12")
+
+    response = client.get(
+        "/relatorios/fluxo-de-caixa",
+        params={"data_inicio": "2025-06-04", "data_fim": "2025-06-20", "granularidade": "semana"}
+    )
+    assert response.status_code == 200
+    assert response.json()["periodos"] == [
+        {"data": "2025-06-02", "entradas": 100.0, "saidas": 0.0, "saldo": 100.0},
+        {"data": "2025-06-09", "entradas": 0.0, "saidas": 30.0, "saldo": 70.0},
+        {"data": "2025-06-16", "entradas": 0.0, "saidas": 0.0, "saldo": 70.0},
+    ]
+
+
+def test_deve_retornar_erro_422_no_fluxo_de_caixa_com_periodo_invertido():
+    response = client.get(
+        "/relatorios/fluxo-de-caixa",
+        params={"data_inicio": "2025-06-20", "data_fim": "2025-06-04"}
+    )
+    assert response.status_code == 422
+    assert response.json() == {"detail": "Data final deve ser igual ou posterior à data inicial"}
+
+
+def test_deve_retornar_erro_422_no_fluxo_de_caixa_com_periodo_longo_demais():
+    response = client.get(
+        "/relatorios/fluxo-de-caixa",
+        params={"data_inicio": "0001-01-01", "data_fim": "9999-12-31", "granularidade": "semana"}
+    )
+    assert response.status_code == 422
+    assert response.json() == {"detail": "O período deve ter no máximo 3660 dias"}
+
+    response = client.get(
+        "/relatorios/fluxo-de-caixa",
+        params={"data_inicio": "2025-01-01", "data_fim": "2035-01-08"}
+    )
+    assert response.status_code == 200
+    assert len(response.json()["periodos"]) == 3660
+
+
+def cria_conta_baixada_em(descricao, valor, tipo, data_baixa):
+    id_conta = cria_conta(descricao, valor, tipo, "2025-01-01")
+    response = client.post(
+        f"/contas-a-pagar-e-receber/{id_conta}/baixas", json={"valor": valor, "data_baixa": data_baixa}
+    )
+    assert response.status_code == 201
+    return id_conta
+
+
+def test_deve_calcular_saldo_realizado_e_serie_diaria():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    cria_conta_baixada_em("Recebimento", 100.0, "Receber", "2025-01-05")
+    cria_conta_baixada_em("Pagamento", 30.0, "Pagar", "2025-01-05")
+    cria_conta_baixada_em("Recebimento 2", 50.0, "Receber", "2025-01-10")
+    cria_conta_baixada_em("Pagamento 2", 20.0, "Pagar", "2025-01-20")
+
+    response = client.get("/relatorios/saldo-realizado", params={"data": "2025-01-10"})
+    assert response.status_code == 200
+    assert response.json() == {"data": "2025-01-10", "saldo": 120.0}
+
+    response = client.get(
+        "/relatorios/saldo-realizado/diario",
+        params={"data_inicio": "2025-01-06", "data_fim": "2025-01-31"}
+    )
+    assert response.status_code == 200
+    assert response.json() == [
+        {"data": "2025-01-10", "movimento": 50.0, "saldo": 120.0},
+        {"data": "2025-01-20", "movimento": -20.0, "saldo": 100.0},
+    ]
+
+
+def test_deve_considerar_cada_baixa_parcial_na_sua_data_no_saldo_realizado():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    id_conta = cria_conta("Recebimento parcelado", 100.0, "Receber", "2025-01-01")
+    client.post(f"/contas-a-pagar-e-receber/{id_conta}/baixas", json={"valor": 40.0, "data_baixa": "2025-01-05"})
+    client.post(f"/contas-a-pagar-e-receber/{id_conta}/baixas", json={"valor": 60.0, "data_baixa": "2025-01-15"})
+
+    response = client.get("/relatorios/saldo-realizado", params={"data": "2025-01-10"})
+    assert response.json() == {"data": "2025-01-10", "saldo": 40.0}
+
+    response = client.get(
+        "/relatorios/saldo-realizado/diario",
+        params={"data_inicio": "2025-01-01", "data_fim": "2025-01-31"}
+    )
+    assert response.json() == [
+        {"data": "2025-01-05", "movimento": 40.0, "saldo": 40.0},
+        {"data": "2025-01-15", "movimento": 60.0, "saldo": 100.0},
+    ]
+
+
+def test_deve_partir_do_fechamento_de_saldo_e_invalidar_ao_remover_conta_baixada():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    id_recebimento = cria_conta_baixada_em("Recebimento", 100.0, "Receber", "2025-01-05")
+    cria_conta_baixada_em("Recebimento 2", 50.0, "Receber", "2025-02-10")
+
+    response = client.post("/relatorios/saldo-realizado/fechamentos", json={"data": "2025-01-31"})
+    assert response.status_code == 201
+    assert response.json() == {"data": "2025-01-31", "saldo": 100.0}
+
+    # Altera o fechamento diretamente para provar que a consulta parte dele
+    from contas_a_pagar_e_receber.models.fechamento_de_saldo_model import FechamentoDeSaldoModel
+    with TestingSessionLocal() as db:
+        db.query(FechamentoDeSaldoModel).update({"saldo": 1000})
+        db.commit()
+
+    response = client.get("/relatorios/saldo-realizado", params={"data": "2025-02-28"})
+    assert response.json() == {"data": "2025-02-28", "saldo": 1050.0}
+
+    client.delete(f"/contas-a-pagar-e-receber/{id_recebimento}")
+    response = client.get("/relatorios/saldo-realizado", params={"data": "2025-02-28"})
+    assert response.json() == {"data": "2025-02-28", "saldo": 50.0}
+
+
+def test_deve_invalidar_fechamento_ao_alterar_tipo_de_conta_baixada():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    id_conta = cria_conta_baixada_em("Recebimento", 10.0, "Receber", "2025-01-05")
+    response = client.post("/relatorios/saldo-realizado/fechamentos", json={"data": "2025-01-31"})
+    assert response.json() == {"data": "2025-01-31", "saldo": 10.0}
+
+    response = client.patch(f"/contas-a-pagar-e-receber/{id_conta}", json={"tipo": "Pagar"})
+    assert response.status_code == 200
+    response = client.get("/relatorios/saldo-realizado", params={"data": "2025-02-10"})
+    assert response.json() == {"data": "2025-02-10", "saldo": -10.0}
+
+    client.post("/relatorios/saldo-realizado/fechamentos", json={"data": "2025-01-31"})
+    response = client.put(f"/contas-a-pagar-e-receber/{id_conta}", json={
+        "descricao": "Recebimento", "valor": 10.0, "tipo": "Receber", "data_previsao": "2025-01-01",
+    })
+    assert response.status_code == 200
+    response = client.get("/relatorios/saldo-realizado", params={"data": "2025-02-10"})
+    assert response.json() == {"data": "2025-02-10", "saldo": 10.0}
+
+
+def test_deve_retornar_erro_422_ao_fechar_saldo_de_periodo_em_aberto():
+    from datetime import date
+
+    response = client.post("/relatorios/saldo-realizado/fechamentos", json={"data": date.today().isoformat()})
+    assert response.status_code == 422
+    assert response.json() == {"detail": "Só é possível fechar o saldo de datas anteriores a hoje"}
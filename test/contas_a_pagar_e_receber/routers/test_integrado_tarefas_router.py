@@ -0,0 +1,170 @@
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from contas_a_pagar_e_receber.routers import tarefas_router
+from main import app
+from shared.database import Base
+from shared.dependencies import get_db
+from shared.tarefas import FilaDeTarefasCheia, GerenciadorDeTarefas, StatusTarefaEnum
+
+client = TestClient(app)
+
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
+
+engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def override_get_db():
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+app.dependency_overrides[get_db] = override_get_db  # type: ignore
+
+
+def aguarda_conclusao(tarefa_id, tentativas=200):
+    for _ in range(tentativas):
+        tarefa = client.get(f"/relatorios/tarefas/{tarefa_id}").json()
+        if tarefa["status"] not in ("pendente", "executando"):
+            return tarefa
+        time.sleep(0.01)
+    raise AssertionError("Tarefa não terminou a tempo")
+
+
+def test_deve_executar_previsao_de_gastos_em_segundo_plano_e_baixar_resultado():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    client.post("/contas-a-pagar-e-receber", json={
+        "descricao": "Conta de Teste", "valor": 100.0, "tipo": "Pagar", "data_previsao": "2025-05-23",
+    })
+
+    response = client.post("/relatorios/tarefas", json={"tipo": "previsao_gastos", "parametros": {"anos": [2024, 2025]}})
+    assert response.status_code == 202
+    assert response.json()["status"] in ("pendente", "executando", "concluida")
+
+    tarefa = aguarda_conclusao(response.json()["id"])
+    assert tarefa["status"] == "concluida"
+
+    response = client.get(f"/relatorios/tarefas/{tarefa['id']}/resultado")
+    assert response.status_code == 200
+    assert response.json() == {"2024": [], "2025": [{"mes": 5, "valor_total": 100.0}]}
+
+
+def test_deve_usar_a_sessao_de_leitura_em_todas_as_tarefas(monkeypatch):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    sessoes_de_leitura = []
+    sessao_de_leitura_avulsa = tarefas_router.sessao_de_leitura_avulsa
+
+    def registra_sessao_de_leitura(aplicacao):
+        sessoes_de_leitura.append(aplicacao)
+        return sessao_de_leitura_avulsa(aplicacao)
+
+    monkeypatch.setattr(tarefas_router, "sessao_de_leitura_avulsa", registra_sessao_de_leitura)
+    for tipo, parametros in (("aging", {}), ("exportacao_contas", {})):
+        response = client.post("/relatorios/tarefas", json={"tipo": tipo, "parametros": parametros})
+        assert aguarda_conclusao(response.json()["id"])["status"] == "concluida"
+
+    assert len(sessoes_de_leitura) == 2
+
+
+def test_deve_exportar_todas_as_contas_em_segundo_plano():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    for i in range(3):
+        client.post("/contas-a-pagar-e-receber", json={
+            "descricao": f"Conta {i}", "valor": 10.0, "tipo": "Receber", "data_previsao": "2025-05-23",
+        })
+
+    response = client.post("/relatorios/tarefas", json={"tipo": "exportacao_contas"})
+    tarefa = aguarda_conclusao(response.json()["id"])
+
+    response = client.get(f"/relatorios/tarefas/{tarefa['id']}/resultado")
+    assert [conta["descricao"] for conta in response.json()] == ["Conta 0", "Conta 1", "Conta 2"]
+
+
+def test_deve_retornar_erro_422_com_parametros_invalidos_da_tarefa():
+    response = client.post("/relatorios/tarefas", json={"tipo": "fluxo_de_caixa", "parametros": {}})
+    assert response.status_code == 422
+
+    response = client.post("/relatorios/tarefas", json={
+        "tipo": "fluxo_de_caixa", "parametros": {"data_inicio": "0001-01-01", "data_fim": "9999-12-31"},
+    })
+    assert response.status_code == 422
+
+    for anos in ([], list(range(2000, 2011)), [2025, 0], [99999]):
+        response = client.post("/relatorios/tarefas", json={"tipo": "previsao_gastos", "parametros": {"anos": anos}})
+        assert response.status_code == 422
+
+
+def test_deve_retornar_erro_404_para_tarefa_inexistente():
+    response = client.get("/relatorios/tarefas/nao-existe")
+    assert response.status_code == 404
+    assert response.json() == {"message": "Oops! Tarefa nao-existe não encontrado(a)."}
+
+
+def test_deve_limitar_fila_e_cancelar_tarefas_abandonadas(tmp_path):
+    gerenciador = GerenciadorDeTarefas(
+        diretorio=str(tmp_path), execucoes_simultaneas=1, maximo_na_fila=2, ttl_segundos=0, abandono_segundos=0
+    )
+    liberar = threading.Event()
+
+    def tarefa_lenta(tarefa):
+        liberar.wait(5)
+        tarefa.verifica_cancelamento()
+        return {"ok": True}
+
+    em_execucao = gerenciador.submete("teste", tarefa_lenta)
+    pendente = gerenciador.submete("teste", tarefa_lenta)
+
+    with pytest.raises(FilaDeTarefasCheia):
+        gerenciador.submete("teste", tarefa_lenta)
+
+    time.sleep(0.01)
+    gerenciador.limpa()
+    liberar.set()
+    gerenciador._executor.shutdown(wait=True)
+
+    assert pendente.status == StatusTarefaEnum.cancelada
+    assert em_execucao.status == StatusTarefaEnum.cancelada
+    time.sleep(0.01)
+    gerenciador.limpa()
+    assert not list(tmp_path.iterdir())
+
+
+def test_deve_consultar_e_cancelar_tarefa_de_outro_worker(tmp_path):
+    # Dois gerenciadores no mesmo diretório fazem o papel de dois workers do servidor
+    worker_dono = GerenciadorDeTarefas(diretorio=str(tmp_path), execucoes_simultaneas=1)
+    outro_worker = GerenciadorDeTarefas(diretorio=str(tmp_path))
+    liberar = threading.Event()
+
+    def tarefa_lenta(tarefa):
+        while not liberar.wait(0.01):
+            tarefa.verifica_cancelamento()
+        return {"ok": True}
+
+    concluida = worker_dono.submete("teste", lambda tarefa: {"ok": True})
+    cancelada = worker_dono.submete("teste", tarefa_lenta)
+    for _ in range(200):
+        if outro_worker.consulta(cancelada.id).status == StatusTarefaEnum.executando:
+            break
+        time.sleep(0.01)
+
+    assert outro_worker.consulta(concluida.id).status == StatusTarefaEnum.concluida
+    assert outro_worker.consulta("nao-existe") is None
+    assert outro_worker.consulta("../" + cancelada.id) is None
+
+    outro_worker.cancela(cancelada.id)
+    worker_dono._executor.shutdown(wait=True)
+    assert cancelada.status == StatusTarefaEnum.cancelada
+    assert outro_worker.consulta(cancelada.id).status == StatusTarefaEnum.cancelada
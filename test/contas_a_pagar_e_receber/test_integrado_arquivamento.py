@@ -0,0 +1,164 @@
+from datetime import date
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from contas_a_pagar_e_receber.arquivamento import arquiva_contas_baixadas, data_de_corte_padrao
+from main import app
+from shared.database import Base
+from shared.dependencies import get_db
+
+client = TestClient(app)
+
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
+
+engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def override_get_db():
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+app.dependency_overrides[get_db] = override_get_db  # type: ignore
+
+
+def cria_conta(descricao, data_previsao, fornecedor_cliente_id=None, data_baixa=None, tipo="Receber"):
+    response = client.post("/contas-a-pagar-e-receber", json={
+        "descricao": descricao,
+        "valor": 100.0,
+        "tipo": tipo,
+        "data_previsao": data_previsao,
+        "fornecedor_cliente_id": fornecedor_cliente_id,
+    })
+    id_conta = response.json()["id"]
+    if data_baixa:
+        client.post(f"/contas-a-pagar-e-receber/{id_conta}/baixas", json={"valor": 100.0, "data_baixa": data_baixa})
+    return id_conta
+
+
+def cria_contas_para_arquivar():
+    id_fornecedor = client.post("/fornecedor-cliente", json={"nome": "Fornecedor 1"}).json()["id"]
+    return [
+        cria_conta("Antiga baixada 1", "2020-01-10", id_fornecedor, data_baixa="2020-01-10"),
+        cria_conta("Antiga em aberto", "2020-02-10", id_fornecedor),
+        cria_conta("Antiga baixada 2", "2020-03-10", id_fornecedor, data_baixa="2020-03-15"),
+        cria_conta("Antiga baixada 3", "2020-04-10", id_fornecedor, data_baixa="2020-04-10"),
+        cria_conta("Recente baixada", "2025-01-10", id_fornecedor, data_baixa="2025-01-10"),
+    ], id_fornecedor
+
+
+def test_deve_arquivar_contas_baixadas_antigas_em_lotes():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    ids, _ = cria_contas_para_arquivar()
+
+    lotes = []
+    with TestingSessionLocal() as sessao:
+        resultado = arquiva_contas_baixadas(
+            sessao, date(2021, 1, 1), tamanho_do_lote=2, ao_concluir_lote=lambda r: lotes.append(r.ultimo_id)
+        )
+
+    assert (resultado.contas_arquivadas, resultado.lotes, resultado.ultimo_id) == (3, 2, ids[3])
+    assert lotes == [ids[2], ids[3]]
+    assert [c["id"] for c in client.get("/contas-a-pagar-e-receber").json()] == [ids[1], ids[4]]
+    assert [c["id"] for c in client.get(
+        "/contas-a-pagar-e-receber", params={"incluir_arquivadas": True}
+    ).json()] == ids
+
+
+def test_deve_retomar_o_arquivamento_a_partir_do_ultimo_id():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    ids, _ = cria_contas_para_arquivar()
+
+    with TestingSessionLocal() as sessao:
+        resultado = arquiva_contas_baixadas(sessao, date(2021, 1, 1), a_partir_do_id=ids[0])
+        assert (resultado.contas_arquivadas, resultado.ultimo_id) == (2, ids[3])
+
+        resultado = arquiva_contas_baixadas(sessao, date(2021, 1, 1))
+        assert (resultado.contas_arquivadas, resultado.ultimo_id) == (1, ids[0])
+
+
+def test_deve_consultar_conta_arquivada_somente_quando_pedido():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    ids, _ = cria_contas_para_arquivar()
+    with TestingSessionLocal() as sessao:
+        arquiva_contas_baixadas(sessao, date(2021, 1, 1))
+
+    assert client.get(f"/contas-a-pagar-e-receber/{ids[0]}").status_code == 404
+
+    response = client.get(f"/contas-a-pagar-e-receber/{ids[0]}", params={"incluir_arquivadas": True})
+    assert response.status_code == 200
+    assert response.json()["descricao"] == "Antiga baixada 1"
+    assert response.json()["esta_baixada"] is True
+    assert response.json()["fornecedor"]["nome"] == "Fornecedor 1"
+
+
+def test_deve_paginar_contas_do_fornecedor_incluindo_arquivadas():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    ids, id_fornecedor = cria_contas_para_arquivar()
+    with TestingSessionLocal() as sessao:
+        arquiva_contas_baixadas(sessao, date(2021, 1, 1))
+
+    url = f"/fornecedor-cliente/{id_fornecedor}/contas-a-pagar-e-receber"
+    assert [c["id"] for c in client.get(url).json()] == [ids[1], ids[4]]
+
+    params = {"incluir_arquivadas": True, "tamanho_da_pagina": 2}
+    assert [c["id"] for c in client.get(url, params={**params, "pagina": 1}).json()] == ids[:2]
+    assert [c["id"] for c in client.get(url, params={**params, "pagina": 2}).json()] == ids[2:4]
+    assert [c["id"] for c in client.get(url, params={**params, "pagina": 3, "esta_baixada": True}).json()] == []
+    assert [c["id"] for c in client.get(url, params={**params, "esta_baixada": True}).json()] == [ids[0], ids[2]]
+
+
+def test_deve_listar_e_totalizar_incluindo_arquivadas():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    ids, id_fornecedor = cria_contas_para_arquivar()
+    id_paga = cria_conta("Antiga paga", "2020-05-10", id_fornecedor, data_baixa="2020-05-10", tipo="Pagar")
+    with TestingSessionLocal() as sessao:
+        arquiva_contas_baixadas(sessao, date(2021, 1, 1))
+
+    contas = client.get("/contas-a-pagar-e-receber", params={"incluir_arquivadas": True}).json()
+    assert [c["id"] for c in contas] == ids + [id_paga]
+    assert contas[0]["fornecedor"] == {"id": id_fornecedor, "nome": "Fornecedor 1"}
+    assert (contas[0]["valor_baixada"], contas[0]["esta_baixada"]) == (100.0, True)
+
+    url = f"/fornecedor-cliente/{id_fornecedor}/contas-a-pagar-e-receber/resumo"
+    resumo = client.get(url).json()
+    assert (resumo["quantidade_de_contas"], resumo["total_a_receber"], resumo["total_a_pagar"]) == (2, 200.0, 0.0)
+    resumo = client.get(url, params={"incluir_arquivadas": True}).json()
+    assert (resumo["quantidade_de_contas"], resumo["total_a_receber"], resumo["total_a_pagar"]) == (6, 500.0, 100.0)
+    assert resumo["total_baixado"] == 500.0
+    assert [(m["ano"], m["mes"]) for m in resumo["por_mes"]][:2] == [(2020, 1), (2020, 2)]
+
+    url = "/contas-a-pagar-e-receber/previsao-gastos-do-mes"
+    assert client.get(url, params={"ano": 2020}).json() == []
+    assert client.get(url, params={"ano": 2020, "incluir_arquivadas": True}).json() == [
+        {"mes": 5, "valor_total": 100.0},
+    ]
+
+
+def test_deve_manter_baixas_de_contas_arquivadas_no_saldo_realizado():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    cria_contas_para_arquivar()
+    antes = client.get("/relatorios/saldo-realizado", params={"data": "2025-12-31"}).json()
+
+    with TestingSessionLocal() as sessao:
+        arquiva_contas_baixadas(sessao, date(2021, 1, 1))
+
+    assert client.get("/relatorios/saldo-realizado", params={"data": "2025-12-31"}).json() == antes
+    assert antes["saldo"] == 400.0
+
+
+def test_data_de_corte_padrao_deve_ser_inicio_de_ano():
+    assert data_de_corte_padrao(date(2025, 6, 15)) == date(2023, 1, 1)
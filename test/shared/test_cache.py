@@ -0,0 +1,44 @@
+from shared.cache import CacheComTTL
+
+
+class Relogio:
+    def __init__(self):
+        self.agora = 0.0
+
+    def __call__(self):
+        return self.agora
+
+
+def test_deve_reaproveitar_o_valor_ate_expirar():
+    relogio = Relogio()
+    cache = CacheComTTL(ttl_segundos=10, relogio=relogio)
+    chamadas = []
+
+    def calcula():
+        chamadas.append(relogio.agora)
+        return len(chamadas)
+
+    assert cache.obtem("chave", calcula) == 1
+    relogio.agora = 9
+    assert cache.obtem("chave", calcula) == 1
+    relogio.agora = 10
+    assert cache.obtem("chave", calcula) == 2
+    assert chamadas == [0, 10]
+
+
+def test_deve_limitar_a_quantidade_de_entradas():
+    relogio = Relogio()
+    cache = CacheComTTL(ttl_segundos=10, maximo_de_entradas=2, relogio=relogio)
+
+    for chave in ("a", "b", "c"):
+        relogio.agora += 1
+        cache.obtem(chave, lambda: chave)
+
+    assert cache.obtem("a", lambda: "recalculado") == "recalculado"
+    assert cache.obtem("c", lambda: "recalculado") == "c"
+
+
+def test_nao_deve_guardar_com_ttl_zero():
+    cache = CacheComTTL(ttl_segundos=0)
+
+    assert [cache.obtem("chave", lambda v=v: v) for v in (1, 2)] == [1, 2]
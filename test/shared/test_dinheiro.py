@@ -0,0 +1,41 @@
+from decimal import Decimal
+
+from sqlalchemy import Column, Integer, MetaData, Table, create_engine, func, insert, select
+
+from shared.dinheiro import Centavos, para_centavos, de_centavos
+
+metadata = MetaData()
+tabela = Table(
+    "contas_em_centavos", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("valor", Centavos),
+    Column("valor_baixada", Centavos, nullable=True),
+)
+
+
+def test_deve_converter_reais_em_centavos_e_de_volta():
+    assert para_centavos(Decimal("100.10")) == 10010
+    assert para_centavos(0.1) == 10
+    assert para_centavos("0.005") == 1
+    assert para_centavos(-12.345) == -1235
+    assert de_centavos(10010) == Decimal("100.10")
+
+
+def test_deve_gravar_centavos_e_devolver_reais_inclusive_em_expressoes():
+    engine = create_engine("sqlite://")
+    metadata.create_all(engine)
+    saldo_em_aberto = tabela.c.valor - func.coalesce(tabela.c.valor_baixada, 0)
+
+    with engine.begin() as conexao:
+        conexao.execute(insert(tabela), [
+            {"valor": Decimal("0.10"), "valor_baixada": None},
+            {"valor": Decimal("0.20"), "valor_baixada": Decimal("0.05")},
+        ])
+        assert conexao.exec_driver_sql("SELECT valor, valor_baixada FROM contas_em_centavos ORDER BY id").all() == [
+            (10, None), (20, 5),
+        ]
+        assert conexao.execute(select(func.sum(saldo_em_aberto))).scalar() == Decimal("0.25")
+        assert conexao.execute(select(func.sum(tabela.c.valor * 2))).scalar() == Decimal("0.60")
+        assert conexao.execute(
+            select(func.count()).where(saldo_em_aberto <= Decimal("0.15"))
+        ).scalar() == 2
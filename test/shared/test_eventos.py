@@ -0,0 +1,101 @@
+import asyncio
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from contas_a_pagar_e_receber.routers.eventos_router import gera_eventos_sse
+from shared.eventos import Evento, HubDeEventos, POLITICA_DESCARTAR, POLITICA_DESCONECTAR
+
+
+def test_deve_entregar_o_evento_a_todos_os_assinantes():
+    async def cenario():
+        hub = HubDeEventos()
+        assinaturas = [hub.assina(), hub.assina()]
+        hub.publica("conta_criada", {"id": 1})
+        return [await assinatura.proximo(timeout=1) for assinatura in assinaturas]
+
+    assert asyncio.run(cenario()) == [Evento("conta_criada", {"id": 1})] * 2
+
+
+def test_deve_entregar_eventos_publicados_de_outras_threads():
+    async def cenario():
+        hub = HubDeEventos()
+        assinatura = hub.assina()
+        await asyncio.to_thread(hub.publica, "conta_excluida", {"id": 7})
+        return await assinatura.proximo(timeout=1)
+
+    assert asyncio.run(cenario()) == Evento("conta_excluida", {"id": 7})
+
+
+def test_deve_entregar_evento_da_transacao_so_apos_o_commit():
+    engine = create_engine("sqlite://")
+
+    async def cenario():
+        hub = HubDeEventos()
+        assinatura = hub.assina()
+        with Session(engine) as sessao:
+            sessao.execute(text("SELECT 1"))
+            hub.publica("conta_criada", {"id": 1}, sessao)
+            sessao.rollback()
+            hub.publica("conta_criada", {"id": 2}, sessao)
+            await asyncio.sleep(0)
+            assert assinatura._fila.empty()
+            sessao.commit()
+        return await assinatura.proximo(timeout=1), assinatura._fila.empty()
+
+    assert asyncio.run(cenario()) == (Evento("conta_criada", {"id": 2}), True)
+
+
+def test_deve_desconectar_o_assinante_que_nao_acompanha_o_ritmo():
+    async def cenario():
+        hub = HubDeEventos(tamanho_da_fila=2, politica=POLITICA_DESCONECTAR)
+        lenta = hub.assina()
+        for i in range(3):
+            hub.publica("conta_criada", {"id": i})
+        await asyncio.sleep(0)
+        return lenta, await lenta.proximo(timeout=1), hub.quantidade_de_assinantes
+
+    lenta, evento, assinantes = asyncio.run(cenario())
+
+    assert evento is None
+    assert lenta.desconectada is True
+    assert assinantes == 0
+
+
+def test_deve_descartar_os_eventos_mais_antigos_do_assinante_lento():
+    async def cenario():
+        hub = HubDeEventos(tamanho_da_fila=2, politica=POLITICA_DESCARTAR)
+        lenta = hub.assina()
+        for i in range(4):
+            hub.publica("conta_criada", {"id": i})
+        await asyncio.sleep(0)
+        return lenta, [(await lenta.proximo(timeout=1)).dados["id"] for _ in range(2)]
+
+    lenta, ids = asyncio.run(cenario())
+
+    assert ids == [2, 3]
+    assert lenta.descartados == 2
+
+
+def test_deve_gerar_eventos_sse_com_heartbeat_e_cancelar_a_assinatura_ao_terminar():
+    async def cenario():
+        hub = HubDeEventos(tamanho_da_fila=1)
+        assinatura = hub.assina()
+        corpo = gera_eventos_sse(assinatura, intervalo_heartbeat=0.01)
+        partes = [await anext(corpo), await anext(corpo)]
+        hub.publica("conta_criada", {"id": 1})
+        partes.append(await anext(corpo))
+        hub.publica("conta_criada", {"id": 2})
+        hub.publica("conta_criada", {"id": 3})
+        partes += [parte async for parte in corpo]
+        return partes, hub.quantidade_de_assinantes
+
+    partes, assinantes = asyncio.run(cenario())
+
+    assert partes == [
+        b"retry: 3000\n\n",
+        b": heartbeat\n\n",
+        b'event: conta_criada\ndata: {"id": 1}\n\n',
+        b'event: desconectado\ndata: {"motivo": "fila cheia"}\n\n',
+    ]
+    assert assinantes == 0
@@ -0,0 +1,166 @@
+import asyncio
+
+import httpx
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from main import app
+from shared.database import Base
+from shared.dependencies import get_db
+from shared.admissao import ControleDeAdmissao, ControleDeAdmissaoMiddleware, LimitadorDeConcorrencia, \
+    CLASSE_ESCRITA, CLASSE_LEITURA, CLASSE_RELATORIO, CONEXOES_POR_ESCRITA, limites_do_pool
+
+client = TestClient(app)
+
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
+
+engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def override_get_db():
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+app.dependency_overrides[get_db] = override_get_db  # type: ignore
+
+
+def test_deve_enfileirar_e_recusar_quando_a_fila_esta_cheia():
+    async def cenario():
+        limitador = LimitadorDeConcorrencia(limite=1, maximo_na_fila=1, espera_maxima_segundos=1)
+        assert await limitador.entra() is True
+        na_fila = asyncio.create_task(limitador.entra())
+        await asyncio.sleep(0)
+        recusada = await limitador.entra()
+        metricas_com_fila = limitador.metricas()
+        limitador.sai()
+        admitida = await na_fila
+        return recusada, admitida, metricas_com_fila, limitador.metricas()
+
+    recusada, admitida, metricas_com_fila, metricas = asyncio.run(cenario())
+
+    assert recusada is False
+    assert admitida is True
+    assert metricas_com_fila["em_execucao"] == 1 and metricas_com_fila["na_fila"] == 1
+    assert metricas["em_execucao"] == 1 and metricas["na_fila"] == 0
+    assert metricas["admitidas"] == 2 and metricas["recusadas_fila_cheia"] == 1 and metricas["maior_fila"] == 1
+
+
+def test_deve_recusar_apos_a_espera_maxima_e_liberar_a_vaga():
+    async def cenario():
+        limitador = LimitadorDeConcorrencia(limite=1, maximo_na_fila=5, espera_maxima_segundos=0.01)
+        await limitador.entra()
+        recusada = await limitador.entra()
+        limitador.sai()
+        return recusada, limitador.metricas()
+
+    recusada, metricas = asyncio.run(cenario())
+
+    assert recusada is False
+    assert metricas["recusadas_por_espera"] == 1
+    assert metricas["em_execucao"] == 0 and metricas["na_fila"] == 0
+
+
+def test_deve_classificar_as_rotas():
+    classe = ControleDeAdmissao.classe_da_rota
+
+    assert classe("GET", "/contas-a-pagar-e-receber/1") == CLASSE_LEITURA
+    assert classe("POST", "/contas-a-pagar-e-receber") == CLASSE_ESCRITA
+    assert classe("GET", "/relatorios/aging") == CLASSE_RELATORIO
+    assert classe("GET", "/dashboard") == CLASSE_RELATORIO
+    assert classe("GET", "/eventos/") is None
+    assert classe("GET", "/metricas/admissao") is None
+    assert classe("GET", "/relatorios/tarefas/abc") is None
+
+
+def test_deve_calcular_os_limites_a_partir_do_pool_do_worker():
+    # Padrão do SQLAlchemy (5 + 10) e o pool calculado pelo servidor.py para 80 conexões em 4 workers
+    for pool_size, max_overflow, conexoes in ((None, None, 15), (20, 0, 20), (1, 0, 1)):
+        limites = limites_do_pool(pool_size, max_overflow)
+        assert min(limites.values()) >= 1
+        if conexoes >= 3 + CONEXOES_POR_ESCRITA:
+            escritas = limites[CLASSE_ESCRITA] * CONEXOES_POR_ESCRITA
+            assert limites[CLASSE_LEITURA] + limites[CLASSE_RELATORIO] + escritas <= conexoes
+    assert limites_do_pool(20, 0) == {CLASSE_LEITURA: 12, CLASSE_ESCRITA: 3, CLASSE_RELATORIO: 2}
+    assert limites_do_pool(5, -1) == {CLASSE_LEITURA: 0, CLASSE_ESCRITA: 0, CLASSE_RELATORIO: 0}
+
+    controle = ControleDeAdmissao(pool_size=20, max_overflow=0)
+    assert {classe: limitador.limite for classe, limitador in controle.limitadores.items()} == limites_do_pool(20, 0)
+
+
+def test_deve_responder_503_com_retry_after_quando_saturado():
+    async def cenario():
+        liberar = asyncio.Event()
+
+        async def lenta(request):
+            await liberar.wait()
+            return PlainTextResponse("ok")
+
+        controle = ControleDeAdmissao(
+            {CLASSE_LEITURA: 1}, maximo_na_fila=1, espera_maxima_segundos=0.05, retry_after_segundos=2
+        )
+        aplicacao = ControleDeAdmissaoMiddleware(Starlette(routes=[Route("/lenta", lenta)]), controle)
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=aplicacao), base_url="http://teste") as cliente:
+            ocupando = asyncio.create_task(cliente.get("/lenta"))
+            await asyncio.sleep(0.01)
+            respostas = await asyncio.gather(cliente.get("/lenta"), cliente.get("/lenta"))
+            liberar.set()
+            return await ocupando, respostas, controle.metricas()[CLASSE_LEITURA]
+
+    ocupando, respostas, metricas = asyncio.run(cenario())
+
+    assert ocupando.status_code == 200
+    assert [r.status_code for r in respostas] == [503, 503]
+    assert all(r.headers["retry-after"] == "2" for r in respostas)
+    assert metricas["recusadas_fila_cheia"] == 1 and metricas["recusadas_por_espera"] == 1
+    assert metricas["em_execucao"] == 0
+
+
+def test_deve_consultar_tarefas_enquanto_a_vaga_de_relatorio_esta_ocupada():
+    async def cenario():
+        liberar = asyncio.Event()
+
+        async def relatorio(request):
+            await liberar.wait()
+            return PlainTextResponse("ok")
+
+        async def tarefa(request):
+            return PlainTextResponse("pendente")
+
+        controle = ControleDeAdmissao({CLASSE_RELATORIO: 1}, maximo_na_fila=0, espera_maxima_segundos=0.05)
+        aplicacao = ControleDeAdmissaoMiddleware(Starlette(routes=[
+            Route("/relatorios/aging", relatorio), Route("/relatorios/tarefas/{tarefa_id}", tarefa),
+        ]), controle)
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=aplicacao), base_url="http://teste") as cliente:
+            ocupando = asyncio.create_task(cliente.get("/relatorios/aging"))
+            await asyncio.sleep(0.01)
+            respostas = await asyncio.gather(cliente.get("/relatorios/aging"), cliente.get("/relatorios/tarefas/abc"))
+            liberar.set()
+            return await ocupando, respostas
+
+    ocupando, (relatorio, tarefa) = asyncio.run(cenario())
+
+    assert ocupando.status_code == 200
+    assert relatorio.status_code == 503
+    assert tarefa.status_code == 200 and tarefa.text == "pendente"
+
+def test_deve_expor_as_metricas_de_admissao():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    client.get("/contas-a-pagar-e-receber/previsao-gastos-do-mes")
+
+    response = client.get("/metricas/admissao")
+
+    assert response.status_code == 200
+    assert set(response.json()) == {CLASSE_LEITURA, CLASSE_ESCRITA, CLASSE_RELATORIO}
+    assert response.json()[CLASSE_RELATORIO]["admitidas"] >= 1
+    assert response.json()[CLASSE_RELATORIO]["em_execucao"] == 0
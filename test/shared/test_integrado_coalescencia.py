@@ -0,0 +1,142 @@
+import asyncio
+import time
+from urllib.parse import parse_qsl
+
+import httpx
+from fastapi.testclient import TestClient
+from starlette.responses import JSONResponse
+
+from main import app
+from shared.coalescencia import Coalescencia, CoalescenciaMiddleware
+from shared.replica import COOKIE_LEITURA_NA_PRIMARIA
+
+client = TestClient(app)
+
+
+def cria_aplicacao(coalescencia: Coalescencia, liberar: asyncio.Event, chamadas: list):
+    async def relatorio(scope, receive, send):
+        ano = dict(parse_qsl(scope["query_string"].decode())).get("ano")
+        chamadas.append(ano)
+        await liberar.wait()
+        if ano == "erro":
+            raise RuntimeError("falha no relatório")
+        await JSONResponse({"ano": ano})(scope, receive, send)
+
+    return CoalescenciaMiddleware(relatorio, coalescencia)
+
+
+async def requisicoes_simultaneas(coalescencia: Coalescencia, *urls, liberar_apos: float = 0.01):
+    liberar = asyncio.Event()
+    chamadas = []
+    transporte = httpx.ASGITransport(app=cria_aplicacao(coalescencia, liberar, chamadas))
+    async with httpx.AsyncClient(transport=transporte, base_url="http://teste") as cliente:
+        pendentes = asyncio.gather(*(cliente.get(url) for url in urls), return_exceptions=True)
+        await asyncio.sleep(liberar_apos)
+        liberar.set()
+        return await pendentes, chamadas
+
+
+def test_deve_calcular_uma_vez_para_requisicoes_identicas_simultaneas():
+    coalescencia = Coalescencia(prefixos=("/relatorios",))
+
+    respostas, chamadas = asyncio.run(requisicoes_simultaneas(
+        coalescencia, "/relatorios/anual?ano=2026&tipo=Pagar", "/relatorios/anual?tipo=Pagar&ano=2026",
+        "/relatorios/anual/?ano=2026&tipo=Pagar", "/relatorios/anual?ano=2025",
+    ))
+
+    assert sorted(chamadas) == ["2025", "2026"]
+    assert [r.json() for r in respostas] == [{"ano": "2026"}] * 3 + [{"ano": "2025"}]
+    assert coalescencia.metricas() == {"em_andamento": 0, "calculadas": 2, "coalescidas": 2, "recusadas_por_espera": 0}
+
+
+
+def test_nao_deve_coalescer_quem_le_da_primaria_apos_escrever_com_quem_le_da_replica():
+    coalescencia = Coalescencia(prefixos=("/relatorios",))
+
+    async def cenario():
+        liberar = asyncio.Event()
+        chamadas = []
+        transporte = httpx.ASGITransport(app=cria_aplicacao(coalescencia, liberar, chamadas))
+        cookie = {"Cookie": f"{COOKIE_LEITURA_NA_PRIMARIA}={time.time() + 60:.3f}"}
+        cookie_vencido = {"Cookie": f"{COOKIE_LEITURA_NA_PRIMARIA}={time.time() - 60:.3f}"}
+        async with httpx.AsyncClient(transport=transporte, base_url="http://teste") as cliente:
+            pendentes = asyncio.gather(
+                cliente.get("/relatorios/anual?ano=2026"),
+                cliente.get("/relatorios/anual?ano=2026", headers=cookie_vencido),
+                cliente.get("/relatorios/anual?ano=2026", headers=cookie),
+                cliente.get("/relatorios/anual?ano=2026", headers=cookie),
+            )
+            await asyncio.sleep(0.01)
+            liberar.set()
+            return await pendentes, chamadas
+
+    respostas, chamadas = asyncio.run(cenario())
+
+    assert chamadas == ["2026", "2026"]
+    assert [r.json() for r in respostas] == [{"ano": "2026"}] * 4
+    assert coalescencia.metricas()["coalescidas"] == 2
+
+def test_deve_repassar_o_erro_a_todas_as_requisicoes_que_aguardavam():
+    coalescencia = Coalescencia(prefixos=("/relatorios",))
+
+    respostas, chamadas = asyncio.run(requisicoes_simultaneas(
+        coalescencia, "/relatorios/anual?ano=erro", "/relatorios/anual?ano=erro",
+    ))
+
+    assert len(chamadas) == 1
+    assert all(isinstance(r, RuntimeError) for r in respostas)
+    assert coalescencia.metricas()["em_andamento"] == 0
+
+
+def test_deve_responder_503_apos_o_prazo_da_chave():
+    coalescencia = Coalescencia(prefixos=("/relatorios",), espera_maxima_segundos=0.05, retry_after_segundos=3)
+
+    respostas, chamadas = asyncio.run(requisicoes_simultaneas(
+        coalescencia, "/relatorios/anual?ano=2026", "/relatorios/anual?ano=2026", liberar_apos=0.2,
+    ))
+
+    assert len(chamadas) == 1
+    assert [r.status_code for r in respostas] == [200, 503]
+    assert respostas[1].headers["retry-after"] == "3"
+    assert coalescencia.metricas()["recusadas_por_espera"] == 1
+
+
+def test_deve_ignorar_rotas_que_nao_sao_relatorios():
+    coalescencia = Coalescencia(prefixos=("/outros",))
+
+    respostas, chamadas = asyncio.run(requisicoes_simultaneas(
+        coalescencia, "/relatorios/anual?ano=2026", "/relatorios/anual?ano=2026",
+    ))
+
+    assert len(chamadas) == 2
+    assert coalescencia.metricas()["calculadas"] == 0
+
+
+def test_nao_deve_coalescer_as_rotas_de_tarefas():
+    coalescencia = Coalescencia(prefixos=("/relatorios",))
+
+    respostas, chamadas = asyncio.run(requisicoes_simultaneas(
+        coalescencia, "/relatorios/tarefas/abc?ano=2026", "/relatorios/tarefas/abc?ano=2026",
+    ))
+
+    assert len(chamadas) == 2
+    assert coalescencia.metricas()["calculadas"] == 0
+
+
+def test_deve_calcular_de_novo_quando_a_resposta_passa_do_tamanho_maximo():
+    coalescencia = Coalescencia(prefixos=("/relatorios",), resposta_maxima_bytes=10)
+
+    respostas, chamadas = asyncio.run(requisicoes_simultaneas(
+        coalescencia, "/relatorios/anual?ano=2026", "/relatorios/anual?ano=2026", "/relatorios/anual?ano=2026",
+    ))
+
+    assert [r.json() for r in respostas] == [{"ano": "2026"}] * 3
+    assert len(chamadas) >= 2
+    assert coalescencia.metricas()["coalescidas"] == 0
+    assert coalescencia.metricas()["em_andamento"] == 0
+
+def test_deve_expor_as_metricas_de_coalescencia():
+    response = client.get("/metricas/coalescencia")
+
+    assert response.status_code == 200
+    assert set(response.json()) == {"em_andamento", "calculadas", "coalescidas", "recusadas_por_espera"}
@@ -0,0 +1,104 @@
+import asyncio
+import zlib
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from contas_a_pagar_e_receber.models.fornecedor_cliente_model import FornecedorClienteModel
+from main import app
+from shared.compressao import CompressaoMiddleware, CompressorGzip, escolhe_codificacao
+from shared.database import Base
+from shared.dependencies import get_db
+
+client = TestClient(app)
+
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
+
+engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def override_get_db():
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+app.dependency_overrides[get_db] = override_get_db  # type: ignore
+
+
+def cria_fornecedores(quantidade):
+    with TestingSessionLocal() as sessao:
+        sessao.add_all([FornecedorClienteModel(nome=f"Fornecedor {i}") for i in range(quantidade)])
+        sessao.commit()
+
+
+def test_deve_comprimir_listagens_grandes_com_gzip():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    cria_fornecedores(200)
+
+    sem_compressao = client.get("/fornecedor-cliente", headers={"Accept-Encoding": "identity"})
+    comprimida = client.get("/fornecedor-cliente", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in sem_compressao.headers
+    assert comprimida.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in comprimida.headers["vary"]
+    assert int(comprimida.headers["content-length"]) < len(sem_compressao.content) / 4
+    assert comprimida.json() == sem_compressao.json()
+
+
+def test_nao_deve_comprimir_respostas_pequenas():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    cria_fornecedores(1)
+
+    response = client.get("/fornecedor-cliente", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in response.headers
+    assert response.json() == [{"id": 1, "nome": "Fornecedor 0"}]
+
+
+def test_deve_comprimir_respostas_em_streaming_pedaco_a_pedaco():
+    async def app_streaming(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/event-stream")]})
+        for i in range(3):
+            await send({"type": "http.response.body", "body": f"data: evento {i}\n\n".encode(), "more_body": True})
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    mensagens = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        mensagens.append(message)
+
+    middleware = CompressaoMiddleware(app_streaming, tamanho_minimo=1024, compressores={"gzip": CompressorGzip})
+    scope = {"type": "http", "method": "GET", "path": "/eventos", "headers": [(b"accept-encoding", b"gzip")]}
+    asyncio.run(middleware(scope, receive, send))
+
+    cabecalhos = dict(mensagens[0]["headers"])
+    assert cabecalhos[b"content-encoding"] == b"gzip"
+    assert b"content-length" not in cabecalhos
+
+    # Cada evento pode ser descomprimido assim que chega, sem esperar o fim da resposta
+    descompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    pedacos = [descompressor.decompress(mensagem["body"]) for mensagem in mensagens[1:]]
+    assert pedacos[:3] == [f"data: evento {i}\n\n".encode() for i in range(3)]
+    assert descompressor.eof
+
+
+def test_deve_escolher_a_codificacao_pelo_peso_e_pela_preferencia_do_servidor():
+    disponiveis = ["zstd", "br", "gzip"]
+
+    assert escolhe_codificacao("gzip, deflate, br", disponiveis) == "br"
+    assert escolhe_codificacao("gzip;q=1.0, br;q=0.5", disponiveis) == "gzip"
+    assert escolhe_codificacao("*", disponiveis) == "zstd"
+    assert escolhe_codificacao("gzip;q=0, *;q=0.1", ["gzip"]) is None
+    assert escolhe_codificacao("identity", disponiveis) is None
+    assert escolhe_codificacao("", disponiveis) is None
@@ -0,0 +1,252 @@
+import asyncio
+import json
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from contas_a_pagar_e_receber.models.contas_a_pagar_e_receber_model import ContasAPagarEReceberModel
+from contas_a_pagar_e_receber.models.fornecedor_cliente_model import FornecedorClienteModel
+from main import app
+from shared import idempotencia
+from shared.database import Base
+from shared.dependencies import get_db
+from shared.idempotencia import ChaveIdempotenciaModel, impressao_digital_da_requisicao
+
+client = TestClient(app)
+
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
+
+engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def override_get_db():
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+app.dependency_overrides[get_db] = override_get_db  # type: ignore
+
+
+def post_json(url, dados, chave=None):
+    headers = {"Content-Type": "application/json"}
+    if chave:
+        headers["Idempotency-Key"] = chave
+    return client.post(url, content=json.dumps(dados).encode(), headers=headers)
+
+
+def quantidade_de(modelo):
+    with TestingSessionLocal() as sessao:
+        return sessao.query(modelo).count()
+
+
+def test_deve_repetir_a_resposta_gravada_quando_a_chave_for_reenviada():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    primeira = post_json("/fornecedor-cliente/", {"nome": "Casa do Pão"}, chave="chave-1")
+    segunda = post_json("/fornecedor-cliente/", {"nome": "Casa do Pão"}, chave="chave-1")
+
+    assert primeira.status_code == 201
+    assert segunda.status_code == 201
+    assert segunda.json() == primeira.json()
+    assert "idempotent-replayed" not in primeira.headers
+    assert segunda.headers["idempotent-replayed"] == "true"
+    assert quantidade_de(FornecedorClienteModel) == 1
+
+
+def test_deve_criar_uma_unica_conta_quando_a_chave_for_reenviada():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    conta = {"descricao": "Aluguel", "valor": 1000.5, "tipo": "Pagar", "data_previsao": "2026-10-05"}
+    primeira = post_json("/contas-a-pagar-e-receber/", conta, chave="chave-conta")
+    segunda = post_json("/contas-a-pagar-e-receber/", conta, chave="chave-conta")
+
+    assert primeira.status_code == 201
+    assert segunda.json() == primeira.json()
+    assert quantidade_de(ContasAPagarEReceberModel) == 1
+
+
+def test_deve_aceitar_a_chave_quando_a_requisicao_for_redirecionada():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    primeira = post_json("/fornecedor-cliente", {"nome": "Casa do Pão"}, chave="chave-1")
+    segunda = post_json("/fornecedor-cliente", {"nome": "Casa do Pão"}, chave="chave-1")
+
+    assert primeira.status_code == 201
+    assert segunda.json() == primeira.json()
+    assert quantidade_de(FornecedorClienteModel) == 1
+
+
+def test_deve_executar_novamente_quando_nao_houver_chave():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    post_json("/fornecedor-cliente/", {"nome": "Casa do Pão"})
+    post_json("/fornecedor-cliente/", {"nome": "Casa do Pão"})
+
+    assert quantidade_de(FornecedorClienteModel) == 2
+
+
+def test_deve_retornar_erro_quando_a_chave_for_reutilizada_com_outra_requisicao():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    post_json("/fornecedor-cliente/", {"nome": "Casa do Pão"}, chave="chave-1")
+    response = post_json("/fornecedor-cliente/", {"nome": "Outro Nome"}, chave="chave-1")
+
+    assert response.status_code == 422
+    assert quantidade_de(FornecedorClienteModel) == 1
+
+
+def test_nao_deve_guardar_respostas_de_validacao_como_sucesso_de_outra_requisicao():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    conta_invalida = {"descricao": "Aluguel", "valor": -1, "tipo": "Pagar", "data_previsao": "2026-10-05"}
+    primeira = post_json("/contas-a-pagar-e-receber/", conta_invalida, chave="chave-invalida")
+    segunda = post_json("/contas-a-pagar-e-receber/", conta_invalida, chave="chave-invalida")
+
+    assert primeira.status_code == 422
+    assert segunda.status_code == 422
+    assert segunda.json() == primeira.json()
+    assert quantidade_de(ContasAPagarEReceberModel) == 0
+
+
+def test_deve_aguardar_a_requisicao_em_andamento_com_a_mesma_chave():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    corpo = json.dumps({"nome": "Casa do Pão"}).encode()
+    scope = {"method": "POST", "path": "/fornecedor-cliente/", "query_string": b""}
+    with TestingSessionLocal() as sessao:
+        sessao.add(ChaveIdempotenciaModel(
+            chave="em-andamento",
+            impressao_digital=impressao_digital_da_requisicao(scope, corpo),
+            concluida=False,
+            expira_em=datetime.now() + timedelta(hours=1),
+        ))
+        sessao.commit()
+
+    def conclui_a_primeira_requisicao():
+        time.sleep(0.3)
+        with TestingSessionLocal() as sessao:
+            registro = sessao.get(ChaveIdempotenciaModel, "em-andamento")
+            registro.concluida = True
+            registro.status_code = 201
+            registro.cabecalhos = json.dumps([["content-type", "application/json"]])
+            registro.corpo = b'{"id": 7, "nome": "Casa do P\\u00e3o"}'
+            sessao.commit()
+
+    thread = threading.Thread(target=conclui_a_primeira_requisicao)
+    thread.start()
+    response = post_json("/fornecedor-cliente/", {"nome": "Casa do Pão"}, chave="em-andamento")
+    thread.join()
+
+    assert response.status_code == 201
+    assert response.json() == {"id": 7, "nome": "Casa do Pão"}
+    assert quantidade_de(FornecedorClienteModel) == 0
+
+
+def test_deve_executar_novamente_quando_a_chave_estiver_expirada():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    post_json("/fornecedor-cliente/", {"nome": "Casa do Pão"}, chave="chave-1")
+    with TestingSessionLocal() as sessao:
+        sessao.get(ChaveIdempotenciaModel, "chave-1").expira_em = datetime.now() - timedelta(seconds=1)
+        sessao.commit()
+
+    response = post_json("/fornecedor-cliente/", {"nome": "Casa do Pão"}, chave="chave-1")
+
+    assert response.status_code == 201
+    assert "idempotent-replayed" not in response.headers
+    assert quantidade_de(FornecedorClienteModel) == 2
+
+
+def test_deve_importar_csv_grande_uma_unica_vez_com_a_chave(monkeypatch):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    # Corpo maior que o limite em memória, para passar pelo arquivo temporário e ser entregue em pedaços
+    monkeypatch.setattr(idempotencia, "CORPO_EM_MEMORIA_BYTES", 64)
+    monkeypatch.setattr(idempotencia, "TAMANHO_DO_PEDACO", 32)
+    csv = "descricao,valor,tipo,data_previsao\n" + "".join(
+        f"Conta {numero},10.00,Pagar,2025-01-01\n" for numero in range(50)
+    )
+
+    def importa():
+        return client.post(
+            "/contas-a-pagar-e-receber/importacao",
+            content=csv.encode(),
+            headers={"Content-Type": "text/csv", "Idempotency-Key": "importacao-1"},
+        )
+
+    primeira = importa()
+    segunda = importa()
+
+    assert primeira.status_code == 200
+    assert primeira.json()["contas_importadas"] == 50
+    assert segunda.headers["idempotent-replayed"] == "true"
+    assert segunda.json() == primeira.json()
+    assert quantidade_de(ContasAPagarEReceberModel) == 50
+
+
+def test_deve_indicar_quando_o_corpo_foi_para_o_disco(monkeypatch):
+    monkeypatch.setattr(idempotencia, "CORPO_EM_MEMORIA_BYTES", 64)
+
+    async def le(*pedacos):
+        mensagens = iter([{"body": p, "more_body": True} for p in pedacos] + [{"body": b""}])
+
+        async def receive():
+            return next(mensagens)
+
+        corpo, _, em_disco = await idempotencia.IdempotenciaMiddleware._le_corpo(receive)
+        with corpo:
+            return corpo.read(), em_disco
+
+    assert asyncio.run(le(b"a" * 32, b"b" * 32)) == (b"a" * 32 + b"b" * 32, False)
+    assert asyncio.run(le(b"a" * 32, b"b" * 33)) == (b"a" * 32 + b"b" * 33, True)
+
+def test_deve_reservar_a_chave_liberada_entre_o_insert_e_a_leitura(monkeypatch):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with TestingSessionLocal() as sessao:
+        sessao.add(ChaveIdempotenciaModel(
+            chave="liberada", impressao_digital="outra", concluida=False,
+            expira_em=datetime.now() + timedelta(hours=1),
+        ))
+        sessao.commit()
+
+    class SessaoQueLiberaAChave(Session):
+        def rollback(self):
+            super().rollback()
+            # A requisição que detinha a chave falhou e a liberou logo após o insert recusado
+            with TestingSessionLocal() as outra:
+                outra.query(ChaveIdempotenciaModel).delete()
+                outra.commit()
+
+    @contextmanager
+    def sessao_avulsa(aplicacao):
+        with SessaoQueLiberaAChave(bind=engine) as sessao:
+            yield sessao
+
+    monkeypatch.setattr(idempotencia, "sessao_avulsa", sessao_avulsa)
+    middleware = idempotencia.IdempotenciaMiddleware(app)
+
+    assert middleware._reserva(app, "liberada", "esta") is None
+    with TestingSessionLocal() as sessao:
+        assert sessao.get(ChaveIdempotenciaModel, "liberada").impressao_digital == "esta"
+
+    # Concluir uma chave que já não existe não deve falhar
+    idempotencia.IdempotenciaMiddleware._conclui(app, "inexistente", 201, [], b"")
@@ -0,0 +1,87 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from contas_a_pagar_e_receber.models.fornecedor_cliente_model import FornecedorClienteModel
+from main import app
+from shared.database import Base
+from shared.dependencies import get_db
+from shared.replica import MonitorDaReplica, roteador_de_leitura
+
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
+
+engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def override_get_db():
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+app.dependency_overrides[get_db] = override_get_db  # type: ignore
+
+
+@pytest.fixture
+def replica(tmp_path):
+    """Configura um segundo arquivo SQLite como réplica; só o que for gravado nele aparece nas leituras."""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    engine_replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine_replica)
+    ReplicaSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine_replica)
+
+    atraso = {"segundos": 0.0}
+    monitor = MonitorDaReplica(
+        ReplicaSessionLocal, atraso_maximo_segundos=5, intervalo_segundos=0,
+        mede_atraso=lambda sessao: atraso["segundos"],
+    )
+    roteador_de_leitura.configura(ReplicaSessionLocal, monitor)
+
+    with ReplicaSessionLocal() as sessao:
+        sessao.add(FornecedorClienteModel(nome="Somente na Replica"))
+        sessao.commit()
+
+    try:
+        yield atraso
+    finally:
+        roteador_de_leitura.configura(None)
+        engine_replica.dispose()
+
+
+def nomes_listados(client):
+    return [fornecedor["nome"] for fornecedor in client.get("/fornecedor-cliente").json()]
+
+
+def test_deve_ler_da_replica_quando_saudavel(replica):
+    client = TestClient(app)
+    assert nomes_listados(client) == ["Somente na Replica"]
+
+
+def test_deve_ler_do_banco_principal_quando_replica_atrasada(replica):
+    client = TestClient(app)
+    client.post("/fornecedor-cliente", json={"nome": "Na Primaria"})
+    client.cookies.clear()
+
+    replica["segundos"] = 60
+    assert nomes_listados(client) == ["Na Primaria"]
+
+    replica["segundos"] = 0
+    assert nomes_listados(client) == ["Somente na Replica"]
+
+
+def test_deve_ler_as_proprias_escritas_do_banco_principal(replica):
+    client = TestClient(app)
+    response = client.post("/fornecedor-cliente", json={"nome": "Na Primaria"})
+    assert "leitura_na_primaria_ate" in response.cookies
+
+    assert nomes_listados(client) == ["Na Primaria"]
+
+    client.cookies.clear()
+    assert nomes_listados(client) == ["Somente na Replica"]
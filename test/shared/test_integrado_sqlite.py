@@ -0,0 +1,63 @@
+import threading
+
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from config import Settings
+from contas_a_pagar_e_receber.models.fornecedor_cliente_model import FornecedorClienteModel
+from main import create_app
+from shared.database import Base, obtem_engine, obtem_fabrica_de_leitura
+
+
+def cria_app(tmp_path):
+    return create_app(Settings(database_url=f"sqlite:///{tmp_path / 'app.db'}", database_read_url=None, database_echo=False))
+
+
+def test_deve_aplicar_os_pragmas_em_cada_conexao(tmp_path):
+    with TestClient(cria_app(tmp_path)):
+        for engine in (obtem_engine(), obtem_fabrica_de_leitura().kw["bind"]):
+            with engine.connect() as conexao:
+                assert conexao.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+                assert conexao.execute(text("PRAGMA synchronous")).scalar() == 1
+                assert conexao.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+                assert conexao.execute(text("PRAGMA mmap_size")).scalar() > 0
+
+
+def test_deve_usar_um_unico_escritor_e_um_pool_de_leitura(tmp_path):
+    app = cria_app(tmp_path)
+
+    with TestClient(app) as client:
+        Base.metadata.create_all(bind=obtem_engine())
+        assert obtem_engine().pool.size() == 1
+
+        client.post("/fornecedor-cliente", json={"nome": "Casa do Pão"})
+        client.cookies.clear()
+
+        # Sem o cookie de escrita recente, a listagem vem do pool de leitura
+        assert [f["nome"] for f in client.get("/fornecedor-cliente").json()] == ["Casa do Pão"]
+        assert obtem_fabrica_de_leitura().kw["bind"].pool.checkedin() >= 1
+
+
+def test_leituras_nao_devem_esperar_uma_escrita_em_andamento(tmp_path):
+    with TestClient(cria_app(tmp_path)) as client:
+        Base.metadata.create_all(bind=obtem_engine())
+        client.post("/fornecedor-cliente", json={"nome": "Casa do Pão"})
+        client.cookies.clear()
+
+        escrita_aberta, leitura_concluida = threading.Event(), threading.Event()
+
+        def escreve():
+            with obtem_engine().begin() as conexao:
+                conexao.execute(FornecedorClienteModel.__table__.insert().values(nome="Ainda não confirmado"))
+                escrita_aberta.set()
+                leitura_concluida.wait(5)
+
+        escritor = threading.Thread(target=escreve)
+        escritor.start()
+        escrita_aberta.wait(5)
+        response = client.get("/fornecedor-cliente")
+        leitura_concluida.set()
+        escritor.join()
+
+        assert [f["nome"] for f in response.json()] == ["Casa do Pão"]
+        assert len(client.get("/fornecedor-cliente").json()) == 2
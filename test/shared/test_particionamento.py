@@ -0,0 +1,70 @@
+import os
+from datetime import date
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from main import app
+from shared.dependencies import get_db
+from shared.particionamento import ParticionamentoPorAno
+
+# Banco Postgres vazio, usado só pelos testes de particionamento (ex.: postgresql://postgres@localhost/teste)
+POSTGRES_URL = os.getenv("TEST_POSTGRES_URL")
+
+
+def test_deve_gerar_ddl_da_particao_anual():
+    particoes = ParticionamentoPorAno("contas_a_pagar_e_receber", "data_previsao")
+
+    assert particoes.nome_da_particao(2025) == "contas_a_pagar_e_receber_2025"
+    assert particoes.ddl_da_particao(2025) == (
+        "CREATE TABLE IF NOT EXISTS contas_a_pagar_e_receber_2025 PARTITION OF contas_a_pagar_e_receber "
+        "FOR VALUES FROM ('2025-01-01') TO ('2026-01-01')"
+    )
+
+
+def test_nao_deve_fazer_nada_em_banco_sem_particionamento():
+    engine = create_engine("sqlite://")
+    particoes = ParticionamentoPorAno("contas_a_pagar_e_receber", "data_previsao", anos_a_frente=2)
+
+    particoes.garante_anos_futuros(engine, hoje=date(2025, 6, 1))
+
+    assert particoes._anos_garantidos == {2025, 2026, 2027}
+
+
+@pytest.mark.skipif(not POSTGRES_URL, reason="TEST_POSTGRES_URL não definida")
+def test_deve_criar_conta_em_ano_sem_particao_no_postgres():
+    """Roda as migrações num banco Postgres vazio (TEST_POSTGRES_URL) e cria uma conta num ano sem partição."""
+    configuracao = Config("alembic.ini")
+    configuracao.set_main_option("sqlalchemy.url", POSTGRES_URL)
+    command.upgrade(configuracao, "head")
+
+    engine = create_engine(POSTGRES_URL)
+    fabrica = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def override_get_db():
+        db = fabrica()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    anterior = app.dependency_overrides.get(get_db)
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        response = TestClient(app).post("/contas-a-pagar-e-receber", json={
+            "descricao": "Conta de 2300", "valor": 10.0, "tipo": "Pagar", "data_previsao": "2300-01-10",
+        })
+        assert response.status_code == 201
+        with engine.connect() as conexao:
+            assert conexao.execute(text("SELECT to_regclass('contas_a_pagar_e_receber_2300')")).scalar() is not None
+    finally:
+        if anterior is None:
+            app.dependency_overrides.pop(get_db)
+        else:
+            app.dependency_overrides[get_db] = anterior
+        command.downgrade(configuracao, "base")
+        engine.dispose()
@@ -0,0 +1,41 @@
+from fastapi.testclient import TestClient
+
+from config import Settings
+from main import create_app
+from shared import database
+from shared.database import Base, obtem_engine
+
+
+def configuracoes(tmp_path, **opcoes):
+    return Settings(database_url=f"sqlite:///{tmp_path / 'app.db'}", database_read_url=None, database_echo=False, **opcoes)
+
+
+def test_deve_criar_a_aplicacao_sem_substituir_dependencias(tmp_path):
+    app = create_app(configuracoes(tmp_path))
+
+    with TestClient(app) as client:
+        Base.metadata.drop_all(bind=obtem_engine())
+        Base.metadata.create_all(bind=obtem_engine())
+
+        response = client.post("/fornecedor-cliente", json={"nome": "Casa do Pão"})
+        assert response.status_code == 201
+        assert client.get("/fornecedor-cliente").json() == [response.json()]
+        assert obtem_engine().url.database == str(tmp_path / "app.db")
+
+    assert database._engine is None
+
+
+def test_nao_deve_aquecer_na_inicializacao_por_padrao(tmp_path):
+    app = create_app(configuracoes(tmp_path))
+
+    with TestClient(app):
+        assert app.openapi_schema is None
+        assert obtem_engine().pool.checkedin() == 0
+
+
+def test_deve_aquecer_pool_e_openapi_quando_configurado(tmp_path):
+    app = create_app(configuracoes(tmp_path, aquecer_pool_na_inicializacao=True, gerar_openapi_na_inicializacao=True))
+
+    with TestClient(app):
+        assert app.openapi_schema is not None
+        assert obtem_engine().pool.checkedin() == obtem_engine().pool.size()
@@ -0,0 +1,42 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from config import Settings
+from main import create_app
+from servidor import conexoes_por_worker, valida_workers, workers_padrao
+from shared.database import obtem_fabrica_de_leitura
+
+
+def test_deve_dividir_as_conexoes_entre_os_workers():
+    assert conexoes_por_worker(80, 8) == 10
+    assert conexoes_por_worker(80, 6) == 13
+    assert conexoes_por_worker(80, 6) * 6 <= 80
+
+
+def test_deve_recusar_mais_workers_que_conexoes():
+    with pytest.raises(ValueError):
+        conexoes_por_worker(4, 8)
+    with pytest.raises(ValueError):
+        conexoes_por_worker(80, 0)
+
+
+def test_deve_recusar_varios_workers_com_o_backend_de_eventos_local():
+    with pytest.raises(ValueError):
+        valida_workers(4, "local")
+    valida_workers(1, "local")
+    valida_workers(4, "postgresql")
+    assert workers_padrao("local") == 1
+    assert workers_padrao("postgresql") >= 1
+
+
+def test_deve_aplicar_o_tamanho_do_pool_na_engine(tmp_path):
+    app = create_app(Settings(
+        database_url=f"sqlite:///{tmp_path / 'app.db'}", database_read_url=None, database_echo=False,
+        database_pool_size=3, database_max_overflow=0,
+    ))
+
+    with TestClient(app):
+        # No SQLite o tamanho configurado vale para o pool de leitura; as escritas usam uma única conexão
+        engine_de_leitura = obtem_fabrica_de_leitura().kw["bind"]
+        assert engine_de_leitura.pool.size() == 3
+        assert engine_de_leitura.pool._max_overflow == 0